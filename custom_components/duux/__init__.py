@@ -1,28 +1,56 @@
 # custom_components/duux/__init__.py
 
+import asyncio
+import hashlib
 import logging
+import time
+from collections import deque
 from datetime import timedelta
+from types import MappingProxyType
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
+    COMMAND_CONFIRM_DELAYS,
+    COMMAND_CONFIRM_TIMEOUT,
+    CONF_FAST_POLL_DEVICES,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MQTT_TOPIC,
+    CONF_POLL_INTERVAL,
+    DATA_ACCOUNTS,
+    DATA_ACCOUNTS_LOCK,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_DEVICE_PROFILE,
+    DEFAULT_POLL_INTERVAL,
+    DEVICE_PROFILES,
     DOMAIN,
-    DUUX_DTID_FAN,
-    DUUX_DTID_HEATER,
-    DUUX_DTID_HUMIDIFIER,
-    DUUX_DTID_AIR_PURIFIER,
-    DUUX_DTID_AIR_CONDITIONER,
-    DUUX_DTID_OTHER_HEATER,
-    DUUX_DTID_THERMOSTAT,
+    DUUX_DTID_SUPPORTED,
     DUUX_SUPPORTED_TYPES,
+    PLATFORM_DEVICE_TYPES,
+    POLL_FAST_AFTER_COMMAND,
+    POLL_INTERVAL_FAST,
+    POLL_INTERVAL_IDLE,
+    POLL_INTERVAL_OFFLINE,
+    POLL_INTERVAL_ON,
+    POLL_INTERVAL_PUSH,
+    SETUP_REFRESH_CONCURRENCY,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .duux_api import DuuxAPI
+from .duux_api import CommandResult, DuuxAPI
+from .lookup import raw_key
+from .push import async_setup_push
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,24 +64,32 @@ PLATFORMS = [
     Platform.BINARY_SENSOR,
 ]
 
+# Stands in for a key that is absent, so a key appearing as None still counts.
+_MISSING = object()
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Duux from a config entry."""
-    api = DuuxAPI(email=entry.data["email"], password=entry.data["password"])
-
-    # Authenticate
-    if not await hass.async_add_executor_job(api.login):
-        _LOGGER.error("Failed to authenticate with Duux API")
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id))
+    shared = await _async_acquire_account(hass, entry, store)
+    if shared is None:
         return False
+    api, account, devices = shared.api, shared.account, shared.devices
+    account.async_set_options(entry.entry_id, entry.options)
+
+    @callback
+    def _async_save_state():
+        store.async_delay_save(
+            lambda: {"devices": devices, "status": account.data},
+            STORAGE_SAVE_DELAY,
+        )
 
-    # Get devices
-    devices = await hass.async_add_executor_job(api.get_devices)
-    if not devices:
-        _LOGGER.error("No Duux devices found")
-        return False
+    entry.async_on_unload(account.async_add_listener(_async_save_state))
+    _async_save_state()
 
-    # Create coordinator for each device
+    # Create coordinator and classify each device
     coordinators = {}
+    profiles = {}
     for device in devices:
         sensor_type = device.get("sensorType") or {}
         sensor_type_id = device.get("sensorTypeId")
@@ -80,15 +116,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 translation_placeholders={"device_name": model},
             )
 
-        if device_type_id not in [
-            *DUUX_DTID_HEATER,
-            *DUUX_DTID_THERMOSTAT,
-            *DUUX_DTID_HUMIDIFIER,
-            *DUUX_DTID_AIR_PURIFIER,
-            *DUUX_DTID_AIR_CONDITIONER,
-            *DUUX_DTID_OTHER_HEATER,
-            *DUUX_DTID_FAN,
-        ]:
+        if device_type_id not in DUUX_DTID_SUPPORTED:
             ir.async_create_issue(
                 hass,
                 DOMAIN,
@@ -122,38 +150,242 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             else:
                 continue
 
-        coordinator = DuuxDataUpdateCoordinator(
+        coordinators[device["deviceId"]] = DuuxDataUpdateCoordinator(
             hass,
             api=api,
             device_id=device.get("deviceId"),
             device_name=device_name,
+            account=account,
             config_entry=entry,
         )
+        profiles[device["deviceId"]] = device_profile(device)
+
+    # Only the account fetch above can fail the setup; a device whose first
+    # refresh fails starts unavailable and recovers on the next account poll.
+    semaphore = asyncio.Semaphore(SETUP_REFRESH_CONCURRENCY)
 
-        await coordinator.async_config_entry_first_refresh()
-        coordinators[device["deviceId"]] = coordinator
+    async def _first_refresh(coordinator):
+        async with semaphore:
+            await coordinator.async_refresh()
+
+    await asyncio.gather(*map(_first_refresh, coordinators.values()))
+
+    pushed = await async_setup_push(hass, entry, account, devices)
+    account.async_enable_push(entry.entry_id, pushed)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
+        "account": account,
         "coordinators": coordinators,
         "devices": devices,
+        "profiles": profiles,
+        "mqtt_topic": entry.options.get(CONF_MQTT_TOPIC),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+def device_profile(device):
+    """Return the entity classes to set up for a device, by platform.
+
+    A device gets the main entity for each platform its device type (or,
+    failing that, its Google device type) belongs to: the class its model
+    lists in DEVICE_PROFILES, else the platform's default. The model's
+    other entities are added as listed.
+    """
+    sensor_type = device.get("sensorType") or {}
+    sensor_type_id = device.get("sensorTypeId")
+    device_type_id = sensor_type.get("type")
+    last_word = (sensor_type.get("googleDeviceType") or "").split(".")[-1]
+    listed = DEVICE_PROFILES.get(sensor_type_id, {})
+
+    profile = {}
+    for platform, (device_types, google_types) in PLATFORM_DEVICE_TYPES.items():
+        if device_type_id not in device_types and last_word not in google_types:
+            continue
+        if platform in listed:
+            profile[platform] = listed[platform]
+            continue
+        profile[platform] = DEFAULT_DEVICE_PROFILE[platform]
+        _LOGGER.warning(
+            "Unknown %s model %s (sensorTypeId %s), %s",
+            platform,
+            sensor_type.get("name", "Unknown"),
+            sensor_type_id,
+            "using autodiscovery" if profile[platform] else "skipping",
+        )
+    for platform, class_names in listed.items():
+        if platform not in PLATFORM_DEVICE_TYPES:
+            profile[platform] = class_names
+    return MappingProxyType(profile)
+
+
+class SharedAccount:
+    """The API client and account poller for one Duux login.
+
+    Config entries using the same login share one of these, so the account
+    is logged in to and polled once however many entries there are.
+    """
+
+    def __init__(self, api, account, devices):
+        """Initialize."""
+        self.api = api
+        self.account = account
+        self.devices = devices
+        # Config entries using this account; shut down once none are left.
+        self.entry_ids = set()
+
+
+def _account_key(entry):
+    """Return the key of the entry's login, without the plaintext password."""
+    login = f"{entry.data['email'].lower()}\0{entry.data['password']}"
+    return hashlib.sha256(login.encode()).hexdigest()
+
+
+async def _async_acquire_account(hass, entry, store):
+    """Return the shared account for the entry's login, connecting if needed.
+
+    Returns None if there is no account yet and connecting failed.
+    """
+    lock = hass.data.setdefault(DATA_ACCOUNTS_LOCK, asyncio.Lock())
+    async with lock:
+        accounts = hass.data.setdefault(DATA_ACCOUNTS, {})
+        shared = accounts.get(_account_key(entry))
+        if shared is None:
+            shared = await _async_connect(hass, entry, store)
+            if shared is None:
+                return None
+            accounts[_account_key(entry)] = shared
+        shared.entry_ids.add(entry.entry_id)
+        return shared
+
+
+async def _async_release_account(hass, entry):
+    """Stop sharing the entry's account, shutting it down if it was the last.
+
+    The account has no config entry of its own to stop its refresh timer
+    and debouncer on unload, so the last entry to release it does.
+    """
+    lock = hass.data.setdefault(DATA_ACCOUNTS_LOCK, asyncio.Lock())
+    async with lock:
+        accounts = hass.data.get(DATA_ACCOUNTS)
+        shared = accounts and accounts.get(_account_key(entry))
+        if not shared:
+            return
+        shared.entry_ids.discard(entry.entry_id)
+        shared.account.async_release_entry(entry.entry_id)
+        if not shared.entry_ids:
+            del accounts[_account_key(entry)]
+            await shared.account.async_shutdown()
+
+
+async def _async_connect(hass, entry, store):
+    """Create the API client and account poller for the entry's login."""
+    api = DuuxAPI(
+        email=entry.data["email"],
+        password=entry.data["password"],
+        session=async_get_clientsession(hass),
+    )
+
+    # One account-level poller fetches the device list for every device.
+    # It outlives any one config entry, so it isn't tied to this one.
+    account = DuuxAccountCoordinator(hass, api=api, config_entry=None)
+    # ...so it stops with Home Assistant; unloading shuts it down earlier.
+    await account.async_register_shutdown()
+    cached = await store.async_load()
+
+    if cached and cached.get("devices"):
+        # Set up from the last known state straight away; the cloud replaces
+        # it in the background.
+        devices = cached["devices"]
+        account.async_seed_cached(cached["status"])
+        entry.async_create_background_task(
+            hass,
+            _async_replace_cached(hass, entry, api, account, store, devices),
+            "Duux cloud connect",
+        )
+    else:
+        # Authenticate
+        if not await api.login():
+            _LOGGER.error("Failed to authenticate with Duux API")
+            return None
+
+        # Get devices
+        devices = await api.get_devices()
+        if not devices:
+            _LOGGER.error("No Duux devices found")
+            return None
+
+        # Start from the list just fetched and poll on the normal schedule.
+        account.async_seed(devices)
+
+    return SharedAccount(api, account, devices)
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed polling options live; a new MQTT topic needs a reload."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    if entry.options.get(CONF_MQTT_TOPIC) != data["mqtt_topic"]:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    data["account"].async_set_options(entry.entry_id, entry.options)
+
+
+async def _async_replace_cached(hass, entry, api, account, store, cached_devices):
+    """Log in and replace the cached state entities started from."""
+    if not await api.login():
+        _LOGGER.warning("Failed to authenticate with Duux API, showing cached state")
+        return
+
+    devices = await api.get_devices()
+    if not devices:
+        return
+
+    if {device.get("deviceId") for device in devices} != {
+        device.get("deviceId") for device in cached_devices
+    }:
+        # Devices were added or removed since the cache was written; set up
+        # again from the fresh list.
+        await store.async_save(
+            {
+                "devices": devices,
+                "status": {
+                    device.get("deviceId"): DuuxAPI.device_status(device)
+                    for device in devices
+                },
+            }
+        )
+        cached_devices[:] = devices
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    # In place, so hass.data, the shared account and the saved cache pick
+    # up the fresh entries.
+    cached_devices[:] = devices
+    account.async_seed(devices)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_release_account(hass, entry)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cached state of a removed config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+    ).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
 ) -> bool:
@@ -185,29 +417,481 @@ async def async_remove_config_entry_device(
     return len(device_entities) == 0
 
 
+class DevicePollSchedule:
+    """How soon one device wants the account polled again.
+
+    Polls fast after a command and whenever the device's status changed,
+    then doubles the interval on every unchanged poll, up to `on` while
+    the device is on and `idle` while it is off. An offline device is only
+    probed, doubling up to POLL_INTERVAL_OFFLINE whatever its status does,
+    until it is back online.
+    """
+
+    def __init__(self, on=POLL_INTERVAL_ON, idle=POLL_INTERVAL_IDLE):
+        """Initialize."""
+        self.on = on
+        self.idle = idle
+        self.interval = self.fast
+        self._fast_until = 0.0
+
+    @property
+    def fast(self):
+        """Return the interval to poll at while the device is changing.
+
+        A device fast-polled below POLL_INTERVAL_FAST keeps its own interval.
+        """
+        return min(POLL_INTERVAL_FAST, self.on)
+
+    def command_sent(self):
+        """Poll fast for a while to pick up the command's effect."""
+        self._fast_until = time.monotonic() + POLL_FAST_AFTER_COMMAND.total_seconds()
+        self.interval = self.fast
+
+    def polled(self, status, changed):
+        """Pick the next interval after a poll returned `status`."""
+        if not status.get("online", True):
+            self.interval = min(POLL_INTERVAL_OFFLINE, self.interval * 2)
+            return
+
+        if changed or time.monotonic() < self._fast_until:
+            self.interval = self.fast
+            return
+
+        ceiling = self.on if status.get("power") else self.idle
+        self.interval = min(ceiling, self.interval * 2)
+
+
+class DuuxAccountCoordinator(DataUpdateCoordinator):
+    """Class to poll the device list for a whole Duux account.
+
+    /smarthome/sensors always returns every device on the account, so it is
+    fetched once per interval here and each DuuxDataUpdateCoordinator takes
+    its own slice of the result. The interval is the shortest one any
+    device's DevicePollSchedule asks for, but never below the configured
+    floor.
+    """
+
+    def __init__(self, hass, api, config_entry=None):
+        """Initialize."""
+        self.api = api
+        # Raw device list entries from the last poll, by MAC.
+        self._devices = {}
+        self._schedules = {}
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_count = 0
+        # When the device list was last fetched, by time.monotonic().
+        self._last_fetch = 0.0
+        # True while the data is the cached state from before a restart.
+        self.stale = False
+        # Devices whose state is pushed over MQTT, across every entry.
+        self.pushed = frozenset()
+        self._entry_pushed = {}
+        # Polling options by config entry, and their combination.
+        self._entry_options = {}
+        self._poll_interval = POLL_INTERVAL_ON
+        self._fast_poll = {}
+        self._floor = timedelta(seconds=DEFAULT_MIN_POLL_INTERVAL)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Duux account",
+            update_interval=POLL_INTERVAL_FAST,
+            config_entry=config_entry,
+        )
+
+    async def _async_update_data(self):
+        """Fetch the device list and index each device's status by MAC.
+
+        Devices whose entry is unchanged keep their previous status object,
+        which lets each device coordinator skip dispatching it again.
+        """
+        self._last_fetch = time.monotonic()
+        try:
+            devices = await self.api.get_devices(projected=True)
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with API: {err}")
+
+        if not devices:
+            raise UpdateFailed("No devices returned by the Duux API")
+
+        previous = self.data or {}
+        data = {}
+        raw = {}
+        for device in devices:
+            device_id = device.get("deviceId")
+            raw[device_id] = device
+            changed = not (
+                device_id in previous and self._devices.get(device_id) == device
+            )
+            if changed:
+                data[device_id] = DuuxAPI.device_status(device)
+            else:
+                data[device_id] = previous[device_id]
+            self.schedule(device_id).polled(data[device_id], changed)
+        self._devices = raw
+        self.stale = False
+        self.update_interval = self._next_interval(data)
+        return data
+
+    @callback
+    def async_seed(self, devices):
+        """Start from a device list that was already fetched.
+
+        Saves setup a second download; the first poll then happens after
+        the usual interval.
+        """
+        self.stale = False
+        self.async_set_updated_data(
+            {
+                device.get("deviceId"): DuuxAPI.device_status(device)
+                for device in devices
+            }
+        )
+
+    @callback
+    def async_enable_push(self, entry_id, device_ids):
+        """Poll the devices an entry gets pushed only as a consistency check."""
+        self._entry_pushed[entry_id] = frozenset(device_ids)
+        self.pushed = frozenset().union(*self._entry_pushed.values())
+        self.update_interval = self._next_interval(self.data or ())
+
+    @callback
+    def async_push(self, device_id, full_data):
+        """Apply fullData keys pushed for one device between polls."""
+        if device_id not in (self.data or {}):
+            return
+        self.data = {**self.data, device_id: {**self.data[device_id], **full_data}}
+        # The next poll re-reads this device rather than keeping what was
+        # pushed, so it catches anything a push missed.
+        self._devices.pop(device_id, None)
+        self.async_update_listeners()
+
+    @callback
+    def async_seed_cached(self, status):
+        """Start from the statuses cached before a restart, marked stale."""
+        self.stale = True
+        self.async_set_updated_data(status)
+
+    async def async_refresh_shared(self):
+        """Refresh now, or wait for a refresh that is already running.
+
+        Lets several devices confirming commands at once share one fetch,
+        and holds the fetches to the configured floor like scheduled polls.
+        """
+        count = self._refresh_count
+        async with self._refresh_lock:
+            if self._refresh_count != count:
+                return
+            floor = self._floor.total_seconds()
+            while (wait := self._last_fetch + floor - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            await self.async_refresh()
+            self._refresh_count += 1
+
+    def schedule(self, device_id):
+        """Return the poll schedule for one device."""
+        if device_id not in self._schedules:
+            self._schedules[device_id] = self._configure(
+                device_id, DevicePollSchedule()
+            )
+        return self._schedules[device_id]
+
+    def _configure(self, device_id, schedule):
+        """Apply the polling options to one device's schedule."""
+        if device_id in self._fast_poll:
+            schedule.on = schedule.idle = self._fast_poll[device_id]
+        else:
+            schedule.on = self._poll_interval
+            schedule.idle = max(schedule.on, POLL_INTERVAL_IDLE)
+        schedule.interval = min(schedule.interval, schedule.on)
+        return schedule
+
+    @callback
+    def async_set_options(self, entry_id, options):
+        """Apply a config entry's polling options, effective at once."""
+        self._entry_options[entry_id] = options
+        self._apply_options()
+
+    @callback
+    def async_release_entry(self, entry_id):
+        """Forget an unloaded entry's polling options and pushed devices."""
+        self._entry_options.pop(entry_id, None)
+        self._entry_pushed.pop(entry_id, None)
+        self.pushed = frozenset().union(*self._entry_pushed.values())
+        self._apply_options()
+
+    def _apply_options(self):
+        """Combine every entry's options and reschedule.
+
+        Entries sharing the account each get at least the polling they
+        asked for: the shortest poll interval, each fast-polled device at
+        the shortest interval any entry listing it chose, and the lowest
+        floor, which each entry's own intervals already respect.
+        """
+        entries = list(self._entry_options.values()) or [{}]
+        self._poll_interval = timedelta(
+            seconds=min(
+                options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+                for options in entries
+            )
+        )
+        fast_poll = {}
+        for options in entries:
+            interval = timedelta(
+                seconds=options.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL)
+            )
+            for device_id in options.get(CONF_FAST_POLL_DEVICES, ()):
+                fast_poll[device_id] = min(fast_poll.get(device_id, interval), interval)
+        self._fast_poll = fast_poll
+        self._floor = timedelta(
+            seconds=min(
+                options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)
+                for options in entries
+            )
+        )
+        for device_id, schedule in self._schedules.items():
+            self._configure(device_id, schedule)
+        self.update_interval = self._next_interval(self.data or ())
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _next_interval(self, device_ids):
+        if self.pushed:
+            interval = min(
+                (
+                    self.schedule(device_id).interval
+                    for device_id in device_ids
+                    if device_id not in self.pushed
+                ),
+                default=POLL_INTERVAL_PUSH,
+            )
+        else:
+            interval = min(
+                (self.schedule(device_id).interval for device_id in device_ids),
+                default=POLL_INTERVAL_ON,
+            )
+        return max(interval, self._floor)
+
+    @callback
+    def async_command_sent(self, device_id):
+        """Poll fast for a while after a command was sent to a device."""
+        self.schedule(device_id).command_sent()
+        interval = self._next_interval(self.data or (device_id,))
+        if interval < self.update_interval:
+            self.update_interval = interval
+            self._schedule_refresh()
+
+    def device_status(self, device_id):
+        """Return the last fetched status for a single device."""
+        return (self.data or {}).get(device_id, {})
+
+
 class DuuxDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Duux data."""
+    """Class to manage fetching Duux data.
 
-    def __init__(self, hass, api, device_id, device_name, config_entry=None):
+    The data is a read-only merge of the last polled status and an overlay
+    of pending writes. Entities send commands through async_command(),
+    which lays the expected values over the status straight away, drops
+    them again if the command fails, and otherwise keeps them until a poll
+    confirms them or COMMAND_CONFIRM_TIMEOUT passes.
+    """
+
+    def __init__(self, hass, api, device_id, device_name, account, config_entry=None):
         """Initialize."""
         self.api = api
+        self.account = account
         self.device_id = device_id
         self.device_name = device_name
 
+        # No update_interval: the account coordinator drives polling and
+        # pushes each new slice in through _handle_account_update.
         super().__init__(
             hass,
             _LOGGER,
             name=f"Duux {device_name}",
-            update_interval=timedelta(seconds=30),
             config_entry=config_entry,
         )
+        # The account's status object this coordinator's data is built from.
+        self._account_status = None
+        # Overlay of values sent in commands but not reported back yet:
+        # key -> (value, time.monotonic() when it was sent)
+        self._pending = {}
+        self._confirm_task = None
+        # Seconds between sending a command and the cloud reporting it.
+        self.command_latencies = deque(maxlen=20)
+        # (last_update_success, stale, data) as of the last listener dispatch.
+        self._dispatched = None
+        self._unsub_account = account.async_add_listener(self._handle_account_update)
 
     async def _async_update_data(self):
-        """Fetch data from API."""
-        try:
-            data = await self.hass.async_add_executor_job(
-                self.api.get_device_status, self.device_id
+        """Return this device's slice of the account data."""
+        if self.account.data is None:
+            await self.account.async_refresh()
+        if not self.account.last_update_success:
+            raise UpdateFailed(
+                f"Error communicating with API: {self.account.last_exception}"
             )
-            return data
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
+        self._account_status = self.account.device_status(self.device_id)
+        return self._merged()
+
+    def _merged(self):
+        """Return the polled status with the pending writes laid over it.
+
+        Read-only and built afresh, so nothing can change the account's
+        data, or the snapshot the next update is compared with, through it.
+        """
+        return MappingProxyType(
+            {
+                **(self._account_status or {}),
+                **{key: value for key, (value, _) in self._pending.items()},
+            }
+        )
+
+    @property
+    def stale(self):
+        """Return True while the data is cached from before a restart."""
+        return self.account.stale
+
+    async def async_request_refresh(self):
+        """Refresh the shared account data rather than this device alone."""
+        await self.account.async_request_refresh()
+
+    async def async_shutdown(self):
+        """Stop listening to the account coordinator."""
+        await super().async_shutdown()
+        self._unsub_account()
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+
+    async def async_command(self, command, values):
+        """Send a command and show the values it should set until confirmed.
+
+        `command` is the awaitable DuuxAPI call and `values` the fullData
+        keys it changes. A short burst of refreshes then checks them against
+        the cloud. Returns the command's CommandResult.
+        """
+        sent = time.monotonic()
+        writes = {key: (value, sent) for key, value in values.items()}
+        self._pending.update(writes)
+        self.async_set_updated_data(self._merged())
+
+        result = await command
+        if not result or result == CommandResult.MERGED:
+            # Failed, or replaced by a newer value whose own call applies it:
+            # drop whatever of this command's overlay a newer one hasn't.
+            for key, write in writes.items():
+                if self._pending.get(key) is write:
+                    del self._pending[key]
+            self.async_set_updated_data(self._merged())
+            return result
+
+        self.account.async_command_sent(self.device_id)
+
+        if self._confirm_task is None or self._confirm_task.done():
+            self._confirm_task = self.hass.async_create_background_task(
+                self._async_confirm(), f"Confirm {self.device_name} command"
+            )
+        return result
+
+    async def _async_confirm(self):
+        """Refresh until every pending value is confirmed or has expired."""
+        delays = iter(COMMAND_CONFIRM_DELAYS)
+        while self._pending:
+            await asyncio.sleep(next(delays, COMMAND_CONFIRM_DELAYS[-1]))
+            await self.account.async_refresh_shared()
+            # Repeated failed refreshes don't reach _handle_account_update,
+            # so expire overdue values here too or the burst never ends.
+            if self._expire_pending(self.account.device_status(self.device_id)):
+                self.data = self._merged()
+                self.async_update_listeners()
+
+    def _settle_pending(self, status):
+        """Drop pending values the cloud now reports, or that have expired."""
+        now = time.monotonic()
+        for key, (value, sent) in list(self._pending.items()):
+            if raw_key(status.get(key)) == raw_key(value):
+                del self._pending[key]
+                self.command_latencies.append(now - sent)
+                _LOGGER.debug(
+                    "%s: %s=%s confirmed after %.1fs",
+                    self.device_name, key, value, now - sent,
+                )
+        self._expire_pending(status)
+
+    def _expire_pending(self, status):
+        """Drop pending values older than COMMAND_CONFIRM_TIMEOUT.
+
+        Returns True if any were dropped.
+        """
+        now = time.monotonic()
+        timeout = COMMAND_CONFIRM_TIMEOUT.total_seconds()
+        expired = [
+            key for key, (_, sent) in self._pending.items() if now - sent >= timeout
+        ]
+        for key in expired:
+            value, _ = self._pending.pop(key)
+            _LOGGER.warning(
+                "%s: %s=%s was not confirmed within %ds, reverting to %s",
+                self.device_name, key, value, timeout, status.get(key),
+            )
+        return bool(expired)
+
+    @callback
+    def _handle_account_update(self):
+        """Take this device's slice of a fresh account poll."""
+        status = self.account.device_status(self.device_id)
+        self._settle_pending(status)
+        if not self.account.last_update_success:
+            self.async_set_update_error(
+                self.account.last_exception or UpdateFailed("Account update failed")
+            )
+            return
+
+        if (
+            self.last_update_success
+            and not status.get("online", True)
+            and not (self.data or {}).get("online", True)
+        ):
+            # Still offline: its entities are unavailable, so nothing they
+            # show can change until it is back.
+            return
+
+        previous, self._account_status = self._account_status, status
+        data = self._merged()
+        if self.last_update_success and status is previous and self.data == data:
+            # Unchanged since the last poll, with no optimistic writes to undo.
+            return
+
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self):
+        """Wake only the entities whose keys changed since the last update.
+
+        Each entity registers the fullData keys it reads as its listener
+        context (None for every update). A change in availability, in
+        staleness or in the device's "online" flag wakes everything.
+        """
+        data = self.data or {}
+        previous = self._dispatched
+        self._dispatched = (self.last_update_success, self.stale, data)
+        if (
+            previous is None
+            or previous[:2] != self._dispatched[:2]
+            or previous[2].get("online") != data.get("online")
+        ):
+            super().async_update_listeners()
+            return
+
+        old = previous[2]
+        changed = {
+            key
+            for key in old.keys() | data.keys()
+            if old.get(key, _MISSING) != data.get(key, _MISSING)
+        }
+        if not changed:
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
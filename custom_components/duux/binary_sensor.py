@@ -56,7 +56,8 @@ class DuuxBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator, api, device, description):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        # Only woken when its own key (or availability) changes.
+        super().__init__(coordinator, context=frozenset({description.key}))
         self._api = api
         self._coordinator = coordinator
         self._device = device
@@ -73,13 +74,41 @@ class DuuxBinarySensor(CoordinatorEntity, BinarySensorEntity):
         )
         self._attr_extra_state_attributes = description.attrs(coordinator.data)
         self.entity_description = description
+        # What was last written to the state machine, see _rendered().
+        self._last_written = None
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
+    def _rendered(self):
+        """Return everything this entity writes to its state."""
+        return (
+            self.available,
+            self.assumed_state,
+            self.is_on,
+            self._attr_extra_state_attributes,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state Home Assistant writes when adding the entity."""
+        await super().async_added_to_hass()
+        self._last_written = self._rendered()
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+        """Handle updated data from the coordinator.
+
+        Skips the state write if nothing the entity shows has changed.
+        """
         self._attr_extra_state_attributes = self.entity_description.attrs(
             self.coordinator.data
         )
+        rendered = self._rendered()
+        if rendered == self._last_written:
+            return
+        self._last_written = rendered
         self.async_write_ha_state()
 
 
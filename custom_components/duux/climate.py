@@ -16,25 +16,16 @@ from homeassistant.components.climate.const import (
     SWING_OFF,
     SWING_ON,
 )
-from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DUUX_CLIMATE_TYPES,
-    DUUX_DTID_THERMOSTAT,
-    DUUX_DTID_HEATER,
-    DUUX_DTID_AIR_CONDITIONER,
-    DOMAIN,
-    DUUX_STID_THREESIXTY_2023,
-    DUUX_STID_EDGEHEATER_V2,
-    DUUX_STID_EDGEHEATER_2000,
-    DUUX_STID_EDGEHEATER_2023_V1,
-    DUUX_STID_THREESIXTY_TWO,
-    DUUX_STID_NORTH,
-)
+from .const import DOMAIN
+from .discovery import discover
+from .duux_api import DuuxAPI
+from .lookup import LookupTable, raw_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,16 +40,10 @@ async def async_setup_entry(
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
-        sensor_type = device.get("sensorType") or {}
-        device_type_id = sensor_type.get("type")
-        google_type = sensor_type.get("googleDeviceType") or ""
-        last_word = (
-            google_type.split(".")[-1] if google_type else ""
-        )  # "HEATER" OR "THERMOSTAT"
-        sensor_type_id = device.get("sensorTypeId")
         device_id = device["deviceId"]
         coordinator = coordinators.get(device_id)
 
@@ -66,50 +51,10 @@ async def async_setup_entry(
         if coordinator is None:
             continue
 
-        model = sensor_type.get("name", "Unknown")
-
-        if device_type_id not in [
-            *DUUX_DTID_HEATER,
-            *DUUX_DTID_THERMOSTAT,
-            *DUUX_DTID_AIR_CONDITIONER,
-        ]:
-            if last_word in DUUX_CLIMATE_TYPES:
-                _LOGGER.warning(
-                    "Your device has not been officially catagorised as supporting the climate platform."
-                )
-                _LOGGER.warning(
-                    f"It is classified as type {last_word}, so attempting to set up as a climate device.",
-                )
-                _LOGGER.warning(
-                    "Please report this to the integration developer so they can update the supported device list.",
-                )
-                _LOGGER.warning(
-                    f"Required details: Device Name: {model}, Device Type ID: {device_type_id}, Sensor Type ID: {sensor_type_id}, Google Device Type: {google_type}",
-                )
-
-            else:
-                continue
-
-        # Create the appropriate climate entity based on heater type
-        if sensor_type_id == DUUX_STID_THREESIXTY_2023:
-            entities.append(DuuxThreesixtyClimate(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_EDGEHEATER_V2:
-            entities.append(DuuxEdgeTwoClimate(coordinator, api, device))
-        elif sensor_type_id in [
-            DUUX_STID_EDGEHEATER_2023_V1,
-            DUUX_STID_EDGEHEATER_2000,
-        ]:
-            entities.append(DuuxEdgeClimate(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_THREESIXTY_TWO:
-            entities.append(DuuxThreesixtyTwoClimate(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_NORTH:
-            entities.append(DuuxNorthClimate(coordinator, api, device))
-        else:
-            # Fallback to generic entity for unknown types
-            entities.append(DuuxClimateAutoDiscovery(coordinator, api, device))
-            _LOGGER.warning(
-                f"Unknown heater type {sensor_type_id}, using generic entity"
-            )
+        entities.extend(
+            ENTITY_CLASSES[name](coordinator, api, device)
+            for name in profiles[device_id].get(Platform.CLIMATE, ())
+        )
 
     async_add_entities(entities)
 
@@ -117,9 +62,13 @@ async def async_setup_entry(
 class DuuxClimate(CoordinatorEntity, ClimateEntity):
     """Representation of a Duux climate device."""
 
+    # fullData keys this entity reads; the coordinator only wakes it when one
+    # of them (or availability) changes.
+    _data_keys: frozenset[str] | None = frozenset({"power", "temp", "sp"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the climate device."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._data_keys)
         self._api = api
         self._device = device
         self._device_id = device["id"]
@@ -186,27 +135,19 @@ class DuuxClimate(CoordinatorEntity, ClimateEntity):
             return
 
         if temperature is not None:
-            await self.hass.async_add_executor_job(
-                self._api.set_temperature, self._device_mac, temperature
+            await self.coordinator.async_command(
+                self._api.set_temperature(self._device_mac, temperature),
+                {"sp": DuuxAPI.temperature_value(temperature)},
             )
-            newData = self.coordinator.data
-            newData["sp"] = temperature
-            self.coordinator.async_set_updated_data(newData)
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new HVAC mode."""
 
-        if hvac_mode == HVACMode.HEAT:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, True
-            )
-        else:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, False
-            )
-        newData = self.coordinator.data
-        newData["power"] = 1 if hvac_mode == HVACMode.HEAT else 0
-        self.coordinator.async_set_updated_data(newData)
+        power_on = hvac_mode == HVACMode.HEAT
+        await self.coordinator.async_command(
+            self._api.set_power(self._device_mac, power_on),
+            {"power": 1 if power_on else 0},
+        )
 
     async def async_set_preset_mode(self, preset_mode):
         """Set preset mode."""
@@ -225,11 +166,10 @@ class DuuxClimate(CoordinatorEntity, ClimateEntity):
                 self.coordinator.data or {}
         ).get("online", True)
 
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
-        )
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
 
     async def async_update(self):
         """Update the entity."""
@@ -255,6 +195,8 @@ class DuuxNorthClimate(DuuxClimate):
     values. Night-mode is still a separate switch entity.
     """
 
+    _data_keys = frozenset({"power", "temp", "sp", "mode", "fan", "tilt"})
+
     _MODE_TO_HVAC = {
         1: HVACMode.COOL,
         3: HVACMode.DRY,
@@ -309,27 +251,27 @@ class DuuxNorthClimate(DuuxClimate):
     async def async_set_hvac_mode(self, hvac_mode):
         """Turn off, or turn on + set mode together (mirrors the app's flow)."""
         if hvac_mode == HVACMode.OFF:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, False
+            await self.coordinator.async_command(
+                self._api.set_power(self._device_mac, False), {"power": 0}
             )
-            newData = self.coordinator.data
-            newData["power"] = 0
-            self.coordinator.async_set_updated_data(newData)
             return
 
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, True
-        )
         mode_value = self._HVAC_TO_MODE.get(hvac_mode)
         if mode_value is not None:
-            await self.hass.async_add_executor_job(
-                self._api.set_north_mode, self._device_mac, mode_value
+            await self.coordinator.async_command(
+                self._api.send_commands(
+                    self._device_mac,
+                    [
+                        DuuxAPI.power_command(True),
+                        DuuxAPI.north_mode_command(mode_value),
+                    ],
+                ),
+                {"power": 1, "mode": mode_value},
+            )
+        else:
+            await self.coordinator.async_command(
+                self._api.set_power(self._device_mac, True), {"power": 1}
             )
-        newData = self.coordinator.data
-        newData["power"] = 1
-        if mode_value is not None:
-            newData["mode"] = mode_value
-        self.coordinator.async_set_updated_data(newData)
 
     @property
     def fan_mode(self):
@@ -340,12 +282,9 @@ class DuuxNorthClimate(DuuxClimate):
     async def async_set_fan_mode(self, fan_mode):
         """Set fan speed."""
         raw = self._FAN_MODE_TO_RAW.get(fan_mode, 1)
-        await self.hass.async_add_executor_job(
-            self._api.set_north_fan_speed, self._device_mac, raw
+        await self.coordinator.async_command(
+            self._api.set_north_fan_speed(self._device_mac, raw), {"fan": raw}
         )
-        newData = self.coordinator.data
-        newData["fan"] = raw
-        self.coordinator.async_set_updated_data(newData)
 
     @property
     def swing_mode(self):
@@ -355,21 +294,36 @@ class DuuxNorthClimate(DuuxClimate):
     async def async_set_swing_mode(self, swing_mode):
         """Turn louver swing on/off."""
         value = 1 if swing_mode == self.SWING_ON else 0
-        await self.hass.async_add_executor_job(
-            self._api.set_tilt, self._device_mac, value
+        await self.coordinator.async_command(
+            self._api.set_tilt(self._device_mac, value), {"tilt": value}
         )
-        newData = self.coordinator.data
-        newData["tilt"] = value
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxClimateAutoDiscovery(DuuxClimate):
     """Duux climate autodiscovery."""
 
+    # Reads device-specific keys discovered at runtime.
+    _data_keys = None
+
     def __init__(self, coordinator, api, device):
         """Initialize the climate device."""
         super().__init__(coordinator, api, device)
-        self._presets = self.presets_discovery()
+        # Parsed once per model, as read-only {"name", "command", "value"}.
+        self._presets = discover(
+            type(self).__qualname__,
+            device,
+            (
+                (coordinator.data or {}).get("availableModes"),
+                device.get("sensorType"),
+            ),
+            self.presets_discovery,
+        )
+        self._preset_table = LookupTable(
+            (preset["name"], preset["value"]) for preset in self._presets
+        )
+        self._preset_by_name = {
+            preset["name"]: preset for preset in reversed(self._presets)
+        }
 
     def presets_discovery(self):
         """Discover available presets."""
@@ -452,35 +406,27 @@ class DuuxClimateAutoDiscovery(DuuxClimate):
     @property
     def preset_mode(self):
         """Return current preset mode."""
-        mode = (self.coordinator.data or {}).get("mode")
-        for preset in self._presets:
-            if preset["value"] == str(mode):
-                return preset["name"]
-        return None
+        return self._preset_table.label((self.coordinator.data or {}).get("mode"))
 
     @property
     def preset_modes(self):
         """Return available preset modes."""
         # Base implementation - override in subclasses if needed
-        return [preset["name"] for preset in self._presets]
+        return list(self._preset_table.labels)
 
     async def async_set_preset_mode(self, preset_mode):
         """Set preset mode."""
-        preset = next(
-            (p for p in self._presets if p["name"] == preset_mode), None
-        )
+        preset = self._preset_by_name.get(preset_mode)
         if preset is None:
             _LOGGER.warning(
                 "%s: unknown preset mode '%s'", self._attr_name, preset_mode
             )
             return
 
-        await self.hass.async_add_executor_job(
-            self._api.send_command, self._device_mac, f"tune set {preset['command']}"
+        await self.coordinator.async_command(
+            self._api.send_command(self._device_mac, f"tune set {preset['command']}"),
+            {"mode": raw_key(preset["value"])},
         )
-        newData = self.coordinator.data
-        newData["mode"] = preset["value"]
-        self.coordinator.async_set_updated_data(newData)
 
     @staticmethod
     def _deep_find(obj: Any, key: str) -> Iterator[Any]:
@@ -532,9 +478,12 @@ class DuuxThreesixtyTwoClimate(DuuxThreesixtyBase):
 class DuuxEdgeTwoClimate(DuuxClimate):
     """Duux Edge heater v2."""
 
+    _data_keys = frozenset({"power", "temp", "sp", "heatin"})
+
     PRESET_LOW = PRESET_ECO
     PRESET_BOOST = PRESET_BOOST
     PRESET_HIGH = PRESET_COMFORT
+    _PRESETS = LookupTable(((PRESET_LOW, 1), (PRESET_HIGH, 2), (PRESET_BOOST, 3)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the Edge climate device."""
@@ -546,34 +495,30 @@ class DuuxEdgeTwoClimate(DuuxClimate):
     @property
     def preset_modes(self):
         """Return available preset modes."""
-        return [self.PRESET_LOW, self.PRESET_HIGH, self.PRESET_BOOST]
+        return list(self._PRESETS.labels)
 
     @property
     def preset_mode(self):
         """Return current preset mode."""
-        mode = (self.coordinator.data or {}).get("heatin", self.PRESET_LOW)
-        mode_map = {1: self.PRESET_LOW, 2: self.PRESET_HIGH, 3: self.PRESET_BOOST}
-        return mode_map.get(mode)
+        return self._PRESETS.label((self.coordinator.data or {}).get("heatin"))
 
     async def async_set_preset_mode(self, preset_mode):
         """Set preset mode."""
-        mode_map = {self.PRESET_LOW: "1", self.PRESET_HIGH: "2", self.PRESET_BOOST: "3"}
-
-        mode = mode_map.get(preset_mode, 1)
+        mode = self._PRESETS.raw(preset_mode) or 1
 
-        await self.hass.async_add_executor_job(
-            self._api.set_mode, self._device_mac, mode
+        await self.coordinator.async_command(
+            self._api.set_mode(self._device_mac, str(mode)), {"heatin": mode}
         )
-        newData = self.coordinator.data
-        newData["heatin"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxEdgeClimate(DuuxClimate):
     """Duux Edge heater 2023 (v1)."""
 
+    _data_keys = frozenset({"power", "temp", "sp", "heatin"})
+
     PRESET_LOW = PRESET_ECO
     PRESET_HIGH = PRESET_COMFORT
+    _PRESETS = LookupTable(((PRESET_LOW, 1), (PRESET_HIGH, 2)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the Edge climate device."""
@@ -585,30 +530,31 @@ class DuuxEdgeClimate(DuuxClimate):
     @property
     def preset_modes(self):
         """Return available preset modes."""
-        return [self.PRESET_LOW, self.PRESET_HIGH]
+        return list(self._PRESETS.labels)
 
     @property
     def preset_mode(self):
         """Return current preset mode."""
-        mode = (self.coordinator.data or {}).get("heatin", self.PRESET_LOW)
-        mode_map = {
-            1: self.PRESET_LOW,
-            2: self.PRESET_HIGH,
-        }
-        return mode_map.get(mode)
+        return self._PRESETS.label((self.coordinator.data or {}).get("heatin"))
 
     async def async_set_preset_mode(self, preset_mode):
         """Set preset mode."""
-        mode_map = {
-            self.PRESET_LOW: "1",
-            self.PRESET_HIGH: "2",
-        }
-
-        mode = mode_map.get(preset_mode, 1)
+        mode = self._PRESETS.raw(preset_mode) or 1
 
-        await self.hass.async_add_executor_job(
-            self._api.set_mode, self._device_mac, mode
+        await self.coordinator.async_command(
+            self._api.set_mode(self._device_mac, str(mode)), {"heatin": mode}
         )
-        newData = self.coordinator.data
-        newData["heatin"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
+
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxClimateAutoDiscovery,
+        DuuxEdgeClimate,
+        DuuxEdgeTwoClimate,
+        DuuxNorthClimate,
+        DuuxThreesixtyClimate,
+        DuuxThreesixtyTwoClimate,
+    )
+}
@@ -3,14 +3,36 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_FAST_POLL_DEVICES,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MQTT_TOPIC,
+    CONF_POLL_INTERVAL,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+    MIN_POLL_INTERVAL,
+)
 from .duux_api import DuuxAPI
+from .push import topic_is_valid
+
 
 class DuuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Duux."""
     
     VERSION = 1
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return DuuxOptionsFlow()
     
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
@@ -20,10 +42,11 @@ class DuuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Test the credentials
             api = DuuxAPI(
                 email=user_input[CONF_EMAIL],
-                password=user_input[CONF_PASSWORD]
+                password=user_input[CONF_PASSWORD],
+                session=async_get_clientsession(self.hass),
             )
             
-            if await self.hass.async_add_executor_job(api.login):
+            if await api.login():
                 # Create entry
                 return self.async_create_entry(
                     title=user_input[CONF_EMAIL],
@@ -42,3 +65,64 @@ class DuuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors
         )
+
+
+class DuuxOptionsFlow(config_entries.OptionsFlow):
+    """Handle Duux options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+
+        if user_input is not None:
+            floor = user_input[CONF_MIN_POLL_INTERVAL]
+            topic = user_input.get(CONF_MQTT_TOPIC)
+            if topic and not topic_is_valid(topic):
+                errors[CONF_MQTT_TOPIC] = "invalid_mqtt_topic"
+            elif min(
+                user_input[CONF_POLL_INTERVAL], user_input[CONF_FAST_POLL_INTERVAL]
+            ) < floor:
+                errors["base"] = "below_min_poll_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id, {})
+        devices = {
+            device["deviceId"]: device.get("displayName") or device.get("name")
+            for device in entry_data.get("devices", [])
+        }
+        seconds = vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL))
+
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_MQTT_TOPIC,
+                description={"suggested_value": options.get(CONF_MQTT_TOPIC)},
+            ): str,
+            vol.Required(
+                CONF_POLL_INTERVAL,
+                default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+            ): seconds,
+            vol.Required(
+                CONF_FAST_POLL_DEVICES,
+                default=options.get(CONF_FAST_POLL_DEVICES, []),
+            ): cv.multi_select(devices),
+            vol.Required(
+                CONF_FAST_POLL_INTERVAL,
+                default=options.get(
+                    CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL
+                ),
+            ): seconds,
+            vol.Required(
+                CONF_MIN_POLL_INTERVAL,
+                default=options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL),
+            ): seconds,
+        })
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+            # Shown literally, as the placeholder the topic is written with.
+            description_placeholders={"mac": "{mac}"},
+        )
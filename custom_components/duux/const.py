@@ -1,9 +1,23 @@
 # custom_components/duux/const.py
+from datetime import timedelta
 from enum import Enum
 
+from homeassistant.const import Platform
+
 DOMAIN = "duux"
+# hass.data keys for the accounts shared between config entries, by login.
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+DATA_ACCOUNTS_LOCK = f"{DOMAIN}_accounts_lock"
 CONF_EMAIL = "email"
 CONF_PASSWORD = "password"
+# MQTT topic pushed device state arrives on, with "{mac}" for the device.
+CONF_MQTT_TOPIC = "mqtt_topic"
+# Polling options, all in seconds: the interval while a device is on, a
+# faster one for chosen devices and a floor no interval goes below.
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_FAST_POLL_DEVICES = "fast_poll_devices"
+CONF_FAST_POLL_INTERVAL = "fast_poll_interval"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
 ATTRIBUTION = "Data provided by Duux"
 
 # API URLs
@@ -12,6 +26,42 @@ API_LOGIN = "/auth/v4/login"
 API_SENSORS = "/smarthome/sensors"
 API_COMMANDS = "/sensor/{deviceMac}/commands"
 
+# Polling. The account is fetched in one request, as often as its most
+# active device needs: fast while something is changing, backing off to
+# POLL_INTERVAL_ON for devices that are on and POLL_INTERVAL_IDLE otherwise.
+POLL_INTERVAL_FAST = timedelta(seconds=10)
+POLL_INTERVAL_ON = timedelta(seconds=30)
+POLL_INTERVAL_IDLE = timedelta(minutes=5)
+# Devices reporting "online": false are probed at an interval doubling up
+# to this, and polled fast again as soon as they are back online.
+POLL_INTERVAL_OFFLINE = timedelta(hours=1)
+# While state is pushed over MQTT, polling only catches missed messages.
+POLL_INTERVAL_PUSH = timedelta(minutes=10)
+# Option defaults, in seconds. The floor can't be set below
+# MIN_POLL_INTERVAL, to stay clear of the cloud's rate limits.
+DEFAULT_POLL_INTERVAL = int(POLL_INTERVAL_ON.total_seconds())
+DEFAULT_FAST_POLL_INTERVAL = int(POLL_INTERVAL_FAST.total_seconds())
+DEFAULT_MIN_POLL_INTERVAL = int(POLL_INTERVAL_FAST.total_seconds())
+MIN_POLL_INTERVAL = 5
+# How long a device keeps polling fast after a command was sent to it.
+POLL_FAST_AFTER_COMMAND = timedelta(minutes=1)
+
+# After a command, refresh after each of these delays (in seconds, the last
+# one repeating) until the cloud reports the new values. Values still not
+# reported after COMMAND_CONFIRM_TIMEOUT are reverted.
+COMMAND_CONFIRM_DELAYS = (1, 2, 3, 5)
+COMMAND_CONFIRM_TIMEOUT = timedelta(seconds=20)
+
+# How many device coordinators run their first refresh at once during setup.
+SETUP_REFRESH_CONCURRENCY = 8
+
+# The device list and last known statuses are cached in a Store per config
+# entry, so entities can be set up before the cloud answers after a restart.
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + ".{entry_id}"
+# Seconds to collect status changes before writing the cache.
+STORAGE_SAVE_DELAY = 60
+
 # Sensor Type IDs
 DUUX_STID_THREESIXTY_TWO = 31
 DUUX_STID_THREESIXTY_2023 = 49
@@ -49,6 +99,111 @@ DUUX_SUPPORTED_TYPES = (
     + DUUX_FAN_TYPES
     + DUUX_AIR_PURIFIER_TYPES
 )
+DUUX_DTID_SUPPORTED = frozenset(
+    DUUX_DTID_THERMOSTAT
+    + DUUX_DTID_HEATER
+    + DUUX_DTID_HUMIDIFIER
+    + DUUX_DTID_FAN
+    + DUUX_DTID_AIR_PURIFIER
+    + DUUX_DTID_AIR_CONDITIONER
+    + DUUX_DTID_OTHER_HEATER
+)
+
+# Device profiles. Devices are classified once, in __init__.py, into the
+# entity classes to set up on each platform. Classes are named rather than
+# imported, so the platforms can import this module; each platform looks
+# the names up among its own classes.
+
+# Device type IDs and Google device types that get a device its main entity.
+PLATFORM_DEVICE_TYPES: dict[Platform, tuple[frozenset, frozenset]] = {
+    Platform.CLIMATE: (
+        frozenset(DUUX_DTID_HEATER + DUUX_DTID_THERMOSTAT + DUUX_DTID_AIR_CONDITIONER),
+        frozenset(DUUX_CLIMATE_TYPES),
+    ),
+    Platform.FAN: (
+        frozenset(DUUX_DTID_FAN + DUUX_DTID_AIR_PURIFIER),
+        frozenset(DUUX_FAN_TYPES),
+    ),
+    Platform.HUMIDIFIER: (frozenset(DUUX_DTID_HUMIDIFIER), frozenset()),
+}
+
+# The main entity for a device of one of those types whose model isn't in
+# DEVICE_PROFILES. Unknown de/humidifiers are skipped.
+DEFAULT_DEVICE_PROFILE: dict[Platform, tuple[str, ...]] = {
+    Platform.CLIMATE: ("DuuxClimateAutoDiscovery",),
+    Platform.FAN: ("DuuxFanAutoDiscovery",),
+    Platform.HUMIDIFIER: (),
+}
+
+_LOCK_AND_NIGHT_SWITCHES = ("DuuxChildLockSwitch", "DuuxNightModeSwitch")
+
+# Entity classes for each known model, by sensorTypeId. Sensors and selects
+# that depend on the keys a device reports are added by their platforms.
+DEVICE_PROFILES: dict[int, dict[Platform, tuple[str, ...]]] = {
+    DUUX_STID_THREESIXTY_TWO: {Platform.CLIMATE: ("DuuxThreesixtyTwoClimate",)},
+    DUUX_STID_THREESIXTY_2023: {Platform.CLIMATE: ("DuuxThreesixtyClimate",)},
+    DUUX_STID_EDGEHEATER_V2: {
+        Platform.CLIMATE: ("DuuxEdgeTwoClimate",),
+        Platform.SWITCH: _LOCK_AND_NIGHT_SWITCHES,
+        Platform.SELECT: ("DuuxTimerSelector",),
+    },
+    DUUX_STID_EDGEHEATER_2000: {
+        Platform.CLIMATE: ("DuuxEdgeClimate",),
+        Platform.SWITCH: _LOCK_AND_NIGHT_SWITCHES,
+    },
+    DUUX_STID_EDGEHEATER_2023_V1: {
+        Platform.CLIMATE: ("DuuxEdgeClimate",),
+        Platform.SWITCH: _LOCK_AND_NIGHT_SWITCHES,
+    },
+    DUUX_STID_NORTH: {
+        Platform.CLIMATE: ("DuuxNorthClimate",),
+        Platform.SWITCH: ("DuuxNightModeSwitch",),
+        Platform.SELECT: ("DuuxNorthTimerSelector",),
+    },
+    DUUX_STID_BORA_2024: {
+        Platform.HUMIDIFIER: ("DuuxBoraDehumidifier",),
+        Platform.SWITCH: (
+            "DuuxChildLockSwitch",
+            "DuuxSleepModeSwitch",
+            "DuuxCleaningModeSwitch",
+            "DuuxLaundryModeSwitch",
+        ),
+        Platform.SELECT: ("DuuxFanSpeedSelector", "DuuxTimerSelector"),
+        Platform.SENSOR: ("DuuxHumiditySensor", "DuuxBora2024TimeRemainingSensor"),
+    },
+    DUUX_STID_BEAM_MINI: {
+        Platform.HUMIDIFIER: ("DuuxBeamMiniDehumidifier",),
+        Platform.SELECT: ("DuuxTimerSelector",),
+        Platform.SENSOR: ("DuuxHumiditySensor", "DuuxTempSensor"),
+    },
+    DUUX_STID_NEO: {
+        Platform.HUMIDIFIER: ("DuuxNeoHumidifier",),
+        Platform.SWITCH: ("DuuxNightModeSwitch",),
+        Platform.SELECT: ("DuuxNeoSpeedSelector", "DuuxTimerSelector"),
+    },
+    DUUX_STID_WHISPER_FLEX: {Platform.FAN: ("DuuxWhisperFlexFan",)},
+    DUUX_STID_WHISPER_FLEX_2: {
+        Platform.FAN: ("DuuxWhisperFlexTwoFan",),
+        Platform.SWITCH: _LOCK_AND_NIGHT_SWITCHES,
+    },
+    DUUX_STID_WHISPER_FLEX_ULTIMATE: {Platform.FAN: ("DuuxWhisperFlexUltimateFan",)},
+    DUUX_STID_WHISPER_FLEX_ELIVATE: {
+        Platform.FAN: ("DuuxWhisperFlexElevateFan",),
+        Platform.SWITCH: ("DuuxNightModeSwitch", "DuuxIonizerSwitch"),
+    },
+    DUUX_STID_BRIGHT_2: {
+        Platform.FAN: ("DuuxAirPurifierFan",),
+        Platform.SWITCH: ("DuuxNightModeSwitch", "DuuxIonizerSwitch"),
+        Platform.SELECT: ("DuuxBright2TimerSelector",),
+        Platform.SENSOR: (
+            "DuuxPM25Sensor",
+            "DuuxTVOCSensor",
+            "DuuxFilterLifeSensor",
+            "DuuxAirQualitySensor",
+            "DuuxBright2TimeRemainingSensor",
+        ),
+    },
+}
 
 
 _ERRID_UNAVAILABLE = object()
@@ -18,7 +18,7 @@ async def async_get_config_entry_diagnostics(
     api = hass.data[DOMAIN][entry.entry_id]["api"]
 
     try:
-        data = await hass.async_add_executor_job(api.get_devices)
+        data = await api.get_devices()
         return async_redact_data(data, TO_REDACT)
     except Exception as err:
         raise UpdateFailed(f"Error communicating with API: {err}")
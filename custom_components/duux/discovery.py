@@ -0,0 +1,41 @@
+"""Trait discovery results shared by every device of the same model."""
+
+import hashlib
+import json
+from collections.abc import Callable
+from types import MappingProxyType
+from typing import Any
+
+# Frozen discovery results by (kind, sensorTypeId, trait blob fingerprint).
+_DISCOVERED: dict[tuple, Any] = {}
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of parsed trait data (dicts and lists)."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _fingerprint(blob: Any) -> str:
+    """Return a stable hash of a trait blob."""
+    encoded = json.dumps(blob, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded, usedforsecurity=False).hexdigest()
+
+
+def discover(kind: str, device: dict, blob: Any, parse: Callable[[], Any]) -> Any:
+    """Return the frozen result of parse() for this device's model.
+
+    Devices with the same sensorTypeId and trait blob share one parse, so
+    a house full of identical fans parses its traits once. Devices without
+    a sensorTypeId are parsed every time.
+    """
+    sensor_type_id = device.get("sensorTypeId")
+    if sensor_type_id is None:
+        return freeze(parse())
+    key = (kind, sensor_type_id, _fingerprint(blob))
+    if (discovered := _DISCOVERED.get(key)) is None:
+        discovered = _DISCOVERED[key] = freeze(parse())
+    return discovered
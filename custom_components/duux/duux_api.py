@@ -1,36 +1,257 @@
 # custom_components/duux/duux_api.py
 
+import asyncio
+import hashlib
+import json
 import logging
+import random
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from functools import partial
+from time import time
 
-import requests
+import aiohttp
+
+try:
+    import orjson
+except ImportError:  # optional, only makes device list polls cheaper
+    orjson = None
 
 from .const import API_BASE_URL, API_COMMANDS, API_LOGIN, API_SENSORS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Statuses the cloud returns once a token has expired or been revoked.
+AUTH_FAILED_STATUSES = (401, 403)
+TOO_MANY_REQUESTS = 429
+
+# Device list fields kept by get_devices(projected=True).
+POLL_FIELDS = ("deviceId", "online", "connectionType")
+
+# Rate limiter priorities; lower goes first.
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+# How long a slider-style write waits for a newer value before it is sent.
+COMMAND_DEBOUNCE = 0.3
+
+
+class CommandResult(IntEnum):
+    """Outcome of DuuxAPI.send_command.
+
+    Truthy for anything but FAILED, so callers that only check success
+    keep working.
+    """
+
+    FAILED = 0
+    SENT = 1
+    # Replaced by a newer value for the same device and setting before it
+    # was sent; the newer value is the one that goes out.
+    MERGED = 2
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How DuuxAPI retries transient failures (dropped connections, 5xx)."""
+
+    attempts: int = 4
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    # Wall-clock budget for one call, shared by every attempt and backoff.
+    deadline: float = 10.0
+
+    def backoff(self, retry):
+        """Return a "full jitter" delay for the given retry (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class RateLimiter:
+    """Token bucket shared by every request made through one DuuxAPI.
+
+    Requests at PRIORITY_COMMAND are let through before waiting ones at
+    PRIORITY_POLL. When the cloud throttles us the rate is halved and
+    requests are held until Retry-After has passed; the rate then climbs
+    back towards `rate` by `recovery` requests/s every second.
+    """
+
+    def __init__(self, rate=2.0, burst=10, min_rate=0.1, recovery=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._tokens = float(burst)
+        self._updated = None
+        self._blocked_until = 0.0
+        self._waiting = [0, 0]
+
+    def _refill(self, now):
+        if self._updated is not None and now > self._updated:
+            elapsed = now - self._updated
+            if now >= self._blocked_until:
+                self.rate = min(self.max_rate, self.rate + self.recovery * elapsed)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority=PRIORITY_POLL):
+        """Wait until a request at `priority` may be sent."""
+        loop = asyncio.get_running_loop()
+        self._waiting[priority] += 1
+        try:
+            while True:
+                now = loop.time()
+                self._refill(now)
+                queued_ahead = any(self._waiting[:priority])
+                if (
+                    now >= self._blocked_until
+                    and self._tokens >= 1
+                    and not queued_ahead
+                ):
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(
+                    max(
+                        self._blocked_until - now,
+                        (1 - self._tokens) / self.rate,
+                        1 / self.rate if queued_ahead else 0,
+                    )
+                )
+        finally:
+            self._waiting[priority] -= 1
+
+    def throttled(self, retry_after=None):
+        """Back off after the cloud answered 429 or sent Retry-After."""
+        now = asyncio.get_running_loop().time()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        if retry_after is None:
+            retry_after = 1 / self.rate
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+        _LOGGER.warning(
+            "Duux API is throttling requests, slowing down to %.2f/s for %.0fs",
+            self.rate,
+            retry_after,
+        )
+
+    def blocked_for(self):
+        """Seconds until requests may be sent again after throttling."""
+        return max(0.0, self._blocked_until - asyncio.get_running_loop().time())
+
+
+def _retry_after(response):
+    """Return the Retry-After header in seconds, or None if absent/invalid."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _loads(body):
+    """Decode a JSON response body, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _project(device):
+    """Keep only what polling needs from a device list entry.
+
+    Drops sensorType (and its large Traits blob), which is only needed once
+    when entities are set up.
+    """
+    projected = {key: device[key] for key in POLL_FIELDS if key in device}
+    if (latest_data := device.get("latestData")) is not None:
+        projected["latestData"] = {"fullData": latest_data.get("fullData")}
+    return projected
+
+
+@dataclass
+class _DeviceListCache:
+    """The last device list read, and how to tell if the next one differs."""
+
+    devices: list | None = None
+    digest: bytes | None = None
+    # Conditional request headers (If-None-Match / If-Modified-Since).
+    validators: dict = field(default_factory=dict)
+    # `devices` by MAC, rebuilt whenever it changes.
+    by_mac: dict = field(default_factory=dict)
+
+    def update(self, devices, digest):
+        """Store a newly decoded device list and index it."""
+        self.devices = devices
+        self.digest = digest
+        self.by_mac = {device.get("deviceId"): device for device in devices or ()}
+
+
+def _is_transient(err):
+    """Return True for errors worth retrying."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500 or err.status == TOO_MANY_REQUESTS
+    return isinstance(err, (aiohttp.ClientError, TimeoutError))
+
 
 class DuuxAPI:
     """Class to communicate with Duux API."""
 
-    def __init__(self, email, password):
-        """Initialize the API."""
+    def __init__(
+        self,
+        email,
+        password,
+        session: aiohttp.ClientSession,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """Initialize the API.
+
+        `session` is Home Assistant's shared aiohttp session, so the auth
+        header is sent per request rather than set on the session itself.
+        """
         self.email = email
         self.password = password
         self.token = None
-        self.session = requests.Session()
+        self.session = session
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._headers = {}
+        self._login_lock = asyncio.Lock()
+        # (device_mac, "tune set <key>") -> (command, future) awaiting send
+        self._pending_commands = {}
+        self._command_flushers = {}
+        # Last /smarthome/sensors result, full and projected, by `projected`.
+        self._device_lists = {False: _DeviceListCache(), True: _DeviceListCache()}
+
+    async def login(self):
+        """Login to Duux API.
+
+        Goes through the same lock as a re-login after a rejected token, so
+        it never replaces a token a request is using. If another login
+        finished while this one waited, its token is reused.
+        """
+        return await self._relogin(self.token)
 
-    def login(self):
-        """Login to Duux API."""
+    async def _login(self):
+        """Log in unconditionally; callers hold _login_lock."""
         try:
-            response = self.session.post(
+            await self.rate_limiter.acquire(PRIORITY_COMMAND)
+            async with self.session.post(
                 f"{API_BASE_URL}{API_LOGIN}",
                 json={"username": self.email, "password": self.password},
-            )
-            response.raise_for_status()
-            data = response.json()
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
             self.token = data.get("token")
             if self.token:
-                self.session.headers.update({"Authorization": f"{self.token}"})
+                self._headers = {"Authorization": f"{self.token}"}
                 _LOGGER.info("Successfully logged in to Duux API")
                 return True
 
@@ -41,178 +262,407 @@ class DuuxAPI:
             _LOGGER.error(f"Login failed: {e}")
             return False
 
-    def get_devices(self):
-        """Get all Duux devices."""
+    async def _relogin(self, stale_token):
+        """Log in again after `stale_token` was rejected.
+
+        Only one login runs at a time. Callers that were waiting on it see
+        that the token has already changed and reuse the new one instead of
+        logging in again themselves.
+        """
+        async with self._login_lock:
+            if self.token != stale_token:
+                return self.token is not None
+            if stale_token is not None:
+                _LOGGER.info("Duux API token rejected, logging in again")
+            return await self._login()
+
+    async def _request(
+        self, method, url, json=None, read=None, headers=None, priority=PRIORITY_POLL
+    ):
+        """Send a request, retrying transient failures with backoff.
+
+        Every attempt, backoff sleep and rate limiter wait counts against the
+        policy's deadline, so a call never takes longer than that in total.
+        """
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline
+        retry = 0
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    return await self._authenticated_request(
+                        method, url, json, read, headers, priority
+                    )
+            except (aiohttp.ClientError, TimeoutError) as err:
+                retry += 1
+                if not _is_transient(err) or retry >= policy.attempts:
+                    raise
+                delay = max(policy.backoff(retry), self.rate_limiter.blocked_for())
+                if loop.time() + delay >= deadline:
+                    raise
+                _LOGGER.debug(
+                    "%s %s failed (%s), retry %d in %.2fs",
+                    method,
+                    url,
+                    err,
+                    retry,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def _authenticated_request(self, method, url, json, read, headers, priority):
+        """Send an authenticated request, re-logging in once on 401/403.
+
+        `read`, if given, is awaited with the response and its result returned.
+        """
+        for attempt in range(2):
+            token = self.token
+            await self.rate_limiter.acquire(priority)
+            async with self.session.request(
+                method,
+                url,
+                json=json,
+                headers={**self._headers, **headers} if headers else self._headers,
+            ) as response:
+                retry_after = _retry_after(response)
+                if response.status == TOO_MANY_REQUESTS or retry_after is not None:
+                    self.rate_limiter.throttled(retry_after)
+                if response.status not in AUTH_FAILED_STATUSES or attempt:
+                    response.raise_for_status()
+                    if read is not None:
+                        return await read(response)
+                    return None
+
+            if not await self._relogin(token):
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message="Re-login to Duux API failed",
+                )
+
+    async def get_devices(self, projected=False):
+        """Get all Duux devices.
+
+        With `projected`, each entry only has the POLL_FIELDS and
+        latestData.fullData, which is all a status poll needs.
+
+        If nothing changed since the last call, the previous list object is
+        returned as-is, so callers can skip work with an identity check.
+        """
+        cache = self._device_lists[projected]
         try:
-            response = self.session.get(f"{API_BASE_URL}{API_SENSORS}")
-            response.raise_for_status()
-            devices = response.json().get("data")
+            devices = await self._request(
+                "GET",
+                f"{API_BASE_URL}{API_SENSORS}",
+                read=partial(self._read_devices, cache=cache, projected=projected),
+                headers=cache.validators,
+            )
             _LOGGER.debug(f"Found {len(devices)} Duux device(s)")
             return devices
         except Exception as e:
-            # todo: refresh the login session and try again.
             _LOGGER.error(f"Failed to get devices: {e}")
             return []
 
-    def get_device_status(self, device_id):
+    async def _read_devices(self, response, cache, projected):
+        """Parse a device list response, reusing the last one if unchanged.
+
+        Uses the ETag/Last-Modified validators when the server sends them,
+        and otherwise compares a digest of the body before decoding it.
+        """
+        if response.status == 304 and cache.devices is not None:
+            return cache.devices
+
+        body = await response.read()
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest != cache.digest or cache.devices is None:
+            devices = _loads(body).get("data")
+            if projected and devices is not None:
+                devices = [_project(device) for device in devices]
+            cache.update(devices, digest)
+
+        cache.validators = {
+            request_header: response.headers[response_header]
+            for request_header, response_header in (
+                ("If-None-Match", "ETag"),
+                ("If-Modified-Since", "Last-Modified"),
+            )
+            if response_header in response.headers
+        }
+        return cache.devices
+
+    async def get_device_status(self, device_id):
         """Get status of a specific device."""
-        devices = self.get_devices()
-        for device in devices:
-            if device.get("deviceId") == device_id:
-                connection_type = device.get("connectionType")
-                latest_data = device.get("latestData")
-                if latest_data is None:
-                    return {
-                        "online": device.get("online", True),
-                        "connectionType": connection_type,
-                    }
-
-                data = latest_data.get("fullData")
-                if data is None:
-                    return {
-                        "online": device.get("online", True),
-                        "connectionType": connection_type,
-                    }
-
-                data_copy = data.copy()
-                data_copy["online"] = device.get("online", True)
-                data_copy["connectionType"] = connection_type
-                return data_copy
-        return {}
-
-    def send_command(self, device_mac, command):
-        """Send command to device."""
+        if not await self.get_devices(projected=True):
+            return {}
+        device = self._device_lists[True].by_mac.get(device_id)
+        if device is None:
+            return {}
+        return self.device_status(device)
+
+    @staticmethod
+    def device_status(device):
+        """Build the coordinator payload for one entry of the device list."""
+        connection_type = device.get("connectionType")
+        latest_data = device.get("latestData")
+        if latest_data is None:
+            return {
+                "online": device.get("online", True),
+                "connectionType": connection_type,
+            }
+
+        data = latest_data.get("fullData")
+        if data is None:
+            return {
+                "online": device.get("online", True),
+                "connectionType": connection_type,
+            }
+
+        data_copy = data.copy()
+        data_copy["online"] = device.get("online", True)
+        data_copy["connectionType"] = connection_type
+        return data_copy
+
+    async def send_command(self, device_mac, command, coalesce=False):
+        """Send command to device.
+
+        With `coalesce`, the command is held for COMMAND_DEBOUNCE seconds and
+        only the newest value for the same device and setting is sent; the
+        ones it replaced resolve as CommandResult.MERGED.
+        """
+        if coalesce:
+            return await self._send_coalesced(device_mac, command)
+
         try:
             url = f"{API_BASE_URL}{API_COMMANDS}".replace("{deviceMac}", device_mac)
-            response = self.session.post(url, json={"command": command})
-            response.raise_for_status()
+            await self._request(
+                "POST", url, json={"command": command}, priority=PRIORITY_COMMAND
+            )
             _LOGGER.info(f"Command sent: {command}")
-            return True
+            return CommandResult.SENT
         except Exception as e:
             _LOGGER.error(f"Failed to send command: {e}")
-            return False
+            return CommandResult.FAILED
+
+    async def _send_coalesced(self, device_mac, command):
+        """Queue `command`, replacing any unsent value for the same setting."""
+        # "tune set speed 12" -> "tune set speed"
+        slot = (device_mac, command.rsplit(" ", 1)[0])
+        future = asyncio.get_running_loop().create_future()
+
+        if (pending := self._pending_commands.get(slot)) is not None:
+            _LOGGER.debug(f"Command merged: {pending[0]} -> {command}")
+            # Its caller may have given up waiting, cancelling the future.
+            if not pending[1].done():
+                pending[1].set_result(CommandResult.MERGED)
+        self._pending_commands[slot] = (command, future)
+
+        if slot not in self._command_flushers:
+            self._command_flushers[slot] = asyncio.create_task(
+                self._flush_commands(slot)
+            )
+        return await future
 
-    def set_power(self, device_mac, power_on):
-        """Turn device on or off."""
+    async def _flush_commands(self, slot):
+        """Send the newest queued command for `slot` until none are left."""
+        future = None
+        try:
+            while slot in self._pending_commands:
+                await asyncio.sleep(COMMAND_DEBOUNCE)
+                command, future = self._pending_commands.pop(slot)
+                result = await self.send_command(slot[0], command)
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # If cancelled, fail whatever was being sent or is still queued.
+            self._command_flushers.pop(slot, None)
+            futures = [future]
+            if (pending := self._pending_commands.pop(slot, None)) is not None:
+                futures.append(pending[1])
+            for future in futures:
+                if future is not None and not future.done():
+                    future.set_result(CommandResult.FAILED)
+
+    async def send_commands(self, device_mac, commands):
+        """Send several commands to one device as a single action.
+
+        The commands go out one after another, in the given order, over the
+        shared keep-alive session: some devices ignore settings while off, or
+        reject a speed before the mode it belongs to. Stops at the first
+        command that fails; returns CommandResult.SENT only if every command
+        was sent.
+        """
+        for command in commands:
+            if not await self.send_command(device_mac, command):
+                return CommandResult.FAILED
+        return CommandResult.SENT
+
+    # Command builders, for use with send_commands().
+
+    @staticmethod
+    def power_command(power_on):
         value = "01" if power_on else "00"
-        return self.send_command(device_mac, f"tune set power {value}")
+        return f"tune set power {value}"
+
+    @staticmethod
+    def temperature_value(temperature):
+        """Return the set-point sent for a target temperature (5-36°C)."""
+        return max(5, min(36, int(temperature)))
+
+    @staticmethod
+    def humidity_value(humidity):
+        """Return the set-point sent for a target humidity (30-80%)."""
+        return max(30, min(80, int(humidity)))
+
+    @staticmethod
+    def speed_command(speed, min_speed, max_speed):
+        speed = max(min_speed, min(max_speed, int(speed)))
+        return f"tune set speed {speed}"
 
-    def set_temperature(self, device_mac, temperature):
+    @staticmethod
+    def mode_command(mode):
+        mode_val = max(1, min(3, int(mode)))
+        return f"tune set heating {mode_val}"
+
+    @staticmethod
+    def ionizer_command(ion_on):
+        value = "1" if ion_on else "0"
+        return f"tune set ion {value}"
+
+    @staticmethod
+    def timer_command(hours):
+        value = max(0, min(24, int(hours)))
+        return f"tune set timer {value}"
+
+    @staticmethod
+    def north_mode_command(mode):
+        mode = max(1, min(4, int(mode)))
+        return f"tune set mode {mode}"
+
+    async def set_power(self, device_mac, power_on):
+        """Turn device on or off."""
+        return await self.send_command(device_mac, self.power_command(power_on))
+
+    async def set_temperature(self, device_mac, temperature):
         """Set target temperature (5-36°C)."""
-        temp = max(5, min(36, int(temperature)))
+        temp = self.temperature_value(temperature)
         # note: Both temperature for heaters and humidity for de-humidifiers
         #       use 'set-point' (aka 'sp') to track a target value.
-        return self.send_command(device_mac, f"tune set sp {temp}")
+        return await self.send_command(
+            device_mac, f"tune set sp {temp}", coalesce=True
+        )
 
-    def set_fan_speed(self, device_mac, speed):
+    async def set_fan_speed(self, device_mac, speed):
         """Set fan speed (1-30)."""
-        return self.set_speed(device_mac, speed, 1, 30)
+        return await self.set_speed(device_mac, speed, 1, 30)
 
-    def set_purifier_speed(self, device_mac, speed):
+    async def set_purifier_speed(self, device_mac, speed):
         """Set purifier speed (0=Auto, 1-4=Speed)."""
-        return self.set_speed(device_mac, speed, 0, 4)
+        return await self.set_speed(device_mac, speed, 0, 4)
 
-    def set_speed(self, device_mac, speed, min_speed, max_speed):
+    async def set_speed(self, device_mac, speed, min_speed, max_speed):
         """Set device speed, clamped to [min_speed, max_speed]."""
-        speed = max(min_speed, min(max_speed, int(speed)))
-        return self.send_command(device_mac, f"tune set speed {speed}")
+        return await self.send_command(
+            device_mac,
+            self.speed_command(speed, min_speed, max_speed),
+            coalesce=True,
+        )
 
-    def set_humidity(self, device_mac, humidity):
+    async def set_humidity(self, device_mac, humidity):
         """Set target humidity (30-80%)."""
-        humidity = max(30, min(80, int(humidity)))
+        humidity = self.humidity_value(humidity)
         # note: Both temperature for heaters and humidity for de-humidifiers
         #       use 'set-point' (aka 'sp') to track a target value.
-        return self.send_command(device_mac, f"tune set sp {humidity}")
+        return await self.send_command(
+            device_mac, f"tune set sp {humidity}", coalesce=True
+        )
 
-    def set_mode(self, device_mac, mode):
+    async def set_mode(self, device_mac, mode):
         """Set heater mode (1=Low, 2=High, 3=Boost)."""
-        mode_val = max(1, min(3, int(mode)))
-        return self.send_command(device_mac, f"tune set heating {mode_val}")
+        return await self.send_command(device_mac, self.mode_command(mode))
 
-    def set_dry_mode(self, device_mac, mode):
+    async def set_dry_mode(self, device_mac, mode):
         """Set dryer mode (0=Auto, 1=Continuous)."""
         mode_val = max(0, min(1, int(mode)))
-        return self.send_command(device_mac, f"tune set mode {mode_val}")
+        return await self.send_command(device_mac, f"tune set mode {mode_val}")
 
-    def set_fan(self, device_mac, mode):
+    async def set_fan(self, device_mac, mode):
         """Set fan mode (1=Low, 0=High)."""
         mode_val = max(0, min(1, int(mode)))
-        return self.send_command(device_mac, f"tune set fan {mode_val}")
+        return await self.send_command(device_mac, f"tune set fan {mode_val}")
 
-    def set_ionizer(self, device_mac, ion_on):
+    async def set_ionizer(self, device_mac, ion_on):
         """Set ionizer on or off."""
-        value = "1" if ion_on else "0"
-        return self.send_command(device_mac, f"tune set ion {value}")
+        return await self.send_command(device_mac, self.ionizer_command(ion_on))
 
-    def set_night_mode(self, device_mac, night_on):
+    async def set_night_mode(self, device_mac, night_on):
         """Set night mode."""
         value = "01" if night_on else "00"
-        return self.send_command(device_mac, f"tune set night {value}")
+        return await self.send_command(device_mac, f"tune set night {value}")
 
-    def set_sleep_mode(self, device_mac, sleep_on):
+    async def set_sleep_mode(self, device_mac, sleep_on):
         """Set sleep mode."""
         value = "01" if sleep_on else "00"
-        return self.send_command(device_mac, f"tune set sleep {value}")
+        return await self.send_command(device_mac, f"tune set sleep {value}")
 
-    def set_lock(self, device_mac, locked):
+    async def set_lock(self, device_mac, locked):
         """Set child lock."""
         value = 1 if locked else 0
-        return self.send_command(device_mac, f"tune set lock {value}")
+        return await self.send_command(device_mac, f"tune set lock {value}")
 
-    def set_cleaning_mode(self, device_mac, cleaning_on):
+    async def set_cleaning_mode(self, device_mac, cleaning_on):
         """Set self-cleaning mode."""
         value = "01" if cleaning_on else "00"
-        return self.send_command(device_mac, f"tune set dry {value}")
+        return await self.send_command(device_mac, f"tune set dry {value}")
 
-    def set_laundry_mode(self, device_mac, laundry_on):
+    async def set_laundry_mode(self, device_mac, laundry_on):
         """Set laundry mode."""
         value = "01" if laundry_on else "00"
-        return self.send_command(device_mac, f"tune set laundr {value}")
+        return await self.send_command(device_mac, f"tune set laundr {value}")
 
-    def set_timer(self, device_mac, hours):
+    async def set_timer(self, device_mac, hours):
         """Set timer in hours."""
-        value = max(0, min(24, int(hours)))
-        return self.send_command(device_mac, f"tune set timer {value}")
+        return await self.send_command(device_mac, self.timer_command(hours))
 
-    def set_humidifier_mode(self, device_mac, mode):
+    async def set_humidifier_mode(self, device_mac, mode):
         """Set humidifier mode (0=Normal, 1=Auto)."""
         mode_val = max(0, min(1, int(mode)))
-        return self.send_command(device_mac, f"tune set mode {mode_val}")
+        return await self.send_command(device_mac, f"tune set mode {mode_val}")
 
-    def set_horosc_angle(self, device_mac, value):
+    async def set_horosc_angle(self, device_mac, value):
         """Set horizontal oscillation (0=off, 1=30°, 2=60°, 3=90°)."""
         value = max(0, min(3, int(value)))
-        return self.send_command(device_mac, f"tune set horosc {value}")
+        return await self.send_command(device_mac, f"tune set horosc {value}")
 
-    def set_horosc_bool(self, device_mac, value):
+    async def set_horosc_bool(self, device_mac, value):
         """Set horizontal oscillation (0=off, 1=on)."""
         value = max(0, min(1, int(value)))
-        return self.send_command(device_mac, f"tune set horosc {value}")
+        return await self.send_command(device_mac, f"tune set horosc {value}")
 
-    def set_verosc(self, device_mac, value):
+    async def set_verosc(self, device_mac, value):
         """Set vertical oscillation (0=off, 1=45°, 2=100°)."""
         value = max(0, min(2, int(value)))
-        return self.send_command(device_mac, f"tune set verosc {value}")
+        return await self.send_command(device_mac, f"tune set verosc {value}")
 
-    def set_swing(self, device_mac, value):
+    async def set_swing(self, device_mac, value):
         """Set swing level (0=off, 1=30°, 2=60°, 3=90°)."""
         value = max(0, min(3, int(value)))
-        return self.send_command(device_mac, f"tune set swing {value}")
+        return await self.send_command(device_mac, f"tune set swing {value}")
 
-    def set_tilt(self, device_mac, value):
+    async def set_tilt(self, device_mac, value):
         """Set vertical tilt (0=off, 1=45°, 2=100°)."""
         value = max(0, min(2, int(value)))
-        return self.send_command(device_mac, f"tune set tilt {value}")
+        return await self.send_command(device_mac, f"tune set tilt {value}")
 
-    def set_north_fan_speed(self, device_mac, speed):
+    async def set_north_fan_speed(self, device_mac, speed):
         """Set the North AC's fan speed (1=Low, 2=Medium, 3=High). Same
         "tune set fan" command as the heater's set_fan(), but with a
         3-level range instead of binary. Can't reuse that method directly.
         """
         speed = max(1, min(3, int(speed)))
-        return self.send_command(device_mac, f"tune set fan {speed}")
+        return await self.send_command(device_mac, f"tune set fan {speed}")
 
-    def set_north_mode(self, device_mac, mode):
+    async def set_north_mode(self, device_mac, mode):
         """Set the North AC's mode (1=Cool, 3=Dry, 4=Fan-only)."""
-        mode = max(1, min(4, int(mode)))
-        return self.send_command(device_mac, f"tune set mode {mode}")
\ No newline at end of file
+        return await self.send_command(device_mac, self.north_mode_command(mode))
\ No newline at end of file
@@ -10,27 +10,19 @@ from homeassistant.components.fan import (
     FanEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.percentage import (
-    ordered_list_item_to_percentage,
-    percentage_to_ordered_list_item,
     percentage_to_ranged_value,
     ranged_value_to_percentage,
 )
 
-from .const import (
-    DOMAIN,
-    DUUX_DTID_AIR_PURIFIER,
-    DUUX_FAN_TYPES,
-    DUUX_DTID_FAN,
-    DUUX_STID_WHISPER_FLEX,
-    DUUX_STID_WHISPER_FLEX_2,
-    DUUX_STID_BRIGHT_2,
-    DUUX_STID_WHISPER_FLEX_ELIVATE,
-    DUUX_STID_WHISPER_FLEX_ULTIMATE,
-)
+from .const import DOMAIN
+from .discovery import discover
+from .duux_api import DuuxAPI
+from .lookup import LookupTable, raw_key, speed_table
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,6 +31,9 @@ _LOGGER = logging.getLogger(__name__)
 PRESET_MODE_NORMAL = "normal"
 PRESET_MODE_NATURAL = "natural"
 PRESET_MODE_NIGHT = "night"
+PRESET_MODES = LookupTable(
+    ((PRESET_MODE_NORMAL, 0), (PRESET_MODE_NATURAL, 1), (PRESET_MODE_NIGHT, 2))
+)
 
 
 async def async_setup_entry(
@@ -51,57 +46,21 @@ async def async_setup_entry(
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
-        sensor_type = device.get("sensorType") or {}
-        device_type_id = sensor_type.get("type")
-        google_type = sensor_type.get("googleDeviceType") or ""
-        last_word = (
-            google_type.split(".")[-1] if google_type else ""
-        )  # "HEATER" OR "THERMOSTAT"
-        sensor_type_id = device.get("sensorTypeId")
-        device_id = device.get("deviceId")
+        device_id = device["deviceId"]
         coordinator = coordinators.get(device_id)
 
         # Skip devices that have no coordinator (were filtered out in __init__)
         if coordinator is None:
             continue
 
-        model = sensor_type.get("name", "Unknown")
-
-        if device_type_id not in [*DUUX_DTID_FAN, *DUUX_DTID_AIR_PURIFIER]:
-            if last_word in DUUX_FAN_TYPES:
-                _LOGGER.warning(
-                    "Device '%s' (type=%s, sensorTypeId=%s, googleType=%s) is not "
-                    "officially categorised as a fan but matches a known fan Google "
-                    "type — attempting to set up as fan. Please report this to the "
-                    "integration developer.",
-                    model,
-                    device_type_id,
-                    sensor_type_id,
-                    google_type,
-                )
-            else:
-                continue
-
-        if sensor_type_id == DUUX_STID_WHISPER_FLEX_2:
-            entities.append(DuuxWhisperFlexTwoFan(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_WHISPER_FLEX:
-            entities.append(DuuxWhisperFlexFan(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_BRIGHT_2:
-            entities.append(DuuxAirPurifierFan(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_WHISPER_FLEX_ULTIMATE:
-            entities.append(DuuxWhisperFlexUltimateFan(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_WHISPER_FLEX_ELIVATE:
-            entities.append(DuuxWhisperFlexElevateFan(coordinator, api, device))
-        else:
-            entities.append(DuuxFanAutoDiscovery(coordinator, api, device))
-            _LOGGER.warning(
-                "Unknown fan sensorTypeId %s for device '%s' — using generic autodiscovery entity.",
-                sensor_type_id,
-                model,
-            )
+        entities.extend(
+            ENTITY_CLASSES[name](coordinator, api, device)
+            for name in profiles[device_id].get(Platform.FAN, ())
+        )
 
     async_add_entities(entities)
 
@@ -109,6 +68,10 @@ async def async_setup_entry(
 class DuuxFan(CoordinatorEntity, FanEntity):
     """Representation of a DUUX fan."""
 
+    # fullData keys this entity reads; the coordinator only wakes it when one
+    # of them (or availability) changes.
+    _data_keys: frozenset[str] | None = frozenset({"power", "speed", "mode"})
+
     def __init__(
         self,
         coordinator,
@@ -116,7 +79,7 @@ class DuuxFan(CoordinatorEntity, FanEntity):
         device,
     ) -> None:
         """Initialize the fan."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._data_keys)
         self._api = api
         self._device = device
         self._device_id = device["id"]
@@ -143,6 +106,11 @@ class DuuxFan(CoordinatorEntity, FanEntity):
             self.coordinator.data or {}
         ).get("online", True)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
     @property
     def device_info(self):
         """Return device information."""
@@ -153,33 +121,28 @@ class DuuxFan(CoordinatorEntity, FanEntity):
             "model": self._device.get("sensorType", {}).get("name", "Unknown"),
         }
 
+    @property
+    def _speed_range(self) -> list[int]:
+        """Return the device's speeds, lowest first."""
+        return list(self._speeds.speeds)
+
+    @_speed_range.setter
+    def _speed_range(self, speeds) -> None:
+        """Set the device's speeds, with their percentages precomputed."""
+        self._speeds = speed_table(tuple(speeds))
+
     @property
     def is_on(self) -> bool:
         return (self.coordinator.data or {}).get("power") == 1
 
     @property
     def percentage(self) -> int | None:
-        speed = (self.coordinator.data or {}).get("speed")
-        if speed is None:
-            return None
-        try:
-            return ordered_list_item_to_percentage(self._speed_range, int(speed))
-        except (ValueError, KeyError):
-            return None
+        return self._speeds.percentage((self.coordinator.data or {}).get("speed"))
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode."""
-        mode = (self.coordinator.data or {}).get("mode")
-
-        if mode == 0:
-            return PRESET_MODE_NORMAL
-        elif mode == 1:
-            return PRESET_MODE_NATURAL
-        elif mode == 2:
-            return PRESET_MODE_NIGHT
-
-        return None
+        return PRESET_MODES.label((self.coordinator.data or {}).get("mode"))
 
     async def async_turn_on(
         self,
@@ -187,28 +150,40 @@ class DuuxFan(CoordinatorEntity, FanEntity):
         preset_mode: str | None = None,
         **kwargs: Any,
     ) -> None:
-        """Turn on the fan."""
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, True
-        )
-        newData = self.coordinator.data
-        newData["power"] = True
-        self.coordinator.async_set_updated_data(newData)
+        """Turn on the fan, applying any speed and preset in the same batch."""
+        if percentage == 0:
+            await self.async_turn_off()
+            return
 
-        if percentage is not None:
-            await self.async_set_percentage(percentage)
+        commands = [DuuxAPI.power_command(True)]
+        values = {"power": True}
 
-        if preset_mode is not None:
-            await self.async_set_preset_mode(preset_mode)
+        # The mode goes before the speed, which some modes would reject.
+        preset_command = self._preset_command(preset_mode)
+        if preset_command is not None:
+            command, mode = preset_command
+            commands.append(command)
+            values["mode"] = mode
+
+        speed_command = None
+        if percentage is not None:
+            speed_command = self._speed_command(percentage)
+        if speed_command is not None:
+            command, speed = speed_command
+            commands.append(command)
+            values["speed"] = speed
+
+        if len(commands) == 1:
+            command = self._api.set_power(self._device_mac, True)
+        else:
+            command = self._api.send_commands(self._device_mac, commands)
+        await self.coordinator.async_command(command, values)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_power(self._device_mac, False), {"power": False}
         )
-        newData = self.coordinator.data
-        newData["power"] = False
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
@@ -216,37 +191,42 @@ class DuuxFan(CoordinatorEntity, FanEntity):
             await self.async_turn_off()
             return
 
-        speed = percentage_to_ordered_list_item(self._speed_range, percentage)
+        speed = self._speeds.speed(percentage)
         if speed is not None:
-            await self.hass.async_add_executor_job(
-                self._api.set_speed,
-                self._device_mac,
-                speed,
-                self._speed_range[0],
-                self._speed_range[-1],
+            speeds = self._speeds.speeds
+            await self.coordinator.async_command(
+                self._api.set_speed(self._device_mac, speed, speeds[0], speeds[-1]),
+                {"speed": speed},
             )
-            newData = self.coordinator.data
-            newData["speed"] = speed
-            self.coordinator.async_set_updated_data(newData)
+
+    @staticmethod
+    def _preset_mode_value(preset_mode: str | None) -> int | None:
+        """Map a preset mode label to the device's mode value."""
+        return PRESET_MODES.raw(preset_mode)
+
+    def _speed_command(self, percentage: int) -> tuple[str, Any] | None:
+        """Return the command and speed value for a percentage, if any."""
+        speed = self._speeds.speed(percentage)
+        if speed is None:
+            return None
+        speeds = self._speeds.speeds
+        return DuuxAPI.speed_command(speed, speeds[0], speeds[-1]), speed
+
+    def _preset_command(self, preset_mode: str | None) -> tuple[str, Any] | None:
+        """Return the command and mode value for a preset mode, if known."""
+        mode_value = self._preset_mode_value(preset_mode)
+        if mode_value is None:
+            return None
+        return DuuxAPI.mode_command(mode_value), mode_value
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
-        mode_value = None
-
-        if preset_mode == PRESET_MODE_NORMAL:
-            mode_value = 0
-        elif preset_mode == PRESET_MODE_NATURAL:
-            mode_value = 1
-        elif preset_mode == PRESET_MODE_NIGHT:
-            mode_value = 2
+        mode_value = self._preset_mode_value(preset_mode)
 
         if mode_value is not None:
-            await self.hass.async_add_executor_job(
-                self._api.set_mode, self._device_mac, mode_value
+            await self.coordinator.async_command(
+                self._api.set_mode(self._device_mac, mode_value), {"mode": mode_value}
             )
-            newData = self.coordinator.data
-            newData["mode"] = mode_value
-            self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxWhisperFlexTwoFan(DuuxFan):
@@ -269,6 +249,8 @@ class DuuxWhisperFlexTwoFan(DuuxFan):
 class DuuxWhisperFlexElevateFan(DuuxFan):
     """Representation of a DUUX Whisper Flex Elevatefan."""
 
+    _data_keys = frozenset({"power", "speed", "mode", "horosc"})
+
     def __init__(
         self,
         coordinator,
@@ -296,12 +278,10 @@ class DuuxWhisperFlexElevateFan(DuuxFan):
 
     async def async_oscillate(self, oscillating: bool) -> None:
         """Oscillate the fan."""
-        await self.hass.async_add_executor_job(
-            self._api.set_horosc_bool, self._device_mac, 1 if oscillating else 0
+        await self.coordinator.async_command(
+            self._api.set_horosc_bool(self._device_mac, 1 if oscillating else 0),
+            {"horosc": 1 if oscillating else 0},
         )
-        newData = self.coordinator.data
-        newData["horosc"] = 1 if oscillating else 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxWhisperFlexUltimateFan(DuuxFan):
@@ -344,14 +324,19 @@ class DuuxWhisperFlexFan(DuuxFan):
 class DuuxFanAutoDiscovery(DuuxFan):
     """Duux fan autodiscovery — builds speed list and presets from device traits."""
 
+    # Reads device-specific keys discovered at runtime.
+    _data_keys = None
+
     def __init__(self, coordinator, api, device):
         super().__init__(coordinator, api, device)
-        self._speed_presets = (
-            self._discover_speeds()
-        )  # list of {"speed", "label", "command"}
-        self._mode_presets = (
-            self._discover_modes()
-        )  # list of {"name", "value", "label", "command"}
+        # Parsed once per model: speeds as {"speed", "label", "command"} and
+        # modes as {"name", "setting_name", "value", "command"}, read-only.
+        self._speed_presets, self._mode_presets = discover(
+            type(self).__qualname__,
+            device,
+            device.get("sensorType"),
+            lambda: (self._discover_speeds(), self._discover_modes()),
+        )
 
         # Wire up the speed range HA needs for percentage conversion
         numeric = [int(p["speed"]) for p in self._speed_presets if p["speed"].isdigit()]
@@ -361,7 +346,14 @@ class DuuxFanAutoDiscovery(DuuxFan):
         self._attr_speed_count = len(self._speed_range)
 
         # Preset modes come from the Modes trait, not speeds
-        self._attr_preset_modes = [p["name"] for p in self._mode_presets] or None
+        self._modes = LookupTable((p["name"], p["value"]) for p in self._mode_presets)
+        self._mode_by_name = {p["name"]: p for p in reversed(self._mode_presets)}
+        self._speed_commands = {
+            int(p["speed"]): p["command"]
+            for p in reversed(self._speed_presets)
+            if p["speed"].isdigit()
+        }
+        self._attr_preset_modes = list(self._modes.labels) or None
 
     # ── Trait discovery helpers ────────────────────────────────────────────────
 
@@ -493,34 +485,15 @@ class DuuxFanAutoDiscovery(DuuxFan):
 
     # ── HA properties ─────────────────────────────────────────────────────────
 
-    @property
-    def percentage(self) -> int | None:
-        """Return current speed as a percentage."""
-        speed = (self.coordinator.data or {}).get("speed")
-        if speed is None or not self._speed_range:
-            return None
-        try:
-            return ordered_list_item_to_percentage(self._speed_range, int(speed))
-        except (ValueError, KeyError):
-            return None
-
     @property
     def preset_mode(self) -> str | None:
         """Return current preset mode label."""
-        if not self._mode_presets:
-            return None
-        mode = (self.coordinator.data or {}).get("mode")
-        if mode is None:
-            return None
-        for preset in self._mode_presets:
-            if preset["value"] == str(mode):
-                return preset["name"]
-        return None
+        return self._modes.label((self.coordinator.data or {}).get("mode"))
 
     @property
     def preset_modes(self) -> list[str] | None:
         """Return available preset mode labels."""
-        return [p["name"] for p in self._mode_presets] or None
+        return self._attr_preset_modes
 
     # ── HA commands ───────────────────────────────────────────────────────────
 
@@ -529,35 +502,40 @@ class DuuxFanAutoDiscovery(DuuxFan):
         if percentage == 0:
             await self.async_turn_off()
             return
-        if not self._speed_range:
+        if (speed_command := self._speed_command(percentage)) is None:
             return
-        speed = percentage_to_ordered_list_item(self._speed_range, percentage)
-        # Find the matching preset to get the pre-built command
-        preset = next(
-            (p for p in self._speed_presets if int(p["speed"]) == speed), None
+        command, speed = speed_command
+        await self.coordinator.async_command(
+            self._api.send_command(self._device_mac, command, coalesce=True),
+            {"speed": speed},
         )
-        command = preset["command"] if preset else f"tune set speed {speed}"
-        await self.hass.async_add_executor_job(
-            self._api.send_command, self._device_mac, command
-        )
-        newData = self.coordinator.data
-        newData["speed"] = speed
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set preset mode by label."""
-        preset = next((p for p in self._mode_presets if p["name"] == preset_mode), None)
+        preset = self._mode_by_name.get(preset_mode)
         if preset is None:
             _LOGGER.warning(
                 "%s: unknown preset mode '%s'", self._attr_name, preset_mode
             )
             return
-        await self.hass.async_add_executor_job(
-            self._api.send_command, self._device_mac, preset["command"]
+        await self.coordinator.async_command(
+            self._api.send_command(self._device_mac, preset["command"]),
+            {"mode": raw_key(preset["value"])},
         )
-        newData = self.coordinator.data
-        newData["mode"] = preset["value"]
-        self.coordinator.async_set_updated_data(newData)
+
+    def _speed_command(self, percentage: int) -> tuple[str, Any] | None:
+        """Return the discovered command for a percentage's speed."""
+        speed = self._speeds.speed(percentage)
+        if speed is None:
+            return None
+        return self._speed_commands.get(speed, f"tune set speed {speed}"), speed
+
+    def _preset_command(self, preset_mode: str | None) -> tuple[str, Any] | None:
+        """Return the discovered command for a preset mode, if known."""
+        preset = self._mode_by_name.get(preset_mode)
+        if preset is None:
+            return None
+        return preset["command"], raw_key(preset["value"])
 
     @staticmethod
     def _deep_find(obj: Any, key: str) -> Iterator[Any]:
@@ -575,6 +553,8 @@ class DuuxFanAutoDiscovery(DuuxFan):
 class DuuxAirPurifierFan(DuuxFan):
     """Representation of a Duux air purifier fan."""
 
+    _data_keys = frozenset({"power", "speed", "tvoc", "aq", "ion"})
+
     SPEED_RANGE = (1, 4)
 
     def __init__(self, coordinator, api, device):
@@ -635,44 +615,43 @@ class DuuxAirPurifierFan(DuuxFan):
             return
 
         speed = round(percentage_to_ranged_value(self.SPEED_RANGE, percentage))
+        values = {"speed": speed}
+        commands = []
 
         # Ensure power is ON before sending speed command
         if not self.is_on:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, True
-            )
+            commands.append(DuuxAPI.power_command(True))
+            values["power"] = 1
 
-        await self.hass.async_add_executor_job(
-            self._api.set_purifier_speed, self._device_mac, speed
-        )
-
-        newData = self.coordinator.data
-        newData["speed"] = speed
+        commands.append(DuuxAPI.speed_command(speed, 0, 4))
 
         # Constraint: Ionizer must be OFF if speed is at lowest (1)
-        if speed == 1 and newData.get("ion") == 1:
-            await self.hass.async_add_executor_job(
-                self._api.set_ionizer, self._device_mac, False
-            )
-            newData["ion"] = 0
+        if speed == 1 and (self.coordinator.data or {}).get("ion") == 1:
+            commands.append(DuuxAPI.ionizer_command(False))
+            values["ion"] = 0
 
-        self.coordinator.async_set_updated_data(newData)
+        if len(commands) == 1:
+            command = self._api.set_purifier_speed(self._device_mac, speed)
+        else:
+            command = self._api.send_commands(self._device_mac, commands)
+        await self.coordinator.async_command(command, values)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         if preset_mode == "Auto":
-            newData = self.coordinator.data
             # Ensure power is ON before sending mode command
             if not self.is_on:
-                await self.hass.async_add_executor_job(
-                    self._api.set_power, self._device_mac, True
+                await self.coordinator.async_command(
+                    self._api.send_commands(
+                        self._device_mac,
+                        [DuuxAPI.power_command(True), DuuxAPI.speed_command(0, 0, 4)],
+                    ),
+                    {"power": 1, "speed": 0},
+                )
+            else:
+                await self.coordinator.async_command(
+                    self._api.set_purifier_speed(self._device_mac, 0), {"speed": 0}
                 )
-                newData["power"] = 1
-            await self.hass.async_add_executor_job(
-                self._api.set_purifier_speed, self._device_mac, 0
-            )
-            newData["speed"] = 0
-            self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_on(
         self,
@@ -686,18 +665,26 @@ class DuuxAirPurifierFan(DuuxFan):
         elif preset_mode is not None:
             await self.async_set_preset_mode(preset_mode)
         else:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, True
+            await self.coordinator.async_command(
+                self._api.set_power(self._device_mac, True), {"power": 1}
             )
-            newData = self.coordinator.data
-            newData["power"] = 1
-            self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan."""
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_power(self._device_mac, False), {"power": 0}
         )
-        newData = self.coordinator.data
-        newData["power"] = 0
-        self.coordinator.async_set_updated_data(newData)
+
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxAirPurifierFan,
+        DuuxFanAutoDiscovery,
+        DuuxWhisperFlexElevateFan,
+        DuuxWhisperFlexFan,
+        DuuxWhisperFlexTwoFan,
+        DuuxWhisperFlexUltimateFan,
+    )
+}
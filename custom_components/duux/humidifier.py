@@ -11,17 +11,14 @@ from homeassistant.components.humidifier.const import (
     MODE_BOOST,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DOMAIN,
-    DUUX_DTID_HUMIDIFIER,
-    DUUX_STID_BEAM_MINI,
-    DUUX_STID_BORA_2024,
-    DUUX_STID_NEO,
-)
+from .const import DOMAIN
+from .duux_api import DuuxAPI
+from .lookup import LookupTable
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,31 +33,21 @@ async def async_setup_entry(
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
-        device_type_id = device.get("sensorType").get("type")
-        if device_type_id not in DUUX_DTID_HUMIDIFIER:
-            continue
-
-        sensor_type_id = device.get("sensorTypeId")
         device_id = device["deviceId"]
-        coordinator = coordinator = coordinators.get(device_id)
+        coordinator = coordinators.get(device_id)
 
         # Skip devices that have no coordinator (were filtered out in __init__)
         if coordinator is None:
             continue
 
-        # Create the appropriate de/humidifier entity based on sensor_type_id
-        if sensor_type_id == DUUX_STID_BORA_2024:
-            entities.append(DuuxBoraDehumidifier(coordinator, api, device))
-        # Add the Neo to the setup loop
-        elif sensor_type_id == DUUX_STID_NEO:
-            entities.append(DuuxNeoHumidifier(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_BEAM_MINI:
-            entities.append(DuuxBeamMiniDehumidifier(coordinator, api, device))
-        else:
-            _LOGGER.warning(f"Unknown de/humidifier type {sensor_type_id}, skipping.")
+        entities.extend(
+            ENTITY_CLASSES[name](coordinator, api, device)
+            for name in profiles[device_id].get(Platform.HUMIDIFIER, ())
+        )
 
     async_add_entities(entities)
 
@@ -68,9 +55,13 @@ async def async_setup_entry(
 class DuuxBase(CoordinatorEntity, HumidifierEntity):
     """Representation of a Duux de/humidifier device."""
 
+    # fullData keys this entity reads; the coordinator only wakes it when one
+    # of them (or availability) changes.
+    _data_keys: frozenset[str] | None = frozenset({"power", "hum", "sp", "mode"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the de/humidifier device."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._data_keys)
         self._api = api
         self._device = device
         self._device_id = device["id"]
@@ -114,20 +105,14 @@ class DuuxBase(CoordinatorEntity, HumidifierEntity):
         pass
 
     async def async_turn_on(self, **kwargs):
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_power(self._device_mac, True), {"power": 1}
         )
-        newData = self.coordinator.data
-        newData["power"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
-        await self.hass.async_add_executor_job(
-            self._api.set_power, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_power(self._device_mac, False), {"power": 0}
         )
-        newData = self.coordinator.data
-        newData["power"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
     @property
     def is_on(self):
@@ -152,12 +137,10 @@ class DuuxBase(CoordinatorEntity, HumidifierEntity):
 
     async def async_set_humidity(self, humidity: int):
         """Set new target humidity."""
-        await self.hass.async_add_executor_job(
-            self._api.set_humidity, self._device_mac, humidity
+        await self.coordinator.async_command(
+            self._api.set_humidity(self._device_mac, humidity),
+            {"sp": DuuxAPI.humidity_value(humidity)},
         )
-        newData = self.coordinator.data
-        newData["sp"] = humidity
-        self.coordinator.async_set_updated_data(newData)
 
     @property
     def should_poll(self):
@@ -171,11 +154,10 @@ class DuuxBase(CoordinatorEntity, HumidifierEntity):
             self.coordinator.data or {}
         ).get("online", True)
 
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
-        )
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
 
     async def async_update(self):
         """Update the entity."""
@@ -219,6 +201,7 @@ class DuuxBoraDehumidifier(DuuxDehumidifier):
 
     PRESET_AUTO = MODE_AUTO
     PRESET_CONTINUOUS = MODE_BOOST
+    _MODES = LookupTable(((PRESET_AUTO, 0), (PRESET_CONTINUOUS, 1)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the Bora dehumidifier device."""
@@ -231,30 +214,21 @@ class DuuxBoraDehumidifier(DuuxDehumidifier):
     @property
     def available_modes(self):
         """Return available preset modes."""
-        return [self.PRESET_AUTO, self.PRESET_CONTINUOUS]
+        return list(self._MODES.labels)
 
     @property
     def mode(self):
         """Return current preset mode."""
-        mode = (self.coordinator.data or {}).get("mode", self.PRESET_AUTO)
-        mode_map = {
-            0: self.PRESET_AUTO,
-            1: self.PRESET_CONTINUOUS,
-        }
-        return mode_map.get(mode, self.PRESET_AUTO)
+        mode = (self.coordinator.data or {}).get("mode")
+        return self._MODES.label(mode) or self.PRESET_AUTO
 
     async def async_set_mode(self, mode):
         """Set preset mode."""
-        mode_map = {self.PRESET_AUTO: "0", self.PRESET_CONTINUOUS: "1"}
+        mode = self._MODES.raw(mode) or 0
 
-        mode = mode_map.get(mode, "0")
-
-        await self.hass.async_add_executor_job(
-            self._api.set_dry_mode, self._device_mac, mode
+        await self.coordinator.async_command(
+            self._api.set_dry_mode(self._device_mac, str(mode)), {"mode": mode}
         )
-        newData = self.coordinator.data
-        newData["mode"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxBeamMiniDehumidifier(DuuxHumidifier):
@@ -262,6 +236,7 @@ class DuuxBeamMiniDehumidifier(DuuxHumidifier):
 
     PRESET_AUTO = MODE_AUTO
     PRESET_MANUAL = MODE_NORMAL
+    _MODES = LookupTable(((PRESET_AUTO, 0), (PRESET_MANUAL, 1)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the Beam Mini humidifier device."""
@@ -274,37 +249,32 @@ class DuuxBeamMiniDehumidifier(DuuxHumidifier):
     @property
     def available_modes(self):
         """Return available preset modes."""
-        return [self.PRESET_AUTO, self.PRESET_MANUAL]
+        return list(self._MODES.labels)
 
     @property
     def mode(self):
         """Return current preset mode."""
-        mode = self.coordinator.data.get("mode", self.PRESET_AUTO)
-        mode_map = {
-            0: self.PRESET_AUTO,
-            1: self.PRESET_MANUAL,
-        }
-        return mode_map.get(mode, self.PRESET_AUTO)
+        mode = (self.coordinator.data or {}).get("mode")
+        return self._MODES.label(mode) or self.PRESET_AUTO
 
     async def async_set_mode(self, mode):
         """Set preset mode."""
-        mode_map = {self.PRESET_AUTO: "0", self.PRESET_MANUAL: "1"}
+        mode = self._MODES.raw(mode) or 0
 
-        mode = mode_map.get(mode, "0")
-
-        await self.hass.async_add_executor_job(
-            self._api.set_dry_mode, self._device_mac, mode
+        await self.coordinator.async_command(
+            self._api.set_dry_mode(self._device_mac, str(mode)), {"mode": mode}
         )
-        newData = self.coordinator.data
-        newData["mode"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxNeoHumidifier(DuuxDehumidifier):
     """Duux Neo Humidifier."""
 
+    _data_keys = frozenset({"power", "hum", "sp", "mode", "speed"})
+
     PRESET_NORMAL = MODE_NORMAL
     PRESET_AUTO = MODE_AUTO
+    _MODES = LookupTable(((PRESET_NORMAL, 0), (PRESET_AUTO, 1)))
+    _SPRAY_VOLUMES = LookupTable((("Low", 0), ("Mid", 1), ("High", 2)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the Neo humidifier device."""
@@ -339,44 +309,45 @@ class DuuxNeoHumidifier(DuuxDehumidifier):
     @property
     def available_modes(self):
         """Return available preset modes."""
-        return [self.PRESET_NORMAL, self.PRESET_AUTO]
+        return list(self._MODES.labels)
 
     @property
     def mode(self):
         """Return current preset mode."""
-        mode = self.coordinator.data.get("mode")
-
-        # Safely convert to string to handle both int(1) and str("1") from the API
-        if str(mode) == "1":
-            return self.PRESET_AUTO
-        return self.PRESET_NORMAL
+        # The table matches both int(1) and str("1") from the API.
+        mode = (self.coordinator.data or {}).get("mode")
+        return self._MODES.label(mode) or self.PRESET_NORMAL
 
     async def async_set_mode(self, mode):
         """Set preset mode."""
-        # Convert Home Assistant mode back to the API value
-        api_mode = "1" if mode == self.PRESET_AUTO else "0"
-
-        await self.hass.async_add_executor_job(
-            # Use the new API function we just created
-            self._api.set_humidifier_mode,
-            self._device_mac,
-            api_mode,
+        api_mode = self._MODES.raw(mode) or 0
+
+        await self.coordinator.async_command(
+            self._api.set_humidifier_mode(self._device_mac, str(api_mode)),
+            {"mode": api_mode},
         )
-        newData = self.coordinator.data
-        newData["mode"] = api_mode
-        self.coordinator.async_set_updated_data(newData)
 
     @property
     def extra_state_attributes(self):
         """Return device specific state attributes."""
         data = self.coordinator.data
         speed_val = data.get("speed")
-        speed_map = {0: "Low", 1: "Mid", 2: "High"}
 
         attrs = {}
         if speed_val is not None:
-            attrs["spray_volume"] = speed_map.get(
-                int(speed_val), f"Unknown ({speed_val})"
+            attrs["spray_volume"] = (
+                self._SPRAY_VOLUMES.label(speed_val) or f"Unknown ({speed_val})"
             )
 
         return attrs
+
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxBeamMiniDehumidifier,
+        DuuxBoraDehumidifier,
+        DuuxNeoHumidifier,
+    )
+}
@@ -0,0 +1,108 @@
+"""Read-only lookup tables between fullData values and what entities show."""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+from homeassistant.util.percentage import (
+    ordered_list_item_to_percentage,
+    percentage_to_ordered_list_item,
+)
+
+
+def raw_key(value):
+    """Normalise a fullData value so 2, 2.0 and "2" find the same entry.
+
+    The cloud reports most values as ints, but pending command values and
+    discovered traits often carry them as strings.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+
+class LookupTable:
+    """A label <-> raw value mapping, built once and never changed.
+
+    Where labels or raw values repeat, the first pair wins.
+    """
+
+    __slots__ = ("by_label", "by_raw", "labels")
+
+    def __init__(self, pairs):
+        """Build the table from (label, raw value) pairs, in display order."""
+        by_label = {}
+        by_raw = {}
+        for label, raw in pairs:
+            by_label.setdefault(label, raw)
+            by_raw.setdefault(raw_key(raw), label)
+        self.labels = tuple(by_label)
+        self.by_label = MappingProxyType(by_label)
+        self.by_raw = MappingProxyType(by_raw)
+
+    def __bool__(self):
+        return bool(self.labels)
+
+    def label(self, raw):
+        """Return the label for a fullData value, or None if unknown."""
+        if raw is None:
+            return None
+        try:
+            return self.by_raw.get(raw_key(raw))
+        except TypeError:
+            return None
+
+    def raw(self, label):
+        """Return the fullData value for a label, or None if unknown."""
+        return self.by_label.get(label)
+
+
+class SpeedTable:
+    """Percentages for an ordered list of fan speeds, and back."""
+
+    __slots__ = ("speeds", "by_speed", "by_percentage")
+
+    def __init__(self, speeds):
+        """Precompute both directions for the given speeds."""
+        self.speeds = tuple(speeds)
+        self.by_speed = MappingProxyType(
+            {
+                speed: ordered_list_item_to_percentage(self.speeds, speed)
+                for speed in self.speeds
+            }
+        )
+        self.by_percentage = (
+            tuple(
+                percentage_to_ordered_list_item(self.speeds, percentage)
+                for percentage in range(101)
+            )
+            if self.speeds
+            else ()
+        )
+
+    def percentage(self, speed):
+        """Return the percentage for a reported speed, or None if unknown."""
+        if speed is None:
+            return None
+        try:
+            return self.by_speed.get(raw_key(speed))
+        except TypeError:
+            return None
+
+    def speed(self, percentage):
+        """Return the speed closest to a percentage, or None without speeds."""
+        if not self.by_percentage:
+            return None
+        return self.by_percentage[max(0, min(100, int(percentage)))]
+
+
+@lru_cache(maxsize=None)
+def speed_table(speeds):
+    """Return the shared SpeedTable for a tuple of speeds."""
+    return SpeedTable(speeds)
@@ -0,0 +1,89 @@
+"""Push updates for MQTT-connected Duux devices."""
+
+import json
+import logging
+from functools import partial
+from string import Formatter
+
+from homeassistant.core import callback
+
+from .const import CONF_MQTT_TOPIC
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _full_data(payload):
+    """Return the fullData keys in a pushed message, or None if it has none.
+
+    Accepts a device list entry, a bare {"fullData": {...}} envelope or the
+    changed keys on their own.
+    """
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    message = message.get("latestData") or message
+    full_data = message.get("fullData", message)
+    return full_data if isinstance(full_data, dict) else None
+
+
+def topic_is_valid(topic):
+    """Return True if `topic` has exactly one placeholder, "{mac}".
+
+    Without it every device would share one topic and take each other's
+    state.
+    """
+    try:
+        fields = [field for _, field, _, _ in Formatter().parse(topic) if field]
+    except ValueError:
+        return False
+    return fields == ["mac"]
+
+
+async def async_setup_push(hass, entry, account, devices):
+    """Subscribe to pushed state for every device connected over MQTT.
+
+    The topic comes from the entry's options, with "{mac}" standing in for
+    each device's MAC address. Returns the MACs subscribed to.
+    """
+    topic = entry.options.get(CONF_MQTT_TOPIC)
+    if not topic:
+        return set()
+    if not topic_is_valid(topic):
+        _LOGGER.error(
+            "MQTT topic %s must contain {mac} once, polling Duux devices instead",
+            topic,
+        )
+        return set()
+
+    # mqtt is only an after_dependency, so it is imported once it is needed.
+    from homeassistant.components import mqtt
+
+    if not await mqtt.async_wait_for_mqtt_client(hass):
+        _LOGGER.warning("MQTT is not available, polling Duux devices instead")
+        return set()
+
+    @callback
+    def _message_received(device_id, msg):
+        full_data = _full_data(msg.payload)
+        if full_data is None:
+            _LOGGER.debug("Ignoring push for %s: %s", device_id, msg.payload)
+            return
+        account.async_push(device_id, full_data)
+
+    subscribed = set()
+    for device in devices:
+        if device.get("connectionType") != "mqtt":
+            continue
+        device_id = device.get("deviceId")
+        entry.async_on_unload(
+            await mqtt.async_subscribe(
+                hass,
+                topic.format(mac=device_id),
+                partial(_message_received, device_id),
+            )
+        )
+        subscribed.add(device_id)
+    return subscribed
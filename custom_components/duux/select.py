@@ -7,19 +7,17 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from homeassistant.const import (
     EntityCategory,
+    Platform,
     UnitOfTime,
 )
 
 from .const import (
     DOMAIN,
-    DUUX_STID_BORA_2024,
-    DUUX_STID_BEAM_MINI,
-    DUUX_STID_BRIGHT_2,
-    DUUX_STID_EDGEHEATER_V2,
-    DUUX_STID_NEO,
     DUUX_STID_NORTH,
     DUUX_STID_WHISPER_FLEX_ELIVATE,
 )
+from .duux_api import DuuxAPI
+from .lookup import LookupTable
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,36 +53,27 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
         sensor_type_id = device.get("sensorTypeId")
         device_id = device["deviceId"]
-        coordinator = coordinator = coordinators.get(device_id)
+        coordinator = coordinators.get(device_id)
 
         # Skip devices that have no coordinator (were filtered out in __init__)
         if coordinator is None:
             continue
 
-        # Bora has two fan speeds..
-        if sensor_type_id == DUUX_STID_BORA_2024:
-            entities.append(DuuxFanSpeedSelector(coordinator, api, device))
-            entities.append(DuuxTimerSelector(coordinator, api, device))
-        # Route the Neo to its selectors
-        elif sensor_type_id == DUUX_STID_NEO:
-            entities.append(DuuxNeoSpeedSelector(coordinator, api, device))
-            entities.append(DuuxTimerSelector(coordinator, api, device))
-        # Added Duux Bright 2 for timer selector
-        elif sensor_type_id == DUUX_STID_BRIGHT_2:
-            entities.append(DuuxBright2TimerSelector(coordinator, api, device))
-        elif sensor_type_id in [DUUX_STID_BEAM_MINI, DUUX_STID_EDGEHEATER_V2]:
-            entities.append(DuuxTimerSelector(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_NORTH:
-            entities.append(DuuxNorthTimerSelector(coordinator, api, device))
-
-        if coordinator.data.get("horosc") is not None and sensor_type_id not in [
-            DUUX_STID_WHISPER_FLEX_ELIVATE
-        ]:
+        entities.extend(
+            ENTITY_CLASSES[name](coordinator, api, device)
+            for name in profiles[device_id].get(Platform.SELECT, ())
+        )
+
+        if (
+            coordinator.data.get("horosc") is not None
+            and sensor_type_id != DUUX_STID_WHISPER_FLEX_ELIVATE
+        ):
             entities.append(DuuxHorizontalOscillationSelect(coordinator, api, device))
 
         if coordinator.data.get("verosc") is not None:
@@ -93,9 +82,10 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         if coordinator.data.get("swing") is not None:
             entities.append(DuuxHorizontalSwingSelect(coordinator, api, device))
 
-        if coordinator.data.get("tilt") is not None and sensor_type_id not in [
-            DUUX_STID_NORTH
-        ]:
+        if (
+            coordinator.data.get("tilt") is not None
+            and sensor_type_id != DUUX_STID_NORTH
+        ):
             entities.append(DuuxVerticalTiltSelect(coordinator, api, device))
     async_add_entities(entities)
 
@@ -114,21 +104,28 @@ class DuuxSwingSelect(CoordinatorEntity, SelectEntity):
 
     _options_map: dict[str, int] = {}
     _data_key: str = ""
+    # Built from _options_map once per subclass.
+    _options_table = LookupTable(())
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Build the option table for each subclass's _options_map."""
+        super().__init_subclass__(**kwargs)
+        cls._options_table = LookupTable(cls._options_map.items())
 
-    def _set_value(self, device_mac: str, value: int):
+    async def _set_value(self, device_mac: str, value: int):
         """Call the duux_api method for this axis. Override in subclasses."""
         raise NotImplementedError
 
     def __init__(self, coordinator, api, device) -> None:
         """Initialize the select entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({self._data_key}))
         self._api = api
         self._device = device
         self._device_id = device["id"]
         self._device_mac = device["deviceId"]  # MAC address
         self._attr_has_entity_name = True
         self._attr_entity_category = EntityCategory.CONFIG
-        self._attr_options = list(self._options_map.keys())
+        self._attr_options = list(self._options_table.labels)
 
     @property
     def available(self) -> bool:
@@ -137,6 +134,11 @@ class DuuxSwingSelect(CoordinatorEntity, SelectEntity):
                 self.coordinator.data or {}
         ).get("online", True)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
     @property
     def device_info(self):
         """Return device information, linking this select to its fan device."""
@@ -154,9 +156,9 @@ class DuuxSwingSelect(CoordinatorEntity, SelectEntity):
         if raw_value is None:
             return None
 
-        for label, value in self._options_map.items():
-            if value == raw_value:
-                return label
+        label = self._options_table.label(raw_value)
+        if label is not None:
+            return label
 
         _LOGGER.debug(
             "%s: raw value %s for '%s' doesn't match any known option",
@@ -168,7 +170,8 @@ class DuuxSwingSelect(CoordinatorEntity, SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Set the swing level, or turn swing off if 'Off' is selected."""
-        if option not in self._options_map:
+        value = self._options_table.raw(option)
+        if value is None:
             _LOGGER.warning(
                 "%s: unknown swing option '%s'",
                 getattr(self, "_attr_name", None),
@@ -176,12 +179,9 @@ class DuuxSwingSelect(CoordinatorEntity, SelectEntity):
             )
             return
 
-        value = self._options_map[option]
-
-        await self.hass.async_add_executor_job(self._set_value, self._device_mac, value)
-        newData = self.coordinator.data
-        newData[self._data_key] = value
-        self.coordinator.async_set_updated_data(newData)
+        await self.coordinator.async_command(
+            self._set_value(self._device_mac, value), {self._data_key: value}
+        )
 
 
 class DuuxHorizontalOscillationSelect(DuuxSwingSelect):
@@ -190,8 +190,8 @@ class DuuxHorizontalOscillationSelect(DuuxSwingSelect):
     _options_map = HORIZONTAL_SWING_OPTIONS
     _data_key = "horosc"
 
-    def _set_value(self, device_mac: str, value: int):
-        return self._api.set_horosc_angle(device_mac, value)
+    async def _set_value(self, device_mac: str, value: int):
+        return await self._api.set_horosc_angle(device_mac, value)
 
     def __init__(self, coordinator, api, device) -> None:
         """Initialize the horizontal swing select."""
@@ -207,8 +207,8 @@ class DuuxVerticalOscillationSelect(DuuxSwingSelect):
     _options_map = VERTICAL_SWING_OPTIONS
     _data_key = "verosc"
 
-    def _set_value(self, device_mac: str, value: int):
-        return self._api.set_verosc(device_mac, value)
+    async def _set_value(self, device_mac: str, value: int):
+        return await self._api.set_verosc(device_mac, value)
 
     def __init__(self, coordinator, api, device) -> None:
         """Initialize the vertical swing select."""
@@ -224,8 +224,8 @@ class DuuxHorizontalSwingSelect(DuuxSwingSelect):
     _options_map = HORIZONTAL_SWING_OPTIONS
     _data_key = "swing"
 
-    def _set_value(self, device_mac: str, value: int):
-        return self._api.set_swing(device_mac, value)
+    async def _set_value(self, device_mac: str, value: int):
+        return await self._api.set_swing(device_mac, value)
 
     def __init__(self, coordinator, api, device) -> None:
         """Initialize the horizontal swing select."""
@@ -241,8 +241,8 @@ class DuuxVerticalTiltSelect(DuuxSwingSelect):
     _options_map = VERTICAL_SWING_OPTIONS
     _data_key = "tilt"
 
-    def _set_value(self, device_mac: str, value: int):
-        return self._api.set_tilt(device_mac, value)
+    async def _set_value(self, device_mac: str, value: int):
+        return await self._api.set_tilt(device_mac, value)
 
     def __init__(self, coordinator, api, device) -> None:
         """Initialize the vertical tilt select."""
@@ -255,9 +255,13 @@ class DuuxVerticalTiltSelect(DuuxSwingSelect):
 class DuuxSelector(CoordinatorEntity, SelectEntity):
     """Base class for Duux selectors."""
 
+    # fullData keys this entity reads; the coordinator only wakes it when one
+    # of them (or availability) changes.
+    _data_keys: frozenset[str] = frozenset()
+
     def __init__(self, coordinator, api, device):
         """Initialize the selector."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._data_keys)
         self._api = api
         self._device = device
         self._device_id = device["id"]
@@ -273,6 +277,11 @@ class DuuxSelector(CoordinatorEntity, SelectEntity):
             self.coordinator.data or {}
         ).get("online", True)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
     @property
     def device_info(self):
         """Return device information."""
@@ -287,8 +296,11 @@ class DuuxSelector(CoordinatorEntity, SelectEntity):
 class DuuxFanSpeedSelector(DuuxSelector):
     """Representation of a Duux fan speed selector."""
 
+    _data_keys = frozenset({"fan"})
+
     FAN_HIGH = "high"
     FAN_LOW = "low"
+    _MODES = LookupTable(((FAN_LOW, 1), (FAN_HIGH, 0)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the fan speed selector."""
@@ -300,38 +312,30 @@ class DuuxFanSpeedSelector(DuuxSelector):
     @property
     def options(self):
         """Return available fan modes."""
-        return [self.FAN_LOW, self.FAN_HIGH]
+        return list(self._MODES.labels)
 
     @property
     def current_option(self):
         """Return current fan mode."""
         mode = (self.coordinator.data or {}).get("fan")
-        mode_map = {
-            1: self.FAN_LOW,
-            0: self.FAN_HIGH,
-        }
-        return mode_map.get(int(mode) if mode is not None else 1, self.FAN_LOW)
+        return self._MODES.label(mode) or self.FAN_LOW
 
     async def async_select_option(self, option):
         """Set fan speed mode."""
-        mode_map = {
-            self.FAN_HIGH: "0",
-            self.FAN_LOW: "1",
-        }
-
-        mode = mode_map.get(option, "1")
+        mode = self._MODES.raw(option)
+        if mode is None:
+            mode = self._MODES.raw(self.FAN_LOW)
 
-        await self.hass.async_add_executor_job(
-            self._api.set_fan, self._device_mac, mode
+        await self.coordinator.async_command(
+            self._api.set_fan(self._device_mac, str(mode)), {"fan": mode}
         )
-        newData = self.coordinator.data
-        newData["fan"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxTimerSelector(DuuxSelector):
     """Representation of a Duux timer selector."""
 
+    _data_keys = frozenset({"timer"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the timer selector."""
         super().__init__(coordinator, api, device)
@@ -354,12 +358,9 @@ class DuuxTimerSelector(DuuxSelector):
         except (ValueError, TypeError):
             amount = 0
 
-        await self.hass.async_add_executor_job(
-            self._api.set_timer, self._device_mac, str(amount)
+        await self.coordinator.async_command(
+            self._api.set_timer(self._device_mac, str(amount)), {"timer": amount}
         )
-        newData = self.coordinator.data
-        newData["timer"] = amount
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxBright2TimerSelector(DuuxTimerSelector):
@@ -375,9 +376,12 @@ class DuuxBright2TimerSelector(DuuxTimerSelector):
 class DuuxNeoSpeedSelector(DuuxSelector):
     """Representation of a Duux Neo spray speed selector."""
 
+    _data_keys = frozenset({"speed"})
+
     SPEED_LOW = "Low"
     SPEED_MID = "Mid"
     SPEED_HIGH = "High"
+    _SPEEDS = LookupTable(((SPEED_LOW, 0), (SPEED_MID, 1), (SPEED_HIGH, 2)))
 
     def __init__(self, coordinator, api, device):
         """Initialize the speed selector."""
@@ -385,34 +389,23 @@ class DuuxNeoSpeedSelector(DuuxSelector):
         self._attr_unique_id = f"duux_{self._device_id}_speed"
         self._attr_translation_key = "spray_volume"
         self._attr_icon = "mdi:weather-partly-rainy"
-        self._attr_options = [self.SPEED_LOW, self.SPEED_MID, self.SPEED_HIGH]
+        self._attr_options = list(self._SPEEDS.labels)
 
     @property
     def current_option(self):
         """Return current speed."""
-        mode = self.coordinator.data.get("speed", self.SPEED_LOW)
-        mode_map = {
-            0: self.SPEED_LOW,
-            1: self.SPEED_MID,
-            2: self.SPEED_HIGH,
-        }
-        return mode_map.get(mode, self.SPEED_LOW)
+        mode = self.coordinator.data.get("speed")
+        return self._SPEEDS.label(mode) or self.SPEED_LOW
 
     async def async_select_option(self, option):
         """Set spray speed mode."""
-        mode_map = {
-            self.SPEED_LOW: "0",
-            self.SPEED_MID: "1",
-            self.SPEED_HIGH: "2",
-        }
-        mode = mode_map.get(option, "0")
+        mode = self._SPEEDS.raw(option)
+        if mode is None:
+            mode = self._SPEEDS.raw(self.SPEED_LOW)
 
-        await self.hass.async_add_executor_job(
-            self._api.set_speed, self._device_mac, mode, 0, 2
+        await self.coordinator.async_command(
+            self._api.set_speed(self._device_mac, str(mode), 0, 2), {"speed": mode}
         )
-        newData = self.coordinator.data
-        newData["speed"] = int(mode)
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxNorthTimerSelector(DuuxTimerSelector):
@@ -431,15 +424,27 @@ class DuuxNorthTimerSelector(DuuxTimerSelector):
             amount = 0
 
         if amount > 0:
-            await self.hass.async_add_executor_job(
-                self._api.set_power, self._device_mac, True
+            await self.coordinator.async_command(
+                self._api.send_commands(
+                    self._device_mac,
+                    [DuuxAPI.power_command(True), DuuxAPI.timer_command(amount)],
+                ),
+                {"timer": amount, "power": 1},
+            )
+        else:
+            await self.coordinator.async_command(
+                self._api.set_timer(self._device_mac, str(amount)), {"timer": amount}
             )
 
-        await self.hass.async_add_executor_job(
-            self._api.set_timer, self._device_mac, str(amount)
-        )
-        newData = self.coordinator.data
-        newData["timer"] = amount
-        if amount > 0:
-            newData["power"] = 1
-        self.coordinator.async_set_updated_data(newData)
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxBright2TimerSelector,
+        DuuxFanSpeedSelector,
+        DuuxNeoSpeedSelector,
+        DuuxNorthTimerSelector,
+        DuuxTimerSelector,
+    )
+}
@@ -16,6 +16,7 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     EntityCategory,
     PERCENTAGE,
+    Platform,
     UnitOfTemperature,
     UnitOfTime,
 )
@@ -25,15 +26,15 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    DUUX_STID_BORA_2024,
-    DUUX_STID_BRIGHT_2,
     ATTRIBUTION,
-    DUUX_STID_BEAM_MINI,
     DUUX_ERRID,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stands in for a key that is absent, so a key appearing as None still counts.
+_MISSING = object()
+
 
 @dataclass(frozen=True)
 class DuuxSensorEntityDescription(SensorEntityDescription):
@@ -48,29 +49,23 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
-        sensor_type_id = device.get("sensorTypeId")
         device_id = device["deviceId"]
-        coordinator = coordinator = coordinators.get(device_id)
+        coordinator = coordinators.get(device_id)
 
         # Skip devices that have no coordinator (were filtered out in __init__)
         if coordinator is None:
             continue
 
-        if sensor_type_id == DUUX_STID_BORA_2024:
-            entities.append(DuuxHumiditySensor(coordinator, api, device))
-            entities.append(DuuxBora2024TimeRemainingSensor(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_BRIGHT_2:
-            entities.append(DuuxPM25Sensor(coordinator, api, device))
-            entities.append(DuuxTVOCSensor(coordinator, api, device))
-            entities.append(DuuxFilterLifeSensor(coordinator, api, device))
-            entities.append(DuuxAirQualitySensor(coordinator, api, device))
-            entities.append(DuuxBright2TimeRemainingSensor(coordinator, api, device))
-        elif sensor_type_id == DUUX_STID_BEAM_MINI:
-            entities.append(DuuxHumiditySensor(coordinator, api, device))
-            entities.append(DuuxTempSensor(coordinator, api, device))
+        # Models without their own sensors get a temperature sensor if they
+        # report one.
+        if names := profiles[device_id].get(Platform.SENSOR):
+            entities.extend(
+                ENTITY_CLASSES[name](coordinator, api, device) for name in names
+            )
         elif coordinator.data.get("temp") is not None:
             entities.append(DuuxTempSensor(coordinator, api, device))
 
@@ -88,7 +83,8 @@ class DuuxSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(self, coordinator, api, device, description):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only woken when its own key (or availability) changes.
+        super().__init__(coordinator, context=frozenset({description.key}))
         self._api = api
         self._coordinator = coordinator
         self._device = device
@@ -107,6 +103,10 @@ class DuuxSensor(CoordinatorEntity, SensorEntity):
         self._attr_native_value = _init_data.get(description.key)
         self._attr_extra_state_attributes = description.attrs(_init_data)
         self.entity_description = description
+        # What the state was last built from and written as, see _source()
+        # and _rendered().
+        self._last_source = None
+        self._last_written = None
 
     @property
     def available(self) -> bool:
@@ -115,12 +115,58 @@ class DuuxSensor(CoordinatorEntity, SensorEntity):
             self.coordinator.data or {}
         ).get("online", True)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
+    def _source(self):
+        """Return the raw values everything this entity shows is built from.
+
+        The attributes see the whole status, but like the entity itself are
+        only refreshed when its own key (or availability) changes.
+        """
+        data = self.coordinator.data or {}
+        return (
+            self.coordinator.last_update_success,
+            self.coordinator.stale,
+            data.get("online", True),
+            data.get(self.entity_description.key, _MISSING),
+        )
+
+    def _rendered(self):
+        """Return everything this entity writes to its state."""
+        return (
+            self.available,
+            self.assumed_state,
+            self.native_value,
+            self._attr_extra_state_attributes,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state Home Assistant writes when adding the entity."""
+        await super().async_added_to_hass()
+        self._last_source = self._source()
+        self._last_written = self._rendered()
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+        """Handle updated data from the coordinator.
+
+        Skips rebuilding the state if nothing it is built from has changed,
+        and the state write if nothing the entity shows has.
+        """
+        source = self._source()
+        if source == self._last_source:
+            return
+        self._last_source = source
         data = self.coordinator.data or {}
         self._attr_native_value = data.get(self.entity_description.key)
         self._attr_extra_state_attributes = self.entity_description.attrs(data)
+        rendered = self._rendered()
+        if rendered == self._last_written:
+            return
+        self._last_written = rendered
         self.async_write_ha_state()
 
 
@@ -176,16 +222,11 @@ class DuuxTVOCSensor(DuuxSensor):
         3: "harmful",
     }
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        data = self.coordinator.data or {}
-        raw = data.get("tvoc")
-        self._attr_native_value = (
-            self._TVOC_MAP.get(raw, raw) if raw is not None else None
-        )
-        self._attr_extra_state_attributes = self.entity_description.attrs(data)
-        self.async_write_ha_state()
+    @property
+    def native_value(self):
+        """Return the TVOC level's translation key."""
+        raw = (self.coordinator.data or {}).get("tvoc")
+        return self._TVOC_MAP.get(raw, raw) if raw is not None else None
 
 
 class DuuxFilterLifeSensor(DuuxSensor):
@@ -225,17 +266,12 @@ class DuuxAirQualitySensor(DuuxSensor):
         5: "harmful",
     }
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        data = self.coordinator.data or {}
-        raw = data.get("aq")
+    @property
+    def native_value(self):
+        """Return the air quality index's translation key."""
+        raw = (self.coordinator.data or {}).get("aq")
         # Map integer API value to translation key; fall back to raw value if unknown
-        self._attr_native_value = (
-            self._AQ_MAP.get(raw, raw) if raw is not None else None
-        )
-        self._attr_extra_state_attributes = self.entity_description.attrs(data)
-        self.async_write_ha_state()
+        return self._AQ_MAP.get(raw, raw) if raw is not None else None
 
 
 class DuuxHumiditySensor(DuuxSensor):
@@ -338,3 +374,19 @@ class DuuxBright2TimeRemainingSensor(DuuxTimeRemainingSensor):
 
     def __init__(self, coordinator, api, device):
         super().__init__(coordinator, api, device, key="timerr")
+
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxAirQualitySensor,
+        DuuxBora2024TimeRemainingSensor,
+        DuuxBright2TimeRemainingSensor,
+        DuuxFilterLifeSensor,
+        DuuxHumiditySensor,
+        DuuxPM25Sensor,
+        DuuxTVOCSensor,
+        DuuxTempSensor,
+    )
+}
@@ -3,20 +3,10 @@
 import logging
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from custom_components.duux.const import (
-    DOMAIN,
-    DUUX_STID_BORA_2024,
-    DUUX_STID_BRIGHT_2,
-    DUUX_STID_EDGEHEATER_2000,
-    DUUX_STID_EDGEHEATER_2023_V1,
-    DUUX_STID_EDGEHEATER_V2,
-    DUUX_STID_WHISPER_FLEX_2,
-    DUUX_STID_WHISPER_FLEX_ELIVATE,
-    DUUX_STID_NEO,
-    DUUX_STID_NORTH,
-)
+from custom_components.duux.const import DOMAIN, DUUX_STID_BRIGHT_2
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,48 +17,21 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     api = data["api"]
     coordinators = data["coordinators"]
     devices = data["devices"]
+    profiles = data["profiles"]
 
     entities = []
     for device in devices:
-        sensor_type_id = device.get("sensorTypeId")
         device_id = device["deviceId"]
-        coordinator = coordinator = coordinators.get(device_id)
+        coordinator = coordinators.get(device_id)
 
         # Skip devices that have no coordinator (were filtered out in __init__)
         if coordinator is None:
             continue
 
-        # Only Edge heaters have night mode
-        if sensor_type_id in [
-            DUUX_STID_EDGEHEATER_2023_V1,
-            DUUX_STID_EDGEHEATER_V2,
-            DUUX_STID_EDGEHEATER_2000,
-            DUUX_STID_WHISPER_FLEX_2,
-        ]:
-            entities.append(DuuxChildLockSwitch(coordinator, api, device))
-            entities.append(DuuxNightModeSwitch(coordinator, api, device))
-        if sensor_type_id in [
-            DUUX_STID_WHISPER_FLEX_ELIVATE,
-        ]:
-            entities.append(DuuxNightModeSwitch(coordinator, api, device))
-            entities.append(DuuxIonizerSwitch(coordinator, api, device))
-
-        # Bora has sleep (similar to night), cleaning, laundry & child lock..
-        elif sensor_type_id == DUUX_STID_BORA_2024:
-            entities.append(DuuxChildLockSwitch(coordinator, api, device))
-            entities.append(DuuxSleepModeSwitch(coordinator, api, device))
-            entities.append(DuuxCleaningModeSwitch(coordinator, api, device))
-            entities.append(DuuxLaundryModeSwitch(coordinator, api, device))
-        # Neo humidifier
-        elif sensor_type_id == DUUX_STID_NEO:
-            entities.append(DuuxNightModeSwitch(coordinator, api, device))
-
-        elif sensor_type_id == DUUX_STID_BRIGHT_2:
-            entities.append(DuuxNightModeSwitch(coordinator, api, device))
-            entities.append(DuuxIonizerSwitch(coordinator, api, device))
-
-        elif sensor_type_id == DUUX_STID_NORTH:
-            entities.append(DuuxNightModeSwitch(coordinator, api, device))
+        entities.extend(
+            ENTITY_CLASSES[name](coordinator, api, device)
+            for name in profiles[device_id].get(Platform.SWITCH, ())
+        )
 
     async_add_entities(entities)
 
@@ -76,9 +39,13 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class DuuxSwitch(CoordinatorEntity, SwitchEntity):
     """Base class for Duux switches."""
 
+    # fullData keys this entity reads; the coordinator only wakes it when one
+    # of them (or availability) changes.
+    _data_keys: frozenset[str] = frozenset()
+
     def __init__(self, coordinator, api, device):
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._data_keys)
         self._api = api
         self._device = device
         self._device_id = device["id"]
@@ -94,6 +61,11 @@ class DuuxSwitch(CoordinatorEntity, SwitchEntity):
                 self.coordinator.data or {}
         ).get("online", True)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing the state cached before a restart."""
+        return self.coordinator.stale
+
     @property
     def device_info(self):
         """Return device information."""
@@ -108,6 +80,8 @@ class DuuxSwitch(CoordinatorEntity, SwitchEntity):
 class DuuxChildLockSwitch(DuuxSwitch):
     """Representation of a Duux child lock switch."""
 
+    _data_keys = frozenset({"lock"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the child lock switch."""
         super().__init__(coordinator, api, device)
@@ -122,26 +96,22 @@ class DuuxChildLockSwitch(DuuxSwitch):
 
     async def async_turn_on(self, **kwargs):
         """Turn on child lock."""
-        await self.hass.async_add_executor_job(
-            self._api.set_lock, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_lock(self._device_mac, True), {"lock": 1}
         )
-        newData = self.coordinator.data
-        newData["lock"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off child lock."""
-        await self.hass.async_add_executor_job(
-            self._api.set_lock, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_lock(self._device_mac, False), {"lock": 0}
         )
-        newData = self.coordinator.data
-        newData["lock"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxNightModeSwitch(DuuxSwitch):
     """Representation of a Duux night mode switch."""
 
+    _data_keys = frozenset({"night"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the night mode switch."""
         super().__init__(coordinator, api, device)
@@ -156,26 +126,22 @@ class DuuxNightModeSwitch(DuuxSwitch):
 
     async def async_turn_on(self, **kwargs):
         """Turn on night mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_night_mode, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_night_mode(self._device_mac, True), {"night": 1}
         )
-        newData = self.coordinator.data
-        newData["night"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off night mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_night_mode, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_night_mode(self._device_mac, False), {"night": 0}
         )
-        newData = self.coordinator.data
-        newData["night"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxSleepModeSwitch(DuuxSwitch):
     """Representation of a Duux sleep mode switch."""
 
+    _data_keys = frozenset({"sleep"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the sleep mode switch."""
         super().__init__(coordinator, api, device)
@@ -190,26 +156,22 @@ class DuuxSleepModeSwitch(DuuxSwitch):
 
     async def async_turn_on(self, **kwargs):
         """Turn on sleep mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_sleep_mode, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_sleep_mode(self._device_mac, True), {"sleep": 1}
         )
-        newData = self.coordinator.data
-        newData["sleep"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off sleep mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_sleep_mode, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_sleep_mode(self._device_mac, False), {"sleep": 0}
         )
-        newData = self.coordinator.data
-        newData["sleep"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxCleaningModeSwitch(DuuxSwitch):
     """Representation of a Duux self-cleaning mode switch."""
 
+    _data_keys = frozenset({"dry"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the self-cleaning mode switch."""
         super().__init__(coordinator, api, device)
@@ -224,26 +186,22 @@ class DuuxCleaningModeSwitch(DuuxSwitch):
 
     async def async_turn_on(self, **kwargs):
         """Turn on cleaning mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_cleaning_mode, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_cleaning_mode(self._device_mac, True), {"dry": 1}
         )
-        newData = self.coordinator.data
-        newData["dry"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off cleaning mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_cleaning_mode, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_cleaning_mode(self._device_mac, False), {"dry": 0}
         )
-        newData = self.coordinator.data
-        newData["dry"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxLaundryModeSwitch(DuuxSwitch):
     """Representation of a Duux laundry mode switch."""
 
+    _data_keys = frozenset({"laundr"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the laundry mode switch."""
         super().__init__(coordinator, api, device)
@@ -258,26 +216,22 @@ class DuuxLaundryModeSwitch(DuuxSwitch):
 
     async def async_turn_on(self, **kwargs):
         """Turn on laundry mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_laundry_mode, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_laundry_mode(self._device_mac, True), {"laundr": 1}
         )
-        newData = self.coordinator.data
-        newData["laundr"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off Laundry mode."""
-        await self.hass.async_add_executor_job(
-            self._api.set_laundry_mode, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_laundry_mode(self._device_mac, False), {"laundr": 0}
         )
-        newData = self.coordinator.data
-        newData["laundr"] = 0
-        self.coordinator.async_set_updated_data(newData)
 
 
 class DuuxIonizerSwitch(DuuxSwitch):
     """Representation of a Duux ionizer switch."""
 
+    _data_keys = frozenset({"ion", "speed"})
+
     def __init__(self, coordinator, api, device):
         """Initialize the ionizer switch."""
         super().__init__(coordinator, api, device)
@@ -316,18 +270,26 @@ class DuuxIonizerSwitch(DuuxSwitch):
             )
             return
 
-        await self.hass.async_add_executor_job(
-            self._api.set_ionizer, self._device_mac, True
+        await self.coordinator.async_command(
+            self._api.set_ionizer(self._device_mac, True), {"ion": 1}
         )
-        newData = self.coordinator.data
-        newData["ion"] = 1
-        self.coordinator.async_set_updated_data(newData)
 
     async def async_turn_off(self, **kwargs):
         """Turn off ionizer."""
-        await self.hass.async_add_executor_job(
-            self._api.set_ionizer, self._device_mac, False
+        await self.coordinator.async_command(
+            self._api.set_ionizer(self._device_mac, False), {"ion": 0}
         )
-        newData = self.coordinator.data
-        newData["ion"] = 0
-        self.coordinator.async_set_updated_data(newData)
+
+
+# The classes DEVICE_PROFILES can name for this platform, by name.
+ENTITY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        DuuxChildLockSwitch,
+        DuuxCleaningModeSwitch,
+        DuuxIonizerSwitch,
+        DuuxLaundryModeSwitch,
+        DuuxNightModeSwitch,
+        DuuxSleepModeSwitch,
+    )
+}
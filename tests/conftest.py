@@ -2,14 +2,15 @@
 
 These tests intentionally avoid the heavyweight ``pytest-homeassistant-custom-component``
 test harness. The integration's entities only ever touch a handful of attributes on
-``hass``/``coordinator`` (``.data``, ``.async_add_executor_job``,
-``.async_request_refresh`` / ``.async_set_updated_data``, ``.async_add_listener``), so
+``hass``/``coordinator`` (``.data``, ``.async_request_refresh`` /
+``.async_command``, ``.async_add_listener``), so
 small explicit fakes exercise the real code paths just as well while staying fast,
 dependency-light, and easy to reason about. The only real Home Assistant dependency
 is the ``homeassistant`` core package itself (for the actual entity base classes
 under test), which is declared in tests/requirements.txt.
 """
 
+import asyncio
 import json
 import os
 import sys
@@ -71,14 +72,17 @@ class FakeCoordinator:
     """Minimal stand-in for DataUpdateCoordinator.
 
     Implements just enough of the real interface (``.data``,
-    ``.last_update_success``, ``.async_add_listener()``,
-    ``.async_request_refresh()``, ``.async_set_updated_data()``) for entities
-    to be exercised without booting a real Home Assistant core instance.
+    ``.last_update_success``, ``.stale``, ``.async_add_listener()``,
+    ``.async_request_refresh()``, ``.async_command()``) for entities to be
+    exercised without booting a real Home Assistant core instance.
+    ``async_command`` applies the values as soon as the command succeeds,
+    without the confirmation refreshes.
     """
 
     def __init__(self, data=None):
         self.data = dict(data) if data else {}
         self.last_update_success = True
+        self.stale = False
         self.async_request_refresh = AsyncMock()
         self._listeners = []
 
@@ -91,6 +95,12 @@ class FakeCoordinator:
         for listener in list(self._listeners):
             listener()
 
+    async def async_command(self, command, values):
+        result = await command
+        if result:
+            self.async_set_updated_data({**self.data, **values})
+        return result
+
 
 @pytest.fixture
 def make_coordinator():
@@ -101,9 +111,9 @@ def make_coordinator():
 class FakeHass:
     """Minimal stand-in for homeassistant.core.HomeAssistant.
 
-    ``async_add_executor_job`` runs the callable inline (no real thread
-    executor), so assertions against mocked ``api`` methods work
-    synchronously within tests.
+    DuuxAPI is awaited directly on the event loop, so entities only need
+    ``hass.data`` and ``hass.config_entries`` from it; coordinators also
+    start background tasks.
     """
 
     def __init__(self):
@@ -111,10 +121,11 @@ class FakeHass:
         self.config_entries = SimpleNamespace(
             async_forward_entry_setups=AsyncMock(return_value=None),
             async_unload_platforms=AsyncMock(return_value=True),
+            async_schedule_reload=MagicMock(),
         )
 
-    async def async_add_executor_job(self, func, *args):
-        return func(*args)
+    def async_create_background_task(self, target, name, eager_start=True):
+        return asyncio.ensure_future(target)
 
 
 @pytest.fixture
@@ -135,7 +146,8 @@ def mock_api():
 
     Uses spec=DuuxAPI to ensure only real API methods can be mocked. This
     catches bugs where code calls non-existent methods at test time rather
-    than at runtime.
+    than at runtime. The spec also turns every coroutine method into an
+    AsyncMock, so entities can ``await`` them as they do against the real API.
     """
     from custom_components.duux.duux_api import DuuxAPI
 
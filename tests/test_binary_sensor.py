@@ -47,6 +47,26 @@ def test_error_binary_sensor_off_when_err_is_null(make_coordinator, mock_api):
     assert entity.is_on is False
 
 
+def test_error_binary_sensor_skips_state_write_when_unchanged(
+    make_coordinator, mock_api
+):
+    device = {"id": 1, "deviceId": "AA:BB", "displayName": "Heater"}
+    coordinator = make_coordinator({"err": 0})
+    entity = DuuxErrorSensor(coordinator, mock_api, device)
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.is_on)
+
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({"err": 4})
+    entity._handle_coordinator_update()
+    # Becoming unavailable is a change too.
+    coordinator.last_update_success = False
+    entity._handle_coordinator_update()
+
+    assert writes == [False, True, True]
+
+
 # ---------------------------------------------------------------------------
 # DuuxConnectivitySensor -- reads from the device envelope, not coordinator.data
 # ---------------------------------------------------------------------------
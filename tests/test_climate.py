@@ -1,6 +1,8 @@
 """Unit tests for custom_components.duux.climate."""
 
-from custom_components.duux import const
+from unittest.mock import MagicMock
+
+from custom_components.duux import DuuxDataUpdateCoordinator, const, device_profile
 from custom_components.duux.climate import (
     DuuxClimateAutoDiscovery,
     DuuxEdgeClimate,
@@ -58,6 +60,18 @@ async def test_edge_two_climate_set_temperature(
     assert entity.target_temperature == 25
 
 
+async def test_set_temperature_shows_the_clamped_set_point_sent(
+    device_by_stid, make_coordinator, mock_api, make_hass
+):
+    device = device_by_stid(50)
+    coordinator = make_coordinator(device["latestData"]["fullData"])
+    entity = attach_hass(DuuxEdgeTwoClimate(coordinator, mock_api, device), make_hass())
+
+    await entity.async_set_temperature(temperature=40.5)
+
+    assert coordinator.data["sp"] == 36
+
+
 async def test_edge_two_climate_set_hvac_mode_off_calls_set_power_false(
     device_by_stid, make_coordinator, mock_api, make_hass
 ):
@@ -116,6 +130,16 @@ def test_threesixty_climate_discovers_presets_from_fixture(
     assert entity.preset_mode == "eco"  # mode == "2" in fixture
 
 
+def test_threesixty_climate_preset_mode_matches_int_mode(
+    device_by_stid, make_coordinator, mock_api
+):
+    device = device_by_stid(49)
+    coordinator = make_coordinator({**device["latestData"]["fullData"], "mode": 1})
+    entity = DuuxThreesixtyClimate(coordinator, mock_api, device)
+
+    assert entity.preset_mode == "comfort"
+
+
 async def test_threesixty_climate_set_preset_mode_sends_discovered_command(
     device_by_stid, make_coordinator, mock_api, make_hass
 ):
@@ -185,6 +209,32 @@ def test_available_false_when_device_reports_offline(
     assert entity.available is False
 
 
+async def test_climate_ignores_updates_to_keys_it_does_not_read(
+    device_by_stid, fake_hass, mock_api
+):
+    device = device_by_stid(50)
+    status = {"online": True, "power": 1, "temp": 19, "sp": 21, "heatin": 1}
+    statuses = {device["deviceId"]: {**status, "err": 0}}
+    account = MagicMock(data=statuses, last_update_success=True, stale=False)
+    account.device_status.side_effect = lambda device_id: statuses[device_id]
+    coordinator = DuuxDataUpdateCoordinator(
+        fake_hass, api=mock_api, device_id=device["deviceId"], device_name="Edge",
+        account=account, config_entry=MagicMock(),
+    )
+    coordinator._handle_account_update()
+    entity = attach_hass(DuuxEdgeTwoClimate(coordinator, mock_api, device), fake_hass)
+    entity.async_write_ha_state = MagicMock()
+    await entity.async_added_to_hass()
+
+    statuses[device["deviceId"]] = {**status, "err": 4}
+    coordinator._handle_account_update()
+    entity.async_write_ha_state.assert_not_called()
+
+    statuses[device["deviceId"]] = {**status, "sp": 22, "err": 4}
+    coordinator._handle_account_update()
+    entity.async_write_ha_state.assert_called_once_with()
+
+
 # ---------------------------------------------------------------------------
 # Platform dispatch (async_setup_entry)
 # ---------------------------------------------------------------------------
@@ -203,6 +253,9 @@ async def test_async_setup_entry_dispatches_correct_entity_classes(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 
@@ -251,6 +304,9 @@ async def test_async_setup_entry_falls_back_to_autodiscovery_for_unknown_stid(
             "api": object(),
             "coordinators": coordinators,
             "devices": [device],
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in [device]
+            },
         }
     }
 
@@ -333,8 +389,9 @@ async def test_north_climate_set_hvac_mode_turns_on_and_sets_mode(
 
     await entity.async_set_hvac_mode(HVACMode.DRY)
 
-    mock_api.set_power.assert_called_once_with(device["deviceId"], True)
-    mock_api.set_north_mode.assert_called_once_with(device["deviceId"], 3)
+    mock_api.send_commands.assert_called_once_with(
+        device["deviceId"], ["tune set power 01", "tune set mode 3"]
+    )
     assert entity.hvac_mode == HVACMode.DRY
 
 
@@ -1,11 +1,20 @@
 """Unit tests for custom_components.duux.config_flow.DuuxConfigFlow."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.duux.config_flow import DuuxConfigFlow
+from custom_components.duux.config_flow import DuuxConfigFlow, DuuxOptionsFlow
+from custom_components.duux.const import (
+    CONF_FAST_POLL_DEVICES,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MQTT_TOPIC,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+)
 
 
 async def test_async_step_user_no_input_shows_form(fake_hass):
@@ -23,8 +32,9 @@ async def test_async_step_user_valid_credentials_creates_entry(fake_hass):
     flow = DuuxConfigFlow()
     flow.hass = fake_hass
 
-    with patch(
-        "custom_components.duux.config_flow.DuuxAPI.login", return_value=True
+    with (
+        patch("custom_components.duux.config_flow.async_get_clientsession"),
+        patch("custom_components.duux.config_flow.DuuxAPI.login", return_value=True),
     ):
         result = await flow.async_step_user(
             user_input={CONF_EMAIL: "user@example.com", CONF_PASSWORD: "hunter2"}
@@ -42,8 +52,9 @@ async def test_async_step_user_invalid_credentials_shows_error(fake_hass):
     flow = DuuxConfigFlow()
     flow.hass = fake_hass
 
-    with patch(
-        "custom_components.duux.config_flow.DuuxAPI.login", return_value=False
+    with (
+        patch("custom_components.duux.config_flow.async_get_clientsession"),
+        patch("custom_components.duux.config_flow.DuuxAPI.login", return_value=False),
     ):
         result = await flow.async_step_user(
             user_input={CONF_EMAIL: "user@example.com", CONF_PASSWORD: "wrong"}
@@ -51,3 +62,70 @@ async def test_async_step_user_invalid_credentials_shows_error(fake_hass):
 
     assert result["type"] is FlowResultType.FORM
     assert result["errors"] == {"base": "invalid_auth"}
+
+
+def _make_options_flow(fake_hass, options=None):
+    flow = DuuxOptionsFlow()
+    flow.hass = fake_hass
+    flow.handler = "entry_1"
+    entry = MagicMock(options=options or {}, entry_id="entry_1")
+    fake_hass.config_entries.async_get_known_entry = lambda entry_id: entry
+    return flow
+
+
+async def test_options_flow_shows_form_then_saves_options(fake_hass):
+    flow = _make_options_flow(fake_hass)
+    fake_hass.data[DOMAIN] = {
+        "entry_1": {"devices": [{"deviceId": "AA:BB", "displayName": "Laundry"}]}
+    }
+
+    result = await flow.async_step_init(user_input=None)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+    defaults = result["data_schema"]({CONF_FAST_POLL_DEVICES: ["AA:BB"]})
+    assert defaults[CONF_POLL_INTERVAL] == DEFAULT_POLL_INTERVAL
+
+    options = {
+        CONF_MQTT_TOPIC: "duux/{mac}/state",
+        CONF_POLL_INTERVAL: 60,
+        CONF_FAST_POLL_DEVICES: ["AA:BB"],
+        CONF_FAST_POLL_INTERVAL: 15,
+        CONF_MIN_POLL_INTERVAL: 10,
+    }
+    result = await flow.async_step_init(user_input=options)
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == options
+
+
+async def test_options_flow_rejects_intervals_below_the_floor(fake_hass):
+    flow = _make_options_flow(fake_hass)
+
+    result = await flow.async_step_init(
+        user_input={
+            CONF_POLL_INTERVAL: 30,
+            CONF_FAST_POLL_DEVICES: [],
+            CONF_FAST_POLL_INTERVAL: 5,
+            CONF_MIN_POLL_INTERVAL: 10,
+        }
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "below_min_poll_interval"}
+
+
+async def test_options_flow_rejects_a_topic_without_one_mac_placeholder(fake_hass):
+    flow = _make_options_flow(fake_hass)
+
+    for topic in ("duux/state", "duux/{mac}/{mac}", "duux/{mac}/{kind}", "duux/{"):
+        result = await flow.async_step_init(
+            user_input={
+                CONF_MQTT_TOPIC: topic,
+                CONF_POLL_INTERVAL: 30,
+                CONF_FAST_POLL_DEVICES: [],
+                CONF_FAST_POLL_INTERVAL: 10,
+                CONF_MIN_POLL_INTERVAL: 10,
+            }
+        )
+
+        assert result["type"] is FlowResultType.FORM
+        assert result["errors"] == {CONF_MQTT_TOPIC: "invalid_mqtt_topic"}
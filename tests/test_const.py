@@ -1,6 +1,12 @@
 """Unit tests for custom_components.duux.const."""
 
-from custom_components.duux.const import DUUX_ERRID
+import importlib
+
+from custom_components.duux.const import (
+    DEFAULT_DEVICE_PROFILE,
+    DEVICE_PROFILES,
+    DUUX_ERRID,
+)
 
 
 def test_known_error_codes_resolve_by_value():
@@ -20,3 +26,12 @@ def test_unknown_error_name_is_human_readable():
     # binary_sensor.py / sensor.py rely on `.name.replace("_", " ")`
     assert DUUX_ERRID.Unknown_Error.name.replace("_", " ") == "Unknown Error"
     assert DUUX_ERRID.Ice_Detected.name.replace("_", " ") == "Ice Detected"
+
+
+def test_device_profiles_name_classes_their_platforms_register():
+    profiles = [DEFAULT_DEVICE_PROFILE, *DEVICE_PROFILES.values()]
+    for profile in profiles:
+        for platform, class_names in profile.items():
+            module = importlib.import_module(f"custom_components.duux.{platform}")
+            for name in class_names:
+                assert module.ENTITY_CLASSES.get(name) is getattr(module, name), name
@@ -1,6 +1,6 @@
 """Unit tests for custom_components.duux.diagnostics."""
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -12,7 +12,7 @@ async def test_diagnostics_redacts_sensitive_fields(fake_hass, devices_fixture):
     entry = MagicMock()
     entry.entry_id = "entry_1"
     api = MagicMock()
-    api.get_devices.return_value = devices_fixture
+    api.get_devices = AsyncMock(return_value=devices_fixture)
     fake_hass.data[const.DOMAIN] = {"entry_1": {"api": api}}
 
     result = await diagnostics.async_get_config_entry_diagnostics(fake_hass, entry)
@@ -26,7 +26,7 @@ async def test_diagnostics_wraps_api_errors(fake_hass):
     entry = MagicMock()
     entry.entry_id = "entry_1"
     api = MagicMock()
-    api.get_devices.side_effect = RuntimeError("boom")
+    api.get_devices = AsyncMock(side_effect=RuntimeError("boom"))
     fake_hass.data[const.DOMAIN] = {"entry_1": {"api": api}}
 
     with pytest.raises(UpdateFailed):
@@ -0,0 +1,88 @@
+"""Unit tests for custom_components.duux.discovery."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.duux import discovery
+from custom_components.duux.discovery import discover, freeze
+from custom_components.duux.fan import DuuxFanAutoDiscovery
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(discovery, "_DISCOVERED", {})
+
+
+def fan_device(device_id, speeds=("1", "2", "3")):
+    return {
+        "id": device_id,
+        "deviceId": f"AA:{device_id}",
+        "sensorTypeId": 9001,
+        "sensorType": {
+            "name": "Discovered Fan",
+            "Traits": [
+                {
+                    "name": "FanSpeed",
+                    "commands": ["tune set speed {fanSpeed}"],
+                    "settings": {
+                        "availableFanSpeeds": {
+                            "speeds": [{"speed_name": speed} for speed in speeds]
+                        }
+                    },
+                }
+            ],
+        },
+    }
+
+
+def test_freeze_returns_read_only_copies():
+    frozen = freeze({"modes": [{"name": "Night"}]})
+
+    assert frozen["modes"][0]["name"] == "Night"
+    with pytest.raises(TypeError):
+        frozen["modes"][0]["name"] = "Day"
+
+
+def test_discover_parses_each_model_once():
+    parse = MagicMock(return_value=[{"name": "Night"}])
+    blob = {"Traits": [{"name": "Modes"}]}
+
+    first = discover("Fan", {"sensorTypeId": 1}, blob, parse)
+    second = discover("Fan", {"sensorTypeId": 1}, dict(blob), parse)
+
+    assert first is second
+    parse.assert_called_once()
+
+
+def test_discover_parses_again_for_another_model_kind_or_blob():
+    parse = MagicMock(return_value=[])
+
+    discover("Fan", {"sensorTypeId": 1}, {"a": 1}, parse)
+    discover("Fan", {"sensorTypeId": 2}, {"a": 1}, parse)
+    discover("Fan", {"sensorTypeId": 1}, {"a": 2}, parse)
+    discover("Climate", {"sensorTypeId": 1}, {"a": 1}, parse)
+
+    assert parse.call_count == 4
+
+
+def test_discover_without_sensor_type_id_is_not_cached():
+    parse = MagicMock(return_value=[])
+
+    discover("Fan", {}, None, parse)
+    discover("Fan", {}, None, parse)
+
+    assert parse.call_count == 2
+
+
+def test_identical_fans_share_discovered_traits(make_coordinator, mock_api):
+    first = DuuxFanAutoDiscovery(make_coordinator({}), mock_api, fan_device(1))
+    second = DuuxFanAutoDiscovery(make_coordinator({}), mock_api, fan_device(2))
+    other = DuuxFanAutoDiscovery(
+        make_coordinator({}), mock_api, fan_device(3, speeds=("1", "2"))
+    )
+
+    assert second._speed_presets is first._speed_presets
+    assert other._speed_presets is not first._speed_presets
+    assert first._speed_range == [1, 2, 3]
+    assert other._speed_range == [1, 2]
@@ -1,35 +1,80 @@
 """Unit tests for custom_components.duux.duux_api.DuuxAPI.
 
-These tests never touch the network: DuuxAPI.session is replaced with a
-MagicMock, so every test asserts on the *shape* of the HTTP call (URL,
-method, JSON body) rather than performing one.
+These tests never touch the network: DuuxAPI.session is a MagicMock whose
+get/post return FakeResponse async context managers, so every test asserts on
+the *shape* of the HTTP call (URL, method, JSON body) rather than performing
+one.
 """
 
-from unittest.mock import MagicMock
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
 
+import aiohttp
 import pytest
 
 from custom_components.duux import const
-from custom_components.duux.duux_api import DuuxAPI
+from custom_components.duux import duux_api
+from custom_components.duux.duux_api import (
+    CommandResult,
+    DuuxAPI,
+    RateLimiter,
+    RetryPolicy,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for an `aiohttp.ClientResponse` used via `async with`."""
+
+    def __init__(self, payload=None, status=200, raise_exc=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._payload = payload or {}
+        self._raise_exc = raise_exc
+        self.request_info = MagicMock()
+        self.history = ()
+
+    def raise_for_status(self):
+        if self._raise_exc is not None:
+            raise self._raise_exc
+
+    async def json(self, content_type="application/json"):
+        return self._payload
 
+    async def read(self):
+        return json.dumps(self._payload).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def make_response(payload=None, status_code=200, raise_exc=None, headers=None):
+    """Build a fake `aiohttp.ClientResponse`-like object."""
+    return FakeResponse(
+        payload, status=status_code, raise_exc=raise_exc, headers=headers
+    )
 
-def make_response(payload=None, status_code=200, raise_exc=None):
-    """Build a fake `requests.Response`-like object."""
-    response = MagicMock()
-    response.status_code = status_code
-    response.json.return_value = payload or {}
-    if raise_exc is not None:
-        response.raise_for_status.side_effect = raise_exc
-    else:
-        response.raise_for_status.return_value = None
-    return response
+
+def http_error(status):
+    return aiohttp.ClientResponseError(MagicMock(), (), status=status)
 
 
 @pytest.fixture
-def api():
-    instance = DuuxAPI(email="user@example.com", password="hunter2")
-    instance.session = MagicMock()
-    return instance
+def api(monkeypatch):
+    # No debounce wait for coalesced setters either.
+    monkeypatch.setattr(duux_api, "COMMAND_DEBOUNCE", 0)
+    return DuuxAPI(
+        email="user@example.com",
+        password="hunter2",
+        session=MagicMock(),
+        # No backoff sleeps in unit tests.
+        retry_policy=RetryPolicy(base_delay=0, max_delay=0),
+        # Effectively unlimited, so only the rate limiting tests ever wait.
+        rate_limiter=RateLimiter(rate=1000, burst=100),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -37,12 +82,12 @@ def api():
 # ---------------------------------------------------------------------------
 
 
-def test_login_success_sets_token_and_auth_header(api):
+async def test_login_success_sets_token_and_auth_header(api):
     api.session.post.return_value = make_response({"token": "mock-token"})
 
-    assert api.login() is True
+    assert await api.login() is True
     assert api.token == "mock-token"
-    api.session.headers.update.assert_called_once_with({"Authorization": "mock-token"})
+    assert api._headers == {"Authorization": "mock-token"}
     posted_url = api.session.post.call_args.args[0]
     assert posted_url == f"{const.API_BASE_URL}{const.API_LOGIN}"
     assert api.session.post.call_args.kwargs["json"] == {
@@ -51,19 +96,19 @@ def test_login_success_sets_token_and_auth_header(api):
     }
 
 
-def test_login_no_token_in_response_returns_false(api):
+async def test_login_no_token_in_response_returns_false(api):
     api.session.post.return_value = make_response({})
 
-    assert api.login() is False
+    assert await api.login() is False
     assert api.token is None
 
 
-def test_login_http_error_returns_false(api):
+async def test_login_http_error_returns_false(api):
     api.session.post.return_value = make_response(
         status_code=401, raise_exc=Exception("401 Unauthorized")
     )
 
-    assert api.login() is False
+    assert await api.login() is False
 
 
 # ---------------------------------------------------------------------------
@@ -71,31 +116,117 @@ def test_login_http_error_returns_false(api):
 # ---------------------------------------------------------------------------
 
 
-def test_get_devices_returns_list(api, devices_fixture):
-    api.session.get.return_value = make_response({"data": devices_fixture})
+async def test_get_devices_returns_list(api, devices_fixture):
+    api.session.request.return_value = make_response({"data": devices_fixture})
 
-    devices = api.get_devices()
+    devices = await api.get_devices()
 
     assert devices == devices_fixture
-    api.session.get.assert_called_once_with(f"{const.API_BASE_URL}{const.API_SENSORS}")
+    api.session.request.assert_called_once_with(
+        "GET",
+        f"{const.API_BASE_URL}{const.API_SENSORS}",
+        json=None,
+        headers=api._headers,
+    )
+
+
+async def test_get_devices_on_error_returns_empty_list(api):
+    api.session.request.side_effect = Exception("network error")
+
+    assert await api.get_devices() == []
+
+
+async def test_get_devices_returns_previous_list_when_body_unchanged(api):
+    api.session.request.side_effect = [
+        make_response({"data": [{"deviceId": "AA:BB"}]}),
+        make_response({"data": [{"deviceId": "AA:BB"}]}),
+        make_response({"data": [{"deviceId": "CC:DD"}]}),
+    ]
+
+    first = await api.get_devices()
+    second = await api.get_devices()
+    third = await api.get_devices()
+
+    assert second is first
+    assert third == [{"deviceId": "CC:DD"}]
 
 
-def test_get_devices_on_error_returns_empty_list(api):
-    api.session.get.side_effect = Exception("network error")
+async def test_get_devices_sends_validators_and_handles_not_modified(api):
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    api.session.request.side_effect = [
+        make_response(
+            {"data": [{"deviceId": "AA:BB"}]},
+            headers={"ETag": '"v1"', "Last-Modified": last_modified},
+        ),
+        make_response(status_code=304),
+    ]
 
-    assert api.get_devices() == []
+    first = await api.get_devices()
+    second = await api.get_devices()
 
+    assert second is first
+    headers = api.session.request.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == last_modified
 
-def test_get_device_status_merges_online_and_connection_type(api):
+
+async def test_get_devices_projected_keeps_only_polled_fields(api, devices_fixture):
+    api.session.request.return_value = make_response({"data": devices_fixture})
+
+    devices = await api.get_devices(projected=True)
+
+    assert [d["deviceId"] for d in devices] == [
+        d["deviceId"] for d in devices_fixture
+    ]
+    for device, source in zip(devices, devices_fixture):
+        assert "sensorType" not in device
+        assert set(device) <= {"deviceId", "online", "connectionType", "latestData"}
+        assert DuuxAPI.device_status(device) == DuuxAPI.device_status(source)
+
+
+async def test_get_devices_full_and_projected_lists_are_cached_separately(api):
+    device = {"deviceId": "AA:BB", "sensorType": {"Traits": []}}
+    api.session.request.side_effect = lambda *args, **kwargs: make_response(
+        {"data": [device]}
+    )
+
+    projected = await api.get_devices(projected=True)
+    full = await api.get_devices()
+
+    assert projected == [{"deviceId": "AA:BB"}]
+    assert full == [device]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_get_devices_decodes_with_or_without_orjson(api, use_orjson):
+    api.session.request.return_value = make_response({"data": [{"deviceId": "A"}]})
+
+    with patch.object(duux_api, "orjson", duux_api.orjson if use_orjson else None):
+        assert await api.get_devices() == [{"deviceId": "A"}]
+
+
+async def test_get_device_status_returns_empty_dict_when_fetch_fails(api):
+    api.session.request.return_value = make_response(
+        {"data": [{"deviceId": "AA:BB:CC", "latestData": {"fullData": {"sp": 1}}}]}
+    )
+    assert await api.get_device_status("AA:BB:CC")
+
+    api.session.request.return_value = make_response(
+        status_code=404, raise_exc=http_error(404)
+    )
+    assert await api.get_device_status("AA:BB:CC") == {}
+
+
+async def test_get_device_status_merges_online_and_connection_type(api):
     device = {
         "deviceId": "AA:BB:CC",
         "online": True,
         "connectionType": "mqtt",
         "latestData": {"fullData": {"power": 1, "sp": 21}},
     }
-    api.session.get.return_value = make_response({"data": [device]})
+    api.session.request.return_value = make_response({"data": [device]})
 
-    status = api.get_device_status("AA:BB:CC")
+    status = await api.get_device_status("AA:BB:CC")
 
     assert status == {
         "power": 1,
@@ -105,7 +236,7 @@ def test_get_device_status_merges_online_and_connection_type(api):
     }
 
 
-def test_get_device_status_fulldata_null_returns_online_and_type_only(api):
+async def test_get_device_status_fulldata_null_returns_online_and_type_only(api):
     """TCP-mode devices report latestData.fullData as null."""
     device = {
         "deviceId": "AA:BB:CC",
@@ -113,29 +244,29 @@ def test_get_device_status_fulldata_null_returns_online_and_type_only(api):
         "connectionType": "tcp",
         "latestData": {"fullData": None},
     }
-    api.session.get.return_value = make_response({"data": [device]})
+    api.session.request.return_value = make_response({"data": [device]})
 
-    status = api.get_device_status("AA:BB:CC")
+    status = await api.get_device_status("AA:BB:CC")
 
     assert status == {"online": False, "connectionType": "tcp"}
 
 
-def test_get_device_status_latest_data_missing_entirely(api):
+async def test_get_device_status_latest_data_missing_entirely(api):
     device = {"deviceId": "AA:BB:CC", "online": True, "connectionType": "mqtt"}
-    api.session.get.return_value = make_response({"data": [device]})
+    api.session.request.return_value = make_response({"data": [device]})
 
-    status = api.get_device_status("AA:BB:CC")
+    status = await api.get_device_status("AA:BB:CC")
 
     assert status == {"online": True, "connectionType": "mqtt"}
 
 
-def test_get_device_status_unknown_device_returns_empty_dict(api):
-    api.session.get.return_value = make_response({"data": []})
+async def test_get_device_status_unknown_device_returns_empty_dict(api):
+    api.session.request.return_value = make_response({"data": []})
 
-    assert api.get_device_status("doesnt-exist") == {}
+    assert await api.get_device_status("doesnt-exist") == {}
 
 
-def test_get_device_status_does_not_mutate_source_data(api):
+async def test_get_device_status_does_not_mutate_source_data(api):
     """data_copy must be a copy, not a live reference into fullData."""
     full_data = {"power": 1, "sp": 21}
     device = {
@@ -144,9 +275,9 @@ def test_get_device_status_does_not_mutate_source_data(api):
         "connectionType": "mqtt",
         "latestData": {"fullData": full_data},
     }
-    api.session.get.return_value = make_response({"data": [device]})
+    api.session.request.return_value = make_response({"data": [device]})
 
-    status = api.get_device_status("AA:BB:CC")
+    status = await api.get_device_status("AA:BB:CC")
     status["sp"] = 999
 
     assert full_data["sp"] == 21
@@ -157,26 +288,378 @@ def test_get_device_status_does_not_mutate_source_data(api):
 # ---------------------------------------------------------------------------
 
 
-def test_send_command_posts_correct_url_and_payload(api):
-    api.session.post.return_value = make_response({"ok": True})
+async def test_send_command_posts_correct_url_and_payload(api):
+    api.session.request.return_value = make_response({"ok": True})
 
-    result = api.send_command("AA:BB:CC", "tune set sp 24")
+    result = await api.send_command("AA:BB:CC", "tune set sp 24")
 
-    assert result is True
+    assert result is CommandResult.SENT
     expected_url = f"{const.API_BASE_URL}{const.API_COMMANDS}".replace(
         "{deviceMac}", "AA:BB:CC"
     )
-    api.session.post.assert_called_once_with(
-        expected_url, json={"command": "tune set sp 24"}
+    api.session.request.assert_called_once_with(
+        "POST", expected_url, json={"command": "tune set sp 24"}, headers=api._headers
     )
 
 
-def test_send_command_http_error_returns_false(api):
-    api.session.post.return_value = make_response(
+async def test_send_command_http_error_returns_false(api):
+    api.session.request.return_value = make_response(
         status_code=500, raise_exc=Exception("boom")
     )
 
-    assert api.send_command("AA:BB:CC", "tune set sp 24") is False
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.FAILED
+
+
+async def test_send_commands_sends_commands_in_order(api):
+    api.session.request.return_value = make_response({"ok": True})
+    commands = ["tune set power 01", "tune set mode 1", "tune set speed 3"]
+
+    result = await api.send_commands("AA:BB:CC", commands)
+
+    assert result is CommandResult.SENT
+    sent = [c.kwargs["json"]["command"] for c in api.session.request.call_args_list]
+    assert sent == commands
+
+
+async def test_send_commands_stops_if_power_command_fails(api):
+    api.session.request.return_value = make_response(
+        status_code=404, raise_exc=http_error(404)
+    )
+
+    result = await api.send_commands(
+        "AA:BB:CC", ["tune set power 01", "tune set mode 1"]
+    )
+
+    assert result is CommandResult.FAILED
+    api.session.request.assert_called_once()
+
+
+async def test_send_commands_stops_at_the_first_failed_command(api):
+    api.session.request.side_effect = [
+        make_response({"ok": True}),
+        make_response(status_code=404, raise_exc=http_error(404)),
+        make_response({"ok": True}),
+    ]
+
+    result = await api.send_commands(
+        "AA:BB:CC", ["tune set mode 1", "tune set speed 3", "tune set ion 0"]
+    )
+
+    assert result is CommandResult.FAILED
+    assert api.session.request.call_count == 2
+
+
+async def test_coalesced_commands_send_only_newest_value(api):
+    api.session.request.return_value = make_response({"ok": True})
+
+    results = await asyncio.gather(
+        api.set_fan_speed("AA:BB:CC", 5),
+        api.set_fan_speed("AA:BB:CC", 10),
+        api.set_fan_speed("AA:BB:CC", 15),
+    )
+
+    assert results == [CommandResult.MERGED, CommandResult.MERGED, CommandResult.SENT]
+    api.session.request.assert_called_once()
+    assert api.session.request.call_args.kwargs["json"] == {
+        "command": "tune set speed 15"
+    }
+
+
+async def test_coalescing_is_per_device_and_setting(api):
+    api.session.request.return_value = make_response({"ok": True})
+
+    results = await asyncio.gather(
+        api.set_fan_speed("AA:BB:CC", 5),
+        api.set_fan_speed("DD:EE:FF", 5),
+        api.set_temperature("AA:BB:CC", 20),
+    )
+
+    assert results == [CommandResult.SENT] * 3
+    assert api.session.request.call_count == 3
+
+
+async def test_coalesced_command_queued_while_sending_goes_out_next(api):
+    sent = []
+    first_sending = asyncio.Event()
+    release = asyncio.Event()
+
+    class SlowResponse(FakeResponse):
+        async def __aenter__(self):
+            first_sending.set()
+            await release.wait()
+            return self
+
+    def request(method, url, json, headers):
+        sent.append(json["command"])
+        return SlowResponse({"ok": True})
+
+    api.session.request.side_effect = request
+
+    first = asyncio.create_task(api.set_fan_speed("AA:BB:CC", 5))
+    await first_sending.wait()
+    second = asyncio.create_task(api.set_fan_speed("AA:BB:CC", 10))
+    third = asyncio.create_task(api.set_fan_speed("AA:BB:CC", 20))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first is CommandResult.SENT
+    assert await second is CommandResult.MERGED
+    assert await third is CommandResult.SENT
+    assert sent == ["tune set speed 5", "tune set speed 20"]
+
+
+async def test_coalesced_command_replacing_a_cancelled_one_is_sent(api):
+    api.session.request.return_value = make_response({"ok": True})
+
+    first = asyncio.create_task(api.set_fan_speed("AA:BB:CC", 5))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+
+    assert await api.set_fan_speed("AA:BB:CC", 10) is CommandResult.SENT
+    assert api.session.request.call_args.kwargs["json"] == {
+        "command": "tune set speed 10"
+    }
+
+
+async def test_coalesced_command_fails_when_its_flush_is_cancelled(api):
+    sending = asyncio.Event()
+
+    class StuckResponse(FakeResponse):
+        async def __aenter__(self):
+            sending.set()
+            await asyncio.Event().wait()
+
+    api.session.request.side_effect = lambda *args, **kwargs: StuckResponse({})
+
+    command = asyncio.create_task(api.set_fan_speed("AA:BB:CC", 5))
+    await sending.wait()
+    (flusher,) = api._command_flushers.values()
+    flusher.cancel()
+
+    assert await asyncio.wait_for(command, 1) is CommandResult.FAILED
+    assert api._command_flushers == {}
+
+
+async def test_coalesced_command_failure_is_reported(api):
+    api.session.request.return_value = make_response(
+        status_code=404, raise_exc=http_error(404)
+    )
+
+    assert await api.set_humidity("AA:BB:CC", 50) is CommandResult.FAILED
+    assert api._command_flushers == {}
+
+
+# ---------------------------------------------------------------------------
+# Token refresh
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("status", [401, 403])
+async def test_auth_failure_logs_in_again_and_retries(api, devices_fixture, status):
+    api.token = "expired"
+    api.session.request.side_effect = [
+        make_response(status_code=status),
+        make_response({"data": devices_fixture}),
+    ]
+    api.session.post.return_value = make_response({"token": "fresh"})
+
+    devices = await api.get_devices()
+
+    assert devices == devices_fixture
+    assert api.session.post.call_count == 1
+    assert api.session.request.call_count == 2
+    assert api.session.request.call_args.kwargs["headers"] == {"Authorization": "fresh"}
+
+
+async def test_auth_failure_on_command_logs_in_again_and_retries(api):
+    api.token = "expired"
+    api.session.request.side_effect = [
+        make_response(status_code=401),
+        make_response({"ok": True}),
+    ]
+    api.session.post.return_value = make_response({"token": "fresh"})
+
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.SENT
+    assert api.session.request.call_count == 2
+
+
+async def test_failed_relogin_gives_up_without_retrying(api):
+    api.token = "expired"
+    api.session.request.return_value = make_response(status_code=401)
+    api.session.post.return_value = make_response({})
+
+    assert await api.get_devices() == []
+    assert api.session.request.call_count == 1
+
+
+async def test_concurrent_auth_failures_share_a_single_login(api):
+    api.token = "expired"
+
+    def respond(method, url, json=None, headers=None):
+        if headers == {"Authorization": "fresh"}:
+            return make_response({"data": []})
+        return make_response(status_code=401)
+
+    api.session.request.side_effect = respond
+
+    async def slow_login_response():
+        await asyncio.sleep(0)
+        return {"token": "fresh"}
+
+    login_response = make_response()
+    login_response.json = lambda content_type=None: slow_login_response()
+    api.session.post.return_value = login_response
+
+    await asyncio.gather(*(api.get_devices() for _ in range(5)))
+
+    assert api.session.post.call_count == 1
+
+
+async def test_login_reuses_a_relogin_already_in_flight(api):
+    api.token = "expired"
+
+    async def slow_login_response():
+        await asyncio.sleep(0)
+        return {"token": "fresh"}
+
+    login_response = make_response()
+    login_response.json = lambda content_type=None: slow_login_response()
+    api.session.post.return_value = login_response
+
+    # A poll's re-login is running when setup logs in.
+    results = await asyncio.gather(api._relogin("expired"), api.login())
+
+    assert results == [True, True]
+    assert api.token == "fresh"
+    assert api.session.post.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+
+
+async def test_dropped_connection_is_retried(api):
+    api.session.request.side_effect = [
+        aiohttp.ClientConnectionError("connection reset"),
+        make_response({"ok": True}),
+    ]
+
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.SENT
+    assert api.session.request.call_count == 2
+
+
+async def test_server_error_is_retried(api, devices_fixture):
+    api.session.request.side_effect = [
+        make_response(status_code=502, raise_exc=http_error(502)),
+        make_response({"data": devices_fixture}),
+    ]
+
+    assert await api.get_devices() == devices_fixture
+    assert api.session.request.call_count == 2
+
+
+async def test_client_error_is_not_retried(api):
+    api.session.request.return_value = make_response(
+        status_code=404, raise_exc=http_error(404)
+    )
+
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.FAILED
+    assert api.session.request.call_count == 1
+
+
+async def test_retries_stop_after_policy_attempts(api):
+    api.session.request.side_effect = aiohttp.ClientConnectionError("down")
+
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.FAILED
+    assert api.session.request.call_count == api.retry_policy.attempts
+
+
+async def test_retries_stop_at_the_deadline(api):
+    api.retry_policy = RetryPolicy(attempts=100, base_delay=5, max_delay=5, deadline=1)
+    api.session.request.side_effect = aiohttp.ClientConnectionError("down")
+
+    with patch(
+        "custom_components.duux.duux_api.random.uniform", side_effect=lambda a, b: b
+    ):
+        assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.FAILED
+
+    # A backoff that would overrun the deadline is never slept.
+    assert api.session.request.call_count == 1
+
+
+def test_retry_policy_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=3)
+
+    assert all(0 <= policy.backoff(retry) <= 3 for retry in range(1, 10))
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+async def test_rate_limiter_serves_commands_before_polls():
+    limiter = RateLimiter(rate=20, burst=1)
+    await limiter.acquire()  # drain the bucket
+    order = []
+
+    async def acquire(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    await asyncio.gather(
+        acquire("poll", duux_api.PRIORITY_POLL),
+        acquire("command", duux_api.PRIORITY_COMMAND),
+    )
+
+    assert order == ["command", "poll"]
+
+
+async def test_rate_limiter_halves_rate_when_throttled():
+    limiter = RateLimiter(rate=4, min_rate=1.5)
+
+    limiter.throttled(retry_after=30)
+    assert limiter.rate == 2
+    assert 29 < limiter.blocked_for() <= 30
+
+    limiter.throttled(retry_after=0)
+    assert limiter.rate == 1.5  # never below min_rate
+
+
+async def test_429_with_retry_after_is_retried_at_a_lower_rate(api):
+    api.session.request.side_effect = [
+        make_response(
+            status_code=429, raise_exc=http_error(429), headers={"Retry-After": "0"}
+        ),
+        make_response({"ok": True}),
+    ]
+    rate = api.rate_limiter.rate
+
+    assert await api.send_command("AA:BB:CC", "tune set sp 24") is CommandResult.SENT
+    assert api.session.request.call_count == 2
+    assert api.rate_limiter.rate < rate
+
+
+async def test_retry_after_beyond_deadline_fails_without_waiting(api):
+    api.session.request.return_value = make_response(
+        status_code=429, raise_exc=http_error(429), headers={"Retry-After": "600"}
+    )
+
+    result = await api.send_command("AA:BB:CC", "tune set sp 24")
+
+    assert result is CommandResult.FAILED
+    api.session.request.assert_called_once()
+
+
+def test_retry_after_accepts_http_dates():
+    past = FakeResponse(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    invalid = FakeResponse(headers={"Retry-After": "soon"})
+
+    assert duux_api._retry_after(past) == 0
+    assert duux_api._retry_after(invalid) is None
+    assert duux_api._retry_after(FakeResponse()) is None
 
 
 # ---------------------------------------------------------------------------
@@ -229,12 +712,12 @@ def test_send_command_http_error_returns_false(api):
         ("set_purifier_speed", (999,), "tune set speed 4"),  # clamps to max 4
     ],
 )
-def test_convenience_setters_build_expected_command(
+async def test_convenience_setters_build_expected_command(
     api, method, args, expected_command
 ):
-    api.session.post.return_value = make_response({"ok": True})
+    api.session.request.return_value = make_response({"ok": True})
 
-    result = getattr(api, method)("AA:BB:CC", *args)
+    result = await getattr(api, method)("AA:BB:CC", *args)
 
-    assert result is True
-    assert api.session.post.call_args.kwargs["json"] == {"command": expected_command}
+    assert result is CommandResult.SENT
+    assert api.session.request.call_args.kwargs["json"] == {"command": expected_command}
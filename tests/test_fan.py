@@ -1,6 +1,6 @@
 """Unit tests for custom_components.duux.fan."""
 
-from custom_components.duux import const
+from custom_components.duux import const, device_profile
 from custom_components.duux.fan import (
     DuuxAirPurifierFan,
     DuuxFanAutoDiscovery,
@@ -47,6 +47,30 @@ async def test_whisper_flex_turn_on_sets_power_optimistically(
     assert entity.is_on is True
 
 
+async def test_whisper_flex_turn_on_with_speed_and_preset_sends_one_batch(
+    device_by_stid, make_coordinator, mock_api, make_hass
+):
+    device = device_by_stid(36)
+    data = dict(device["latestData"]["fullData"])
+    data["power"] = 0
+    coordinator = make_coordinator(data)
+    entity = attach_hass(DuuxWhisperFlexFan(coordinator, mock_api, device), make_hass())
+
+    await entity.async_turn_on(percentage=100, preset_mode="night")
+
+    mock_api.send_commands.assert_called_once_with(
+        device["deviceId"],
+        [
+            "tune set power 01",
+            "tune set heating 2",
+            f"tune set speed {entity._speed_range[-1]}",
+        ],
+    )
+    mock_api.set_power.assert_not_called()
+    assert entity.is_on is True
+    assert entity.preset_mode == "night"
+
+
 async def test_whisper_flex_turn_off(
     device_by_stid, make_coordinator, mock_api, make_hass
 ):
@@ -284,8 +308,10 @@ async def test_air_purifier_set_percentage_to_lowest_turns_off_ionizer(
 
     await entity.async_set_percentage(25)  # maps to speed 1 (lowest)
 
-    mock_api.set_purifier_speed.assert_called_once_with(device["deviceId"], 1)
-    mock_api.set_ionizer.assert_called_once_with(device["deviceId"], False)
+    mock_api.send_commands.assert_called_once_with(
+        device["deviceId"], ["tune set speed 1", "tune set ion 0"]
+    )
+    assert coordinator.data["ion"] == 0
 
 
 async def test_air_purifier_set_percentage_does_not_touch_ionizer_when_already_off(
@@ -325,7 +351,9 @@ async def test_air_purifier_set_percentage_ensures_power_on_first(
 
     await entity.async_set_percentage(50)
 
-    mock_api.set_power.assert_called_once_with(device["deviceId"], True)
+    commands = mock_api.send_commands.call_args.args[1]
+    assert commands[:2] == ["tune set power 01", "tune set speed 2"]
+    assert entity.is_on is True
 
 
 # ---------------------------------------------------------------------------
@@ -433,6 +461,56 @@ async def test_fan_autodiscovery_set_preset_mode_sends_built_command(
     mock_api.send_command.assert_called_once_with(device["deviceId"], "tune set mode 2")
 
 
+async def test_fan_autodiscovery_turn_on_batches_discovered_commands(
+    make_coordinator, mock_api, make_hass
+):
+    device = {
+        "id": 1,
+        "deviceId": "AA:BB",
+        "displayName": "Discovered Fan",
+        "sensorType": {
+            "name": "Discovered Fan",
+            "Traits": [
+                {
+                    "name": "FanSpeed",
+                    "commands": ["tune set fanspeed {fanSpeed}"],
+                    "settings": {
+                        "availableFanSpeeds": {
+                            "speeds": [{"speed_name": "1"}, {"speed_name": "2"}]
+                        }
+                    },
+                },
+                {
+                    "name": "Modes",
+                    "commands": ["tune set mode {mode}"],
+                    "settings": {
+                        "availableModes": [
+                            {
+                                "command_key": "mode",
+                                "settings": [
+                                    {"setting_name": "Night", "setting_value": "2"}
+                                ],
+                            }
+                        ]
+                    },
+                },
+            ],
+        },
+    }
+    coordinator = make_coordinator({"power": 0, "speed": 1, "mode": 0})
+    entity = attach_hass(DuuxFanAutoDiscovery(coordinator, mock_api, device), make_hass())
+
+    await entity.async_turn_on(percentage=100, preset_mode="Night")
+
+    mock_api.send_commands.assert_called_once_with(
+        device["deviceId"],
+        ["tune set power 01", "tune set mode 2", "tune set fanspeed 2"],
+    )
+    mock_api.set_power.assert_not_called()
+    assert entity.percentage == 100
+    assert entity.preset_mode == "Night"
+
+
 # ---------------------------------------------------------------------------
 # available
 # ---------------------------------------------------------------------------
@@ -466,6 +544,9 @@ async def test_async_setup_entry_dispatches_correct_entity_classes(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 
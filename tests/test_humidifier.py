@@ -1,6 +1,6 @@
 """Unit tests for custom_components.duux.humidifier."""
 
-from custom_components.duux import const
+from custom_components.duux import const, device_profile
 from custom_components.duux.humidifier import (
     DuuxBeamMiniDehumidifier,
     DuuxBoraDehumidifier,
@@ -33,6 +33,18 @@ def test_bora_properties(device_by_stid, make_coordinator, mock_api):
     assert entity.action == HumidifierAction.DRYING
 
 
+def test_bora_mode_handles_string_value_from_api(
+    device_by_stid, make_coordinator, mock_api
+):
+    device = device_by_stid(62)
+    data = dict(device["latestData"]["fullData"])
+    data["mode"] = "1"
+    coordinator = make_coordinator(data)
+    entity = DuuxBoraDehumidifier(coordinator, mock_api, device)
+
+    assert entity.mode == entity.PRESET_CONTINUOUS
+
+
 async def test_bora_set_mode_continuous(
     device_by_stid, make_coordinator, mock_api, make_hass
 ):
@@ -59,6 +71,20 @@ async def test_bora_set_humidity(device_by_stid, make_coordinator, mock_api, mak
     mock_api.set_humidity.assert_called_once_with(device["deviceId"], 60)
 
 
+async def test_bora_set_humidity_shows_the_clamped_set_point_sent(
+    device_by_stid, make_coordinator, mock_api, make_hass
+):
+    device = device_by_stid(62)
+    coordinator = make_coordinator(device["latestData"]["fullData"])
+    entity = attach_hass(
+        DuuxBoraDehumidifier(coordinator, mock_api, device), make_hass()
+    )
+
+    await entity.async_set_humidity(95)
+
+    assert coordinator.data["sp"] == 80
+
+
 async def test_bora_turn_off(device_by_stid, make_coordinator, mock_api, make_hass):
     device = device_by_stid(62)
     coordinator = make_coordinator(device["latestData"]["fullData"])
@@ -183,6 +209,18 @@ def test_neo_extra_state_attributes_spray_volume(
     assert entity.extra_state_attributes == {"spray_volume": "Mid"}
 
 
+def test_neo_extra_state_attributes_unknown_spray_volume(
+    device_by_stid, make_coordinator, mock_api
+):
+    device = device_by_stid(47)
+    data = dict(device["latestData"]["fullData"])
+    data["speed"] = 7
+    coordinator = make_coordinator(data)
+    entity = DuuxNeoHumidifier(coordinator, mock_api, device)
+
+    assert entity.extra_state_attributes == {"spray_volume": "Unknown (7)"}
+
+
 # ---------------------------------------------------------------------------
 # Platform dispatch
 # ---------------------------------------------------------------------------
@@ -201,6 +239,9 @@ async def test_async_setup_entry_dispatches_correct_entity_classes(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 
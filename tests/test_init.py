@@ -7,24 +7,66 @@ real coordinator's network/event-loop machinery -- that machinery is exercised
 directly in the DuuxDataUpdateCoordinator tests further down instead.
 """
 
+import asyncio
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from custom_components.duux import (
+    DevicePollSchedule,
+    DuuxAccountCoordinator,
     DuuxDataUpdateCoordinator,
+    _async_options_updated,
     async_remove_config_entry_device,
+    device_profile,
     async_setup_entry,
     async_unload_entry,
     const,
 )
+from custom_components.duux.duux_api import CommandResult
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 
 class FakeConfigEntry:
-    def __init__(self, data, entry_id="entry_1"):
+    def __init__(self, data, entry_id="entry_1", options=None):
         self.data = data
         self.entry_id = entry_id
+        self.options = options or {}
+        self.on_unload = []
+        self.tasks = []
+
+    def async_on_unload(self, func):
+        self.on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        task = asyncio.ensure_future(target)
+        self.tasks.append(task)
+        return task
+
+
+class FakeStore:
+    """Stands in for homeassistant.helpers.storage.Store, keyed like the real one."""
+
+    saved = {}
+
+    def __init__(self, hass, version, key):
+        self.key = key
+
+    async def async_load(self):
+        return FakeStore.saved.get(self.key)
+
+    def async_delay_save(self, data_func, delay=0):
+        FakeStore.saved[self.key] = data_func()
+
+    async def async_save(self, data):
+        FakeStore.saved[self.key] = data
+
+    async def async_remove(self):
+        FakeStore.saved.pop(self.key, None)
 
 
 class FakeCoordinatorForSetup:
@@ -32,22 +74,75 @@ class FakeCoordinatorForSetup:
 
     instances = []
 
-    def __init__(self, hass, api, device_id, device_name, config_entry=None):
+    def __init__(
+        self, hass, api, device_id, device_name, account, config_entry=None
+    ):
         self.hass = hass
         self.api = api
+        self.account = account
         self.device_id = device_id
         self.device_name = device_name
         self.data = {}
+        self.refreshed = False
         FakeCoordinatorForSetup.instances.append(self)
 
-    async def async_config_entry_first_refresh(self):
-        return None
+    async def async_refresh(self):
+        self.refreshed = True
+
+
+class FakeAccountCoordinatorForSetup:
+    """Stands in for DuuxAccountCoordinator inside async_setup_entry tests."""
+
+    def __init__(self, hass, api, config_entry=None):
+        self.hass = hass
+        self.api = api
+        self.data = {}
+        self.seeded = None
+        self.cached = None
+        self.stale = False
+        self.pushed = frozenset()
+        self.shut_down = False
+
+    def async_add_listener(self, update_callback, context=None):
+        return lambda: None
+
+    def async_seed(self, devices):
+        self.seeded = devices
+        self.stale = False
+
+    def async_seed_cached(self, status):
+        self.cached = status
+        self.stale = True
+
+    def async_enable_push(self, entry_id, device_ids):
+        self.pushed = device_ids
+
+    def async_set_options(self, entry_id, options):
+        self.options = options
+
+    def async_release_entry(self, entry_id):
+        self.released = entry_id
+
+    async def async_register_shutdown(self):
+        self.shutdown_registered = True
+
+    async def async_shutdown(self):
+        self.shut_down = True
 
 
 @pytest.fixture(autouse=True)
 def _reset_fake_coordinator_instances():
     FakeCoordinatorForSetup.instances = []
-    yield
+    FakeStore.saved = {}
+    with (
+        patch(
+            "custom_components.duux.DuuxAccountCoordinator",
+            FakeAccountCoordinatorForSetup,
+        ),
+        patch("custom_components.duux.async_get_clientsession"),
+        patch("custom_components.duux.Store", FakeStore),
+    ):
+        yield
     FakeCoordinatorForSetup.instances = []
 
 
@@ -79,11 +174,44 @@ async def test_async_setup_entry_creates_coordinator_per_device(
     stored = fake_hass.data[const.DOMAIN][entry.entry_id]
     assert len(stored["devices"]) == len(devices_fixture)
     assert len(stored["coordinators"]) == len(devices_fixture)
+    assert stored["profiles"].keys() == stored["coordinators"].keys()
     assert len(FakeCoordinatorForSetup.instances) == len(devices_fixture)
+    assert all(c.refreshed for c in FakeCoordinatorForSetup.instances)
+    # The account starts from the setup fetch instead of fetching again.
+    assert stored["account"].seeded is devices_fixture
     # Platforms get forwarded once setup succeeds.
     fake_hass.config_entries.async_forward_entry_setups.assert_awaited_once()
 
 
+async def test_async_setup_entry_runs_first_refreshes_concurrently(
+    fake_hass, devices_fixture
+):
+    entry = FakeConfigEntry(data={"email": "x@example.com", "password": "y"})
+    running = peak = 0
+
+    class SlowCoordinator(FakeCoordinatorForSetup):
+        async def async_refresh(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+    with (
+        patch("custom_components.duux.DuuxAPI.login", return_value=True),
+        patch(
+            "custom_components.duux.DuuxAPI.get_devices",
+            return_value=devices_fixture,
+        ),
+        patch("custom_components.duux.DuuxDataUpdateCoordinator", SlowCoordinator),
+        patch("custom_components.duux.SETUP_REFRESH_CONCURRENCY", 2),
+    ):
+        assert await async_setup_entry(fake_hass, entry) is True
+
+    # Refreshes overlap, but never more than the limit at once.
+    assert peak == 2
+
+
 async def test_async_setup_entry_login_failure_returns_false(fake_hass):
     entry = FakeConfigEntry(data={"email": "x@example.com", "password": "y"})
 
@@ -171,6 +299,196 @@ async def test_async_setup_entry_warns_on_non_mqtt_device(fake_hass, device_by_s
     assert mock_issue.call_args.kwargs["translation_key"] == "device_not_mqtt"
 
 
+def test_device_profile_lists_a_known_models_entities(device_by_stid):
+    profile = device_profile(device_by_stid(const.DUUX_STID_BRIGHT_2))
+
+    assert profile["fan"] == ("DuuxAirPurifierFan",)
+    assert profile["switch"] == ("DuuxNightModeSwitch", "DuuxIonizerSwitch")
+    assert "climate" not in profile
+
+
+def test_device_profile_falls_back_by_device_and_google_type():
+    def device(device_type, google_type):
+        return {
+            "sensorTypeId": 9999,
+            "sensorType": {
+                "type": device_type,
+                "googleDeviceType": f"action.devices.types.{google_type}",
+            },
+        }
+
+    assert device_profile(device(const.DUUX_DTID_HEATER[0], "HEATER")) == {
+        "climate": ("DuuxClimateAutoDiscovery",)
+    }
+    assert device_profile(device(999, "FAN")) == {"fan": ("DuuxFanAutoDiscovery",)}
+    assert device_profile(device(const.DUUX_DTID_HUMIDIFIER[0], "HUMIDIFIER")) == {
+        "humidifier": ()
+    }
+    assert device_profile(device(999, "LIGHT")) == {}
+
+
+async def test_async_setup_entry_caches_devices_and_status(
+    fake_hass, devices_fixture
+):
+    entry = FakeConfigEntry(data={"email": "x@example.com", "password": "y"})
+
+    with (
+        patch("custom_components.duux.DuuxAPI.login", return_value=True),
+        patch(
+            "custom_components.duux.DuuxAPI.get_devices",
+            return_value=devices_fixture,
+        ),
+        patch(
+            "custom_components.duux.DuuxDataUpdateCoordinator",
+            FakeCoordinatorForSetup,
+        ),
+    ):
+        await async_setup_entry(fake_hass, entry)
+
+    account = fake_hass.data[const.DOMAIN][entry.entry_id]["account"]
+    assert FakeStore.saved["duux.entry_1"] == {
+        "devices": devices_fixture,
+        "status": account.data,
+    }
+
+
+async def test_async_setup_entry_starts_from_cache_then_connects(
+    fake_hass, devices_fixture
+):
+    entry = FakeConfigEntry(data={"email": "x@example.com", "password": "y"})
+    status = {"AA:BB": {"power": 1}}
+    FakeStore.saved["duux.entry_1"] = {"devices": devices_fixture, "status": status}
+    connected = asyncio.Event()
+
+    async def login(self):
+        await connected.wait()
+        return True
+
+    with (
+        patch("custom_components.duux.DuuxAPI.login", login),
+        patch(
+            "custom_components.duux.DuuxAPI.get_devices",
+            return_value=devices_fixture,
+        ),
+        patch(
+            "custom_components.duux.DuuxDataUpdateCoordinator",
+            FakeCoordinatorForSetup,
+        ),
+    ):
+        assert await async_setup_entry(fake_hass, entry) is True
+
+        # Platforms are set up from the cache before the cloud answers...
+        fake_hass.config_entries.async_forward_entry_setups.assert_awaited_once()
+        account = fake_hass.data[const.DOMAIN][entry.entry_id]["account"]
+        assert account.cached == status
+        assert account.stale
+
+        # ...and the cloud's state replaces it once logged in.
+        connected.set()
+        await asyncio.gather(*entry.tasks)
+
+    assert account.seeded == devices_fixture
+    assert not account.stale
+    fake_hass.config_entries.async_schedule_reload.assert_not_called()
+
+
+async def test_async_setup_entry_reloads_when_cached_devices_changed(
+    fake_hass, devices_fixture
+):
+    entry = FakeConfigEntry(data={"email": "x@example.com", "password": "y"})
+    FakeStore.saved["duux.entry_1"] = {
+        "devices": devices_fixture[:1],
+        "status": {},
+    }
+
+    with (
+        patch("custom_components.duux.DuuxAPI.login", return_value=True),
+        patch(
+            "custom_components.duux.DuuxAPI.get_devices",
+            return_value=devices_fixture,
+        ),
+        patch(
+            "custom_components.duux.DuuxDataUpdateCoordinator",
+            FakeCoordinatorForSetup,
+        ),
+    ):
+        await async_setup_entry(fake_hass, entry)
+        await asyncio.gather(*entry.tasks)
+
+    assert FakeStore.saved["duux.entry_1"]["devices"] == devices_fixture
+    fake_hass.config_entries.async_schedule_reload.assert_called_once_with(
+        entry.entry_id
+    )
+
+
+async def test_options_update_applies_polling_live_and_reloads_for_mqtt(fake_hass):
+    entry = FakeConfigEntry(data={}, options={const.CONF_POLL_INTERVAL: 60})
+    account = MagicMock()
+    fake_hass.config_entries.async_reload = AsyncMock()
+    fake_hass.data[const.DOMAIN] = {
+        entry.entry_id: {"account": account, "mqtt_topic": None}
+    }
+
+    await _async_options_updated(fake_hass, entry)
+    account.async_set_options.assert_called_once_with(entry.entry_id, entry.options)
+    fake_hass.config_entries.async_reload.assert_not_awaited()
+
+    entry.options = {const.CONF_MQTT_TOPIC: "duux/{mac}/state"}
+    await _async_options_updated(fake_hass, entry)
+    fake_hass.config_entries.async_reload.assert_awaited_once_with(entry.entry_id)
+
+
+async def test_async_setup_entry_shares_account_between_entries_with_same_login(
+    fake_hass, devices_fixture
+):
+    first = FakeConfigEntry(
+        data={"email": "x@example.com", "password": "hunter2"}, entry_id="entry_1"
+    )
+    second = FakeConfigEntry(
+        data={"email": "X@example.com", "password": "hunter2"}, entry_id="entry_2"
+    )
+    other = FakeConfigEntry(
+        data={"email": "z@example.com", "password": "y"}, entry_id="entry_3"
+    )
+    login = AsyncMock(return_value=True)
+
+    with (
+        patch("custom_components.duux.DuuxAPI.login", login),
+        patch(
+            "custom_components.duux.DuuxAPI.get_devices",
+            return_value=devices_fixture,
+        ),
+        patch(
+            "custom_components.duux.DuuxDataUpdateCoordinator",
+            FakeCoordinatorForSetup,
+        ),
+    ):
+        await asyncio.gather(
+            async_setup_entry(fake_hass, first),
+            async_setup_entry(fake_hass, second),
+            async_setup_entry(fake_hass, other),
+        )
+
+    stored = fake_hass.data[const.DOMAIN]
+    assert login.await_count == 2
+    assert stored["entry_1"]["api"] is stored["entry_2"]["api"]
+    assert stored["entry_1"]["account"] is stored["entry_2"]["account"]
+    assert stored["entry_1"]["account"] is not stored["entry_3"]["account"]
+    assert not any(
+        "hunter2" in str(key) for key in fake_hass.data[const.DATA_ACCOUNTS]
+    )
+
+    # The shared poller stops with Home Assistant, or once the last entry
+    # using it unloads.
+    account = stored["entry_1"]["account"]
+    assert account.shutdown_registered
+    await async_unload_entry(fake_hass, first)
+    assert account.released == first.entry_id
+    assert not account.shut_down
+    await async_unload_entry(fake_hass, second)
+    assert account.shut_down
+
+
 # ---------------------------------------------------------------------------
 # async_unload_entry
 # ---------------------------------------------------------------------------
@@ -205,34 +523,645 @@ async def test_async_unload_entry_keeps_data_when_unload_fails(fake_hass):
 # ---------------------------------------------------------------------------
 
 
-async def test_coordinator_update_data_returns_api_payload(fake_hass):
+async def test_account_coordinator_indexes_device_status_by_mac(fake_hass):
     api = MagicMock()
-    api.get_device_status.return_value = {"power": 1, "sp": 21}
+    api.get_devices = AsyncMock(return_value=[
+        {
+            "deviceId": "AA:BB",
+            "online": True,
+            "connectionType": "mqtt",
+            "latestData": {"fullData": {"power": 1}},
+        },
+        {"deviceId": "CC:DD", "online": False, "connectionType": "tcp"},
+    ])
+
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+
+    data = await account._async_update_data()
+
+    api.get_devices.assert_awaited_once_with(projected=True)
+    assert data == {
+        "AA:BB": {"power": 1, "online": True, "connectionType": "mqtt"},
+        "CC:DD": {"online": False, "connectionType": "tcp"},
+    }
+
+
+async def test_account_coordinator_seeds_from_fetched_devices(fake_hass):
+    api = MagicMock()
+    api.get_devices = AsyncMock()
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+
+    account.async_seed([
+        {
+            "deviceId": "AA:BB",
+            "online": True,
+            "connectionType": "mqtt",
+            "latestData": {"fullData": {"power": 1}},
+        },
+    ])
+
+    api.get_devices.assert_not_awaited()
+    assert account.last_update_success
+    assert account.device_status("AA:BB") == {
+        "power": 1, "online": True, "connectionType": "mqtt",
+    }
+
+
+async def test_account_coordinator_cached_status_is_stale_until_polled(fake_hass):
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[
+        {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 0}}},
+    ])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    coordinator = _make_device_coordinator(fake_hass, account)
+    listener = MagicMock()
+    coordinator._listeners[listener] = (listener, frozenset({"temp"}))
+
+    account.async_seed_cached({"AA:BB": {"power": 1}})
+    assert coordinator.stale
+    assert coordinator.data == {"power": 1}
+    listener.reset_mock()
+
+    account.async_set_updated_data(await account._async_update_data())
+
+    assert not coordinator.stale
+    # No longer stale wakes every entity, whatever keys it reads.
+    listener.assert_called_once_with()
+
+
+async def test_account_coordinator_applies_polling_options(fake_hass):
+    laundry = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 0}}}
+    other = {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 0}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[laundry, other])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    for _ in range(8):
+        account.data = await account._async_update_data()
+    assert account.update_interval == const.POLL_INTERVAL_IDLE
+
+    account.async_set_options("entry_1", {
+        const.CONF_POLL_INTERVAL: 60,
+        const.CONF_FAST_POLL_DEVICES: ["AA:BB"],
+        const.CONF_FAST_POLL_INTERVAL: 15,
+        const.CONF_MIN_POLL_INTERVAL: 20,
+    })
+
+    # Applied straight away: the chosen device is capped at its faster
+    # interval, and the floor still wins over it.
+    assert account.schedule("AA:BB").interval == timedelta(seconds=15)
+    assert account.schedule("CC:DD").idle == const.POLL_INTERVAL_IDLE
+    assert account.update_interval == timedelta(seconds=20)
+
+
+async def test_account_coordinator_keeps_options_and_push_per_entry(fake_hass):
+    laundry = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 0}}}
+    other = {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 0}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[laundry, other])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    for _ in range(8):
+        account.data = await account._async_update_data()
+
+    account.async_set_options("entry_1", {
+        const.CONF_FAST_POLL_DEVICES: ["AA:BB"],
+        const.CONF_FAST_POLL_INTERVAL: 15,
+        const.CONF_MIN_POLL_INTERVAL: 15,
+    })
+    account.async_set_options("entry_2", {const.CONF_POLL_INTERVAL: 300})
+    # The second entry's options don't undo the first one's fast polling.
+    assert account.schedule("AA:BB").interval == timedelta(seconds=15)
+    assert account.update_interval == timedelta(seconds=15)
+
+    account.async_enable_push("entry_1", {"AA:BB", "CC:DD"})
+    account.async_enable_push("entry_2", set())
+    assert account.pushed == {"AA:BB", "CC:DD"}
+    assert account.update_interval == const.POLL_INTERVAL_PUSH
+
+    # Once the pushing entry unloads its devices are polled again, and
+    # its fast polling backs off to the remaining entry's options.
+    account.async_release_entry("entry_1")
+    assert not account.pushed
+    assert account.update_interval == timedelta(seconds=15)
+    assert account.schedule("AA:BB").idle == const.POLL_INTERVAL_IDLE
+
+
+async def test_account_coordinator_applies_pushed_state(fake_hass):
+    device = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 1}}}
+    other = {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 0}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[device, other])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    account.data = await account._async_update_data()
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+
+    account.async_enable_push("entry_1", {"AA:BB"})
+    # The pushed device no longer holds polling fast; the other one does.
+    assert account.update_interval == const.POLL_INTERVAL_FAST
+    account.async_enable_push("entry_1", {"AA:BB", "CC:DD"})
+    assert account.update_interval == const.POLL_INTERVAL_PUSH
+
+    account.async_push("AA:BB", {"power": 0, "sp": 21})
+    assert coordinator.data == {
+        "power": 0, "sp": 21, "online": True, "connectionType": None,
+    }
+
+    # The next poll reads the device again instead of keeping the push.
+    data = await account._async_update_data()
+    assert data["AA:BB"] == {"power": 1, "online": True, "connectionType": None}
+
+
+async def test_account_coordinator_reuses_status_of_unchanged_devices(fake_hass):
+    changing = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 1}}}
+    steady = {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 0}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[changing, steady])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    account.data = await account._async_update_data()
+    first = account.data
+
+    api.get_devices.return_value = [
+        {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 0}}},
+        dict(steady),
+    ]
+    data = await account._async_update_data()
+
+    assert data["AA:BB"] == {"power": 0, "online": True, "connectionType": None}
+    assert data["CC:DD"] is first["CC:DD"]
+
+
+def test_poll_schedule_backs_off_while_unchanged():
+    schedule = DevicePollSchedule()
+    off = {"power": 0}
+
+    intervals = []
+    for _ in range(8):
+        schedule.polled(off, changed=False)
+        intervals.append(schedule.interval)
+
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == const.POLL_INTERVAL_IDLE
+
+    schedule.polled(off, changed=True)
+    assert schedule.interval == const.POLL_INTERVAL_FAST
+
+
+def test_poll_schedule_caps_powered_on_devices_at_on_interval():
+    schedule = DevicePollSchedule()
+
+    for _ in range(8):
+        schedule.polled({"power": 1}, changed=False)
+
+    assert schedule.interval == const.POLL_INTERVAL_ON
+
+
+def test_poll_schedule_stays_fast_after_a_command():
+    schedule = DevicePollSchedule()
+    schedule.command_sent()
+
+    schedule.polled({"power": 0}, changed=False)
+
+    assert schedule.interval == const.POLL_INTERVAL_FAST
+
+
+async def test_poll_schedule_keeps_fast_poll_interval_below_default(fake_hass):
+    device = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 1}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[device])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    account.async_set_options("entry_1", {
+        const.CONF_FAST_POLL_DEVICES: ["AA:BB"],
+        const.CONF_FAST_POLL_INTERVAL: 5,
+        const.CONF_MIN_POLL_INTERVAL: 5,
+    })
+    schedule = account.schedule("AA:BB")
+
+    # Neither a change nor a command slows it to POLL_INTERVAL_FAST.
+    account.data = await account._async_update_data()
+    assert schedule.interval == timedelta(seconds=5)
+    account.async_command_sent("AA:BB")
+    account.data = await account._async_update_data()
+    assert schedule.interval == timedelta(seconds=5)
+    assert account.update_interval == timedelta(seconds=5)
+    assert DevicePollSchedule(on=timedelta(seconds=5)).interval == timedelta(
+        seconds=5
+    )
+
+
+def test_poll_schedule_probes_offline_devices_until_back_online():
+    schedule = DevicePollSchedule()
+    offline = {"online": False, "power": 1}
+
+    intervals = []
+    for _ in range(12):
+        # Churn in an offline device's status doesn't speed its probe up.
+        schedule.polled(offline, changed=True)
+        intervals.append(schedule.interval)
+
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == const.POLL_INTERVAL_OFFLINE
+
+    schedule.polled({"online": True, "power": 1}, changed=True)
+    assert schedule.interval == const.POLL_INTERVAL_FAST
+
+
+async def test_account_coordinator_polls_as_often_as_busiest_device(fake_hass):
+    idle = {"deviceId": "AA:BB", "latestData": {"fullData": {"power": 0}}}
+    busy = {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 1}}}
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[idle, busy])
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    for _ in range(8):
+        account.data = await account._async_update_data()
+
+    assert account.schedule("AA:BB").interval == const.POLL_INTERVAL_IDLE
+    assert account.update_interval == const.POLL_INTERVAL_ON
+
+    api.get_devices.return_value = [
+        idle,
+        {"deviceId": "CC:DD", "latestData": {"fullData": {"power": 1, "temp": 20}}},
+    ]
+    account.data = await account._async_update_data()
+
+    assert account.update_interval == const.POLL_INTERVAL_FAST
+
+
+async def test_account_coordinator_empty_device_list_raises_update_failed(
+    fake_hass,
+):
+    api = MagicMock()
+    api.get_devices = AsyncMock(return_value=[])
+
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+
+    with pytest.raises(UpdateFailed):
+        await account._async_update_data()
+
+
+async def test_account_coordinator_wraps_errors_in_update_failed(fake_hass):
+    api = MagicMock()
+    api.get_devices = AsyncMock(side_effect=RuntimeError("connection reset"))
+
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+
+    with pytest.raises(UpdateFailed):
+        await account._async_update_data()
+
+
+def _make_account(statuses, last_update_success=True):
+    account = MagicMock()
+    account.data = statuses
+    account.last_update_success = last_update_success
+    account.device_status.side_effect = lambda device_id: statuses.get(device_id, {})
+    account.async_request_refresh = AsyncMock()
+    return account
+
+
+async def test_coordinator_update_data_returns_account_slice(fake_hass):
+    api = MagicMock()
+    account = _make_account({"AA:BB": {"power": 1, "sp": 21}, "CC:DD": {"power": 0}})
 
     coordinator = DuuxDataUpdateCoordinator(
         fake_hass, api=api, device_id="AA:BB", device_name="Test Device",
-        config_entry=MagicMock(),
+        account=account, config_entry=MagicMock(),
     )
 
     data = await coordinator._async_update_data()
 
     assert data == {"power": 1, "sp": 21}
-    api.get_device_status.assert_called_once_with("AA:BB")
+    account.async_add_listener.assert_called_once()
+    # The per-device coordinator never talks to the API itself.
+    api.get_devices.assert_not_called()
+    api.get_device_status.assert_not_called()
 
 
-async def test_coordinator_update_data_wraps_errors_in_update_failed(fake_hass):
-    api = MagicMock()
-    api.get_device_status.side_effect = RuntimeError("connection reset")
+async def test_coordinator_update_data_raises_when_account_failed(fake_hass):
+    account = _make_account({}, last_update_success=False)
+    account.last_exception = RuntimeError("connection reset")
 
     coordinator = DuuxDataUpdateCoordinator(
-        fake_hass, api=api, device_id="AA:BB", device_name="Test Device",
-        config_entry=MagicMock(),
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
     )
 
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()
 
 
+async def test_coordinator_request_refresh_delegates_to_account(fake_hass):
+    account = _make_account({"AA:BB": {"power": 1}})
+
+    coordinator = DuuxDataUpdateCoordinator(
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
+    )
+
+    await coordinator.async_request_refresh()
+
+    account.async_request_refresh.assert_awaited_once()
+
+
+async def test_coordinator_takes_its_slice_on_account_update(fake_hass):
+    statuses = {"AA:BB": {"power": 1}, "CC:DD": {"power": 0}}
+    account = _make_account(statuses)
+
+    coordinator = DuuxDataUpdateCoordinator(
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
+    )
+    listener = MagicMock()
+    coordinator._listeners[listener] = (listener, None)
+
+    statuses["AA:BB"] = {"power": 0}
+    coordinator._handle_account_update()
+
+    assert coordinator.data == {"power": 0}
+    listener.assert_called_once_with()
+
+
+async def test_coordinator_skips_dispatch_when_its_slice_is_unchanged(fake_hass):
+    statuses = {"AA:BB": {"power": 1}, "CC:DD": {"power": 0}}
+    account = _make_account(statuses)
+
+    coordinator = DuuxDataUpdateCoordinator(
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
+    )
+    listener = MagicMock()
+    coordinator._listeners[listener] = (listener, None)
+    coordinator._handle_account_update()
+    listener.reset_mock()
+
+    statuses["CC:DD"] = {"power": 1}
+    coordinator._handle_account_update()
+
+    listener.assert_not_called()
+    # The data is read-only, so nothing can write through it into the
+    # account data...
+    with pytest.raises(TypeError):
+        coordinator.data["power"] = 0
+    assert statuses["AA:BB"] == {"power": 1}
+
+    # ...and an unchanged poll still undoes data set any other way.
+    coordinator.async_set_updated_data({"power": 0})
+    listener.reset_mock()
+    coordinator._handle_account_update()
+    assert coordinator.data == {"power": 1}
+    listener.assert_called_once_with()
+
+
+async def test_coordinator_wakes_only_listeners_whose_keys_changed(fake_hass):
+    statuses = {"AA:BB": {"online": True, "power": 1, "temp": 19, "err": 0}}
+    account = _make_account(statuses)
+    coordinator = DuuxDataUpdateCoordinator(
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
+    )
+    temp, err, everything = MagicMock(), MagicMock(), MagicMock()
+    coordinator._listeners[temp] = (temp, frozenset({"temp"}))
+    coordinator._listeners[err] = (err, frozenset({"err"}))
+    coordinator._listeners[everything] = (everything, None)
+    coordinator._handle_account_update()
+    for listener in (temp, err, everything):
+        listener.assert_called_once_with()
+        listener.reset_mock()
+
+    statuses["AA:BB"] = {"online": True, "power": 1, "temp": 20, "err": 0}
+    coordinator._handle_account_update()
+    temp.assert_called_once_with()
+    err.assert_not_called()
+    everything.assert_called_once_with()
+    temp.reset_mock()
+    everything.reset_mock()
+
+    # Going offline changes every entity's availability.
+    statuses["AA:BB"] = {"online": False, "power": 1, "temp": 20, "err": 0}
+    coordinator._handle_account_update()
+    for listener in (temp, err, everything):
+        listener.assert_called_once_with()
+
+
+async def test_coordinator_suppresses_dispatch_while_offline(fake_hass):
+    statuses = {"AA:BB": {"online": True, "power": 1}}
+    account = _make_account(statuses)
+    coordinator = _make_device_coordinator(fake_hass, account)
+    listener = MagicMock()
+    coordinator._listeners[listener] = (listener, None)
+    coordinator._handle_account_update()
+
+    statuses["AA:BB"] = {"online": False, "power": 1}
+    coordinator._handle_account_update()
+    listener.reset_mock()
+
+    statuses["AA:BB"] = {"online": False, "power": 0, "temp": 12}
+    coordinator._handle_account_update()
+    listener.assert_not_called()
+
+    # Back online, the current state is shown straight away.
+    statuses["AA:BB"] = {"online": True, "power": 0, "temp": 12}
+    coordinator._handle_account_update()
+    listener.assert_called_once_with()
+    assert coordinator.data == {"online": True, "power": 0, "temp": 12}
+
+
+def _make_device_coordinator(fake_hass, account):
+    return DuuxDataUpdateCoordinator(
+        fake_hass, api=MagicMock(), device_id="AA:BB", device_name="Test Device",
+        account=account, config_entry=MagicMock(),
+    )
+
+
+async def _sent(result=CommandResult.SENT):
+    return result
+
+
+async def test_coordinator_command_applies_values_until_confirmed(fake_hass):
+    statuses = {"AA:BB": {"power": 0, "sp": 18}}
+    account = _make_account(statuses)
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+
+    result = await coordinator.async_command(_sent(), {"power": 1, "sp": 21})
+
+    assert result is CommandResult.SENT
+    assert coordinator.data == {"power": 1, "sp": 21}
+    account.async_command_sent.assert_called_once_with("AA:BB")
+
+    # A poll from before the device applied the command doesn't undo it...
+    statuses["AA:BB"] = {"power": 1, "sp": 18}
+    coordinator._handle_account_update()
+    assert coordinator.data == {"power": 1, "sp": 21}
+    assert len(coordinator.command_latencies) == 1  # power confirmed
+
+    # ...and once the rest is reported, nothing is pending any more.
+    statuses["AA:BB"] = {"power": 1, "sp": 21}
+    coordinator._handle_account_update()
+    assert coordinator._pending == {}
+    assert len(coordinator.command_latencies) == 2
+    coordinator._confirm_task.cancel()
+
+
+async def test_coordinator_command_reverts_when_not_confirmed_in_time(fake_hass):
+    statuses = {"AA:BB": {"sp": 18}}
+    account = _make_account(statuses)
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+
+    await coordinator.async_command(_sent(), {"sp": 21})
+    coordinator._confirm_task.cancel()
+    timeout = const.COMMAND_CONFIRM_TIMEOUT.total_seconds()
+    coordinator._pending["sp"] = (21, coordinator._pending["sp"][1] - timeout)
+
+    coordinator._handle_account_update()
+
+    assert coordinator.data == {"sp": 18}
+    assert coordinator._pending == {}
+    assert not coordinator.command_latencies
+
+
+@pytest.mark.parametrize("result", [CommandResult.FAILED, CommandResult.MERGED])
+async def test_coordinator_command_rolled_back_unless_sent(fake_hass, result):
+    account = _make_account({"AA:BB": {"sp": 18}})
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+
+    assert await coordinator.async_command(_sent(result), {"sp": 21}) is result
+
+    assert coordinator.data == {"sp": 18}
+    assert coordinator._confirm_task is None
+    account.async_command_sent.assert_not_called()
+
+
+async def test_coordinator_command_shows_values_while_in_flight(fake_hass):
+    account = _make_account({"AA:BB": {"sp": 18, "power": 1}})
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+    first_sent, second_sent = asyncio.Future(), asyncio.Future()
+
+    first = asyncio.ensure_future(coordinator.async_command(first_sent, {"sp": 20}))
+    await asyncio.sleep(0)
+    assert coordinator.data == {"sp": 20, "power": 1}
+
+    # A newer write to the same key replaces the older one in the overlay...
+    second = asyncio.ensure_future(
+        coordinator.async_command(second_sent, {"sp": 21, "power": 0})
+    )
+    await asyncio.sleep(0)
+    first_sent.set_result(CommandResult.MERGED)
+    await first
+    assert coordinator.data == {"sp": 21, "power": 0}
+
+    # ...and is dropped, without touching the polled status, if it fails.
+    second_sent.set_result(CommandResult.FAILED)
+    await second
+    assert coordinator.data == {"sp": 18, "power": 1}
+    assert coordinator._pending == {}
+
+
+async def test_coordinator_confirmation_burst_refreshes_until_confirmed(
+    fake_hass, monkeypatch
+):
+    monkeypatch.setattr("custom_components.duux.COMMAND_CONFIRM_DELAYS", (0,))
+    statuses = {"AA:BB": {"sp": 18}}
+    account = _make_account(statuses)
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+    refreshes = []
+
+    async def refresh():
+        refreshes.append(True)
+        if len(refreshes) == 3:
+            statuses["AA:BB"] = {"sp": 21}
+        coordinator._handle_account_update()
+
+    account.async_refresh_shared = refresh
+
+    await coordinator.async_command(_sent(), {"sp": 21})
+    await coordinator._confirm_task
+
+    assert len(refreshes) == 3
+    assert coordinator.data == {"sp": 21}
+    assert coordinator._pending == {}
+
+
+async def test_coordinator_confirmation_burst_ends_when_refreshes_fail(
+    fake_hass, monkeypatch
+):
+    monkeypatch.setattr("custom_components.duux.COMMAND_CONFIRM_DELAYS", (0,))
+    account = _make_account({"AA:BB": {"sp": 18}})
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+    timeout = const.COMMAND_CONFIRM_TIMEOUT.total_seconds()
+
+    async def failed_refresh():
+        # A failed refresh doesn't dispatch to _handle_account_update; let the
+        # write run out of time instead.
+        value, sent = coordinator._pending["sp"]
+        coordinator._pending["sp"] = (value, sent - timeout)
+
+    account.async_refresh_shared = failed_refresh
+
+    await coordinator.async_command(_sent(), {"sp": 21})
+    await asyncio.wait_for(coordinator._confirm_task, 1)
+
+    assert coordinator._pending == {}
+    assert coordinator.data == {"sp": 18}
+
+
+async def test_coordinator_confirms_values_reported_in_another_type(fake_hass):
+    statuses = {"AA:BB": {"mode": 0, "power": 0}}
+    account = _make_account(statuses)
+    coordinator = _make_device_coordinator(fake_hass, account)
+    coordinator._handle_account_update()
+
+    await coordinator.async_command(_sent(), {"mode": "2", "power": True})
+    statuses["AA:BB"] = {"mode": 2, "power": 1}
+    coordinator._handle_account_update()
+
+    assert coordinator._pending == {}
+    assert len(coordinator.command_latencies) == 2
+    coordinator._confirm_task.cancel()
+
+
+async def test_account_concurrent_shared_refreshes_fetch_once(fake_hass):
+    account = DuuxAccountCoordinator(
+        fake_hass, api=MagicMock(), config_entry=MagicMock()
+    )
+
+    async def slow_refresh():
+        await asyncio.sleep(0.01)
+
+    account.async_refresh = AsyncMock(side_effect=slow_refresh)
+
+    await asyncio.gather(*(account.async_refresh_shared() for _ in range(5)))
+
+    account.async_refresh.assert_awaited_once()
+
+
+async def test_account_shared_refresh_holds_to_the_floor(fake_hass, monkeypatch):
+    api = MagicMock()
+    api.get_devices = AsyncMock(
+        return_value=[{"deviceId": "AA:BB", "latestData": {"fullData": {}}}]
+    )
+    account = DuuxAccountCoordinator(fake_hass, api=api, config_entry=MagicMock())
+    # A floor above every COMMAND_CONFIRM_DELAYS step.
+    account.async_set_options("entry_1", {const.CONF_MIN_POLL_INTERVAL: 30})
+    account.data = await account._async_update_data()
+    account.async_refresh = AsyncMock()
+    waits = []
+
+    async def sleep(wait):
+        waits.append(wait)
+        account._last_fetch -= wait
+
+    monkeypatch.setattr("custom_components.duux.asyncio.sleep", sleep)
+    await account.async_refresh_shared()
+
+    assert len(waits) == 1
+    assert max(const.COMMAND_CONFIRM_DELAYS) < waits[0] <= 30
+    account.async_refresh.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # async_remove_config_entry_device
 #
@@ -0,0 +1,61 @@
+"""Unit tests for custom_components.duux.lookup."""
+
+import pytest
+
+from homeassistant.util.percentage import (
+    ordered_list_item_to_percentage,
+    percentage_to_ordered_list_item,
+)
+
+from custom_components.duux.lookup import LookupTable, raw_key, speed_table
+
+
+def test_raw_key_normalises_numeric_values():
+    assert raw_key("2") == raw_key(2.0) == raw_key(2) == 2
+    assert raw_key(True) == 1
+    assert raw_key("low") == "low"
+
+
+def test_lookup_table_maps_both_ways_with_normalised_keys():
+    table = LookupTable((("Off", 0), ("Low", "1"), ("High", 2)))
+
+    assert table.labels == ("Off", "Low", "High")
+    assert table.label(1) == "Low"
+    assert table.label("2") == "High"
+    assert table.label(5) is None
+    assert table.label(None) is None
+    assert table.raw("Low") == "1"
+    assert table.raw("Medium") is None
+
+
+def test_lookup_table_first_pair_wins_and_is_read_only():
+    table = LookupTable((("Eco", 1), ("Eco", 2), ("Comfort", 1)))
+
+    assert table.labels == ("Eco", "Comfort")
+    assert table.raw("Eco") == 1
+    assert table.label(1) == "Eco"
+    with pytest.raises(TypeError):
+        table.by_raw[3] = "Boost"
+
+
+@pytest.mark.parametrize("speeds", [(1, 2, 3), tuple(range(1, 27))])
+def test_speed_table_matches_home_assistant_conversions(speeds):
+    table = speed_table(speeds)
+
+    for speed in speeds:
+        assert table.percentage(speed) == ordered_list_item_to_percentage(
+            list(speeds), speed
+        )
+        assert table.percentage(str(speed)) == table.percentage(speed)
+    for percentage in range(1, 101):
+        assert table.speed(percentage) == percentage_to_ordered_list_item(
+            list(speeds), percentage
+        )
+
+
+def test_speed_table_is_shared_and_handles_no_speeds():
+    assert speed_table((1, 2, 3)) is speed_table((1, 2, 3))
+
+    empty = speed_table(())
+    assert empty.percentage(1) is None
+    assert empty.speed(50) is None
@@ -0,0 +1,90 @@
+"""Unit tests for custom_components.duux.push."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.duux import const
+from custom_components.duux.push import _full_data, async_setup_push
+
+
+class FakeEntry:
+    def __init__(self, options):
+        self.options = options
+        self.on_unload = []
+
+    def async_on_unload(self, func):
+        self.on_unload.append(func)
+
+
+def test_full_data_accepts_envelopes_and_bare_keys():
+    assert _full_data(json.dumps({"power": 1})) == {"power": 1}
+    assert _full_data(json.dumps({"fullData": {"power": 1}})) == {"power": 1}
+    assert _full_data(
+        json.dumps({"deviceId": "AA:BB", "latestData": {"fullData": {"sp": 20}}})
+    ) == {"sp": 20}
+
+
+def test_full_data_ignores_malformed_payloads():
+    assert _full_data("not json") is None
+    assert _full_data("[1, 2]") is None
+    assert _full_data(json.dumps({"fullData": 3})) is None
+
+
+async def test_setup_push_is_off_without_a_topic(fake_hass):
+    with patch("homeassistant.components.mqtt", create=True) as mqtt:
+        pushed = await async_setup_push(fake_hass, FakeEntry({}), MagicMock(), [])
+
+    assert pushed == set()
+    mqtt.async_wait_for_mqtt_client.assert_not_called()
+
+
+async def test_setup_push_falls_back_to_polling_without_mqtt(fake_hass):
+    entry = FakeEntry({const.CONF_MQTT_TOPIC: "duux/{mac}/state"})
+    devices = [{"deviceId": "AA:BB", "connectionType": "mqtt"}]
+
+    with patch("homeassistant.components.mqtt", create=True) as mqtt:
+        mqtt.async_wait_for_mqtt_client = AsyncMock(return_value=False)
+        pushed = await async_setup_push(fake_hass, entry, MagicMock(), devices)
+
+    assert pushed == set()
+    mqtt.async_subscribe.assert_not_called()
+
+
+async def test_setup_push_is_off_for_a_topic_without_a_mac_placeholder(fake_hass):
+    entry = FakeEntry({const.CONF_MQTT_TOPIC: "duux/state"})
+    devices = [{"deviceId": "AA:BB", "connectionType": "mqtt"}]
+
+    with patch("homeassistant.components.mqtt", create=True) as mqtt:
+        pushed = await async_setup_push(fake_hass, entry, MagicMock(), devices)
+
+    assert pushed == set()
+    mqtt.async_subscribe.assert_not_called()
+
+
+async def test_setup_push_feeds_messages_to_the_account(fake_hass):
+    entry = FakeEntry({const.CONF_MQTT_TOPIC: "duux/{mac}/state"})
+    devices = [
+        {"deviceId": "AA:BB", "connectionType": "mqtt"},
+        {"deviceId": "CC:DD", "connectionType": "tcp"},
+    ]
+    account = MagicMock()
+    unsubscribe = MagicMock()
+
+    with patch("homeassistant.components.mqtt", create=True) as mqtt:
+        mqtt.async_wait_for_mqtt_client = AsyncMock(return_value=True)
+        mqtt.async_subscribe = AsyncMock(return_value=unsubscribe)
+        pushed = await async_setup_push(fake_hass, entry, account, devices)
+
+    assert pushed == {"AA:BB"}
+    mqtt.async_subscribe.assert_awaited_once()
+    _, topic, msg_callback = mqtt.async_subscribe.await_args.args
+    assert topic == "duux/AA:BB/state"
+    assert entry.on_unload == [unsubscribe]
+
+    msg_callback(SimpleNamespace(payload=json.dumps({"fullData": {"power": 0}})))
+    account.async_push.assert_called_once_with("AA:BB", {"power": 0})
+
+    account.async_push.reset_mock()
+    msg_callback(SimpleNamespace(payload="garbage"))
+    account.async_push.assert_not_called()
@@ -1,6 +1,6 @@
 """Unit tests for custom_components.duux.select."""
 
-from custom_components.duux import const
+from custom_components.duux import const, device_profile
 from custom_components.duux.select import (
     DuuxBright2TimerSelector,
     DuuxFanSpeedSelector,
@@ -290,6 +290,9 @@ async def test_async_setup_entry_dispatches_expected_selects_per_device(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 
@@ -346,8 +349,9 @@ async def test_north_timer_selector_nonzero_also_powers_on(
 
     await entity.async_select_option("2")
 
-    mock_api.set_power.assert_called_once_with(device["deviceId"], True)
-    mock_api.set_timer.assert_called_once_with(device["deviceId"], "2")
+    mock_api.send_commands.assert_called_once_with(
+        device["deviceId"], ["tune set power 01", "tune set timer 2"]
+    )
     assert entity.current_option == "2"
 
 
@@ -364,3 +368,11 @@ async def test_north_timer_selector_zero_does_not_power_on(
 
     mock_api.set_power.assert_not_called()
     mock_api.set_timer.assert_called_once_with(device["deviceId"], "0")
+
+
+def test_swing_select_matches_string_raw_values(make_coordinator, mock_api):
+    device = {"id": 1, "deviceId": "AA:BB", "displayName": "Fan"}
+    coordinator = make_coordinator({"verosc": "2"})
+    entity = DuuxVerticalOscillationSelect(coordinator, mock_api, device)
+
+    assert entity.current_option == "100°"
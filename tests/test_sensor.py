@@ -1,11 +1,17 @@
 """Unit tests for custom_components.duux.sensor."""
 
-from custom_components.duux import const
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.duux import const, device_profile
 from custom_components.duux.sensor import (
     DuuxAirQualitySensor,
     DuuxConnectionTypeSensor,
     DuuxErrorSensor,
     DuuxTVOCSensor,
+    DuuxSensor,
+    DuuxSensorEntityDescription,
     DuuxTempSensor,
     async_setup_entry,
 )
@@ -24,6 +30,16 @@ def test_temp_sensor_initial_value(device_by_stid, make_coordinator, mock_api):
     assert entity.native_value == 19
 
 
+def test_temp_sensor_listens_for_its_own_key(
+    device_by_stid, make_coordinator, mock_api
+):
+    device = device_by_stid(50)
+    coordinator = make_coordinator(device["latestData"]["fullData"])
+    entity = DuuxTempSensor(coordinator, mock_api, device)
+
+    assert entity.coordinator_context == frozenset({"temp"})
+
+
 def test_temp_sensor_updates_on_coordinator_push(
     device_by_stid, make_coordinator, mock_api
 ):
@@ -43,6 +59,53 @@ def test_temp_sensor_updates_on_coordinator_push(
 # ---------------------------------------------------------------------------
 
 
+def test_sensor_skips_state_write_when_unchanged(
+    device_by_stid, make_coordinator, mock_api
+):
+    device = device_by_stid(50)
+    coordinator = make_coordinator(device["latestData"]["fullData"])
+    entity = DuuxTempSensor(coordinator, mock_api, device)
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    coordinator.async_set_updated_data({"temp": 25})
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({"temp": 25, "power": 1})
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({"temp": 26})
+    entity._handle_coordinator_update()
+
+    assert writes == [25, 26]
+
+
+def test_sensor_builds_attributes_only_when_its_key_changes(
+    make_coordinator, mock_api
+):
+    device = {"id": 1, "deviceId": "AA:BB", "displayName": "Heater"}
+    coordinator = make_coordinator({"temp": 20})
+    attrs = MagicMock(return_value={})
+    entity = DuuxSensor(
+        coordinator,
+        mock_api,
+        device,
+        DuuxSensorEntityDescription(key="temp", attrs=attrs),
+    )
+    entity.async_write_ha_state = lambda: None
+    attrs.reset_mock()
+
+    coordinator.async_set_updated_data({"temp": 21})
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({"temp": 21, "power": 1})
+    entity._handle_coordinator_update()
+    assert attrs.call_count == 1
+
+    coordinator.async_set_updated_data({"temp": 22})
+    entity._handle_coordinator_update()
+    assert attrs.call_count == 2
+
+
 def test_tvoc_sensor_maps_raw_value_to_label(device_by_stid, make_coordinator, mock_api):
     device = device_by_stid(61)
     coordinator = make_coordinator(device["latestData"]["fullData"])  # tvoc == 0
@@ -78,6 +141,33 @@ def test_air_quality_sensor_maps_raw_value_to_label(
     assert entity.native_value == "very_good"
 
 
+@pytest.mark.parametrize(
+    ("sensor", "key", "labels"),
+    [
+        (DuuxTVOCSensor, "tvoc", ["harmful", "polluted"]),
+        (DuuxAirQualitySensor, "aq", ["fair", "good"]),
+    ],
+)
+def test_mapped_sensors_skip_state_write_when_unchanged(
+    make_coordinator, mock_api, sensor, key, labels
+):
+    device = {"id": 1, "deviceId": "AA:BB", "displayName": "Purifier"}
+    coordinator = make_coordinator({key: 2})
+    entity = sensor(coordinator, mock_api, device)
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    coordinator.async_set_updated_data({key: 3})
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({key: 3, "power": 1})
+    entity._handle_coordinator_update()
+    coordinator.async_set_updated_data({key: 2})
+    entity._handle_coordinator_update()
+
+    assert writes == labels
+
+
 # ---------------------------------------------------------------------------
 # DuuxErrorSensor -- DUUX_ERRID enum -> human readable name
 # ---------------------------------------------------------------------------
@@ -175,6 +265,9 @@ async def test_async_setup_entry_bright2_gets_air_quality_sensor_suite(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 
@@ -2,7 +2,7 @@
 
 import pytest
 
-from custom_components.duux import const
+from custom_components.duux import const, device_profile
 from custom_components.duux.switch import (
     DuuxChildLockSwitch,
     DuuxCleaningModeSwitch,
@@ -148,6 +148,9 @@ async def test_async_setup_entry_dispatches_expected_switches_per_device(
             "api": object(),
             "coordinators": coordinators,
             "devices": devices_fixture,
+            "profiles": {
+                d["deviceId"]: device_profile(d) for d in devices_fixture
+            },
         }
     }
 